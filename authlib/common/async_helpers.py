@@ -0,0 +1,135 @@
+import functools
+
+
+async def maybe_await(value):
+    """Await ``value`` if it is awaitable, so that a model method can be
+    implemented with either ``def`` or ``async def``."""
+    # imported here, inspect and asyncio are expensive to import
+    import inspect
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def ensure_sync(value, name):
+    """Return ``value`` returned by the model method ``name`` on the sync
+    path, a model method that returns an awaitable is a coroutine function,
+    which is only supported by the ``async_*`` methods."""
+    import inspect
+    if inspect.isawaitable(value):
+        _discard(value)
+        raise RuntimeError(_sync_error_message(f'"{name}"'))
+    return value
+
+
+def run_steps(steps):
+    """Run ``steps`` on the sync path. ``steps`` is a generator which yields
+    the return value of every model method it calls, and receives it back::
+
+        def _validate_token_request(self, client):
+            code = self.request.form.get('code')
+            authorization_code = yield self.query_authorization_code(code, client)
+            ...
+
+        def validate_token_request(self):
+            client = self.authenticate_token_endpoint_client()
+            run_steps(self._validate_token_request(client))
+
+        async def async_validate_token_request(self):
+            client = await self.async_authenticate_token_endpoint_client()
+            await async_run_steps(self._validate_token_request(client))
+
+    A model method that returns an awaitable raises ``RuntimeError`` at its
+    ``yield``, instead of passing a coroutine on as the result.
+    """
+    import inspect
+    value, error = None, None
+    while True:
+        try:
+            if error is None:
+                value = steps.send(value)
+            else:
+                value = steps.throw(error)
+        except StopIteration as exc:
+            return exc.value
+        error = None
+        if inspect.isawaitable(value):
+            _discard(value)
+            error = RuntimeError(_sync_error_message(
+                f'A model method called by "{steps.__qualname__}"'))
+
+
+async def async_run_steps(steps):
+    """Run ``steps`` like :func:`run_steps`, awaiting the return values of
+    model methods which are coroutine functions."""
+    import inspect
+    value, error = None, None
+    while True:
+        try:
+            if error is None:
+                value = steps.send(value)
+            else:
+                value = steps.throw(error)
+        except StopIteration as exc:
+            return exc.value
+        error = None
+        if inspect.isawaitable(value):
+            try:
+                value = await value
+            except Exception as exc:
+                error = exc
+
+
+def async_version_of(sync_name):
+    """Mark a coroutine method as the async version of the method named
+    ``sync_name``. If a subclass re-implements the sync method but not the
+    async one, the sync method of the subclass is called instead::
+
+        class Grant(object):
+            def create_token_response(self):
+                ...
+
+            @async_version_of('create_token_response')
+            async def async_create_token_response(self):
+                ...
+    """
+    def wrapper(func):
+        prefer_sync = {}
+
+        @functools.wraps(func)
+        async def method(self, *args, **kwargs):
+            cls = type(self)
+            use_sync = prefer_sync.get(cls)
+            if use_sync is None:
+                use_sync = _overrides_sync(cls, sync_name, func.__name__)
+                prefer_sync[cls] = use_sync
+            if use_sync:
+                return getattr(self, sync_name)(*args, **kwargs)
+            return await func(self, *args, **kwargs)
+        return method
+    return wrapper
+
+
+def _overrides_sync(cls, sync_name, async_name):
+    for klass in cls.__mro__:
+        if async_name in vars(klass):
+            return False
+        if sync_name in vars(klass):
+            return True
+    return False
+
+
+def _discard(awaitable):
+    # close the coroutine, so that it is not reported as never awaited
+    close = getattr(awaitable, 'close', None)
+    if close is not None:
+        close()
+
+
+def _sync_error_message(subject):
+    return (
+        f'{subject} returned an awaitable. Coroutine '
+        'model methods are only supported by the async_* methods, a subclass '
+        'which re-implements a sync method MUST re-implement its async_* '
+        'version too.'
+    )
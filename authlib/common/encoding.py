@@ -1,3 +1,4 @@
+import re
 import json
 import base64
 import struct
@@ -29,12 +30,109 @@ def to_native(x, encoding='ascii'):
     return x.decode(encoding)
 
 
+def _stdlib_dumps(data, ensure_ascii=False):
+    return json.dumps(data, ensure_ascii=ensure_ascii, separators=(',', ':'))
+
+
+def _create_stdlib_backend():
+    return json.loads, _stdlib_dumps
+
+
+# an integer of 19 digits or more might not fit in 64 bits
+_long_digits = re.compile(r'[0-9]{19}')
+_long_digits_bytes = re.compile(rb'[0-9]{19}')
+
+
+def _create_orjson_backend():
+    import orjson
+    # let the standard json module decide on datetime and dataclass values
+    option = (
+        orjson.OPT_NON_STR_KEYS |
+        orjson.OPT_PASSTHROUGH_DATETIME |
+        orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def loads(s):
+        # orjson parses integers beyond 64-bit range as floats, parse them
+        # with the standard json module to keep their precision
+        pattern = _long_digits_bytes if isinstance(s, (bytes, bytearray)) else _long_digits
+        if pattern.search(s):
+            return json.loads(s)
+        return orjson.loads(s)
+
+    def dumps(data):
+        try:
+            return orjson.dumps(data, option=option).decode('utf-8')
+        except TypeError:
+            # e.g. integers exceed 64-bit range, or unsupported types
+            return _stdlib_dumps(data)
+    return loads, dumps
+
+
+def _create_ujson_backend():
+    import ujson
+
+    def dumps(data):
+        try:
+            return ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return _stdlib_dumps(data)
+    return ujson.loads, dumps
+
+
+JSON_BACKENDS = {
+    'json': _create_stdlib_backend,
+    'orjson': _create_orjson_backend,
+    'ujson': _create_ujson_backend,
+}
+_json_backend = ('json', json.loads, _stdlib_dumps)
+
+
+def set_json_backend(name='auto'):
+    """Set the JSON backend used by :func:`json_loads` and :func:`json_dumps`.
+    Available backends are ``json``, ``orjson`` and ``ujson``. With ``auto``,
+    the first importable one of ``orjson``, ``ujson`` will be used, and it
+    falls back to the standard ``json`` module.
+
+    Every backend generates compact JSON without escaping non-ASCII
+    characters, the same as the standard ``json`` module. Floats in exponent
+    notation, ``NaN`` and ``Infinity`` may be formatted differently. Integers
+    beyond 64-bit range are parsed as integers by every backend, like the
+    standard ``json`` module.
+
+    :param name: name of the backend
+    :return: name of the installed backend
+    """
+    global _json_backend
+    if name == 'auto':
+        for name in ('orjson', 'ujson', 'json'):
+            try:
+                loads, dumps = JSON_BACKENDS[name]()
+                break
+            except ImportError:
+                continue
+    elif name in JSON_BACKENDS:
+        loads, dumps = JSON_BACKENDS[name]()
+    else:
+        raise ValueError('Invalid JSON backend: {!r}'.format(name))
+
+    _json_backend = (name, loads, dumps)
+    return name
+
+
+def get_json_backend():
+    """Get the name of current JSON backend."""
+    return _json_backend[0]
+
+
 def json_loads(s):
-    return json.loads(s)
+    return _json_backend[1](s)
 
 
 def json_dumps(data, ensure_ascii=False):
-    return json.dumps(data, ensure_ascii=ensure_ascii, separators=(',', ':'))
+    if ensure_ascii:
+        return _stdlib_dumps(data, ensure_ascii=True)
+    return _json_backend[2](data)
 
 
 def urlsafe_b64decode(s):
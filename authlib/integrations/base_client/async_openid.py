@@ -54,23 +54,22 @@ class AsyncOpenIDMixin(object):
         jwt = JsonWebToken(alg_values)
 
         jwk_set = await self.fetch_jwk_set()
-        try:
-            claims = jwt.decode(
-                token['id_token'],
-                key=JsonWebKey.import_key_set(jwk_set),
-                claims_cls=claims_cls,
-                claims_options=claims_options,
-                claims_params=claims_params,
-            )
-        except ValueError:
-            jwk_set = await self.fetch_jwk_set(force=True)
-            claims = jwt.decode(
-                token['id_token'],
-                key=JsonWebKey.import_key_set(jwk_set),
-                claims_cls=claims_cls,
-                claims_options=claims_options,
-                claims_params=claims_params,
-            )
+
+        async def load_key(header, _):
+            key_set = JsonWebKey.import_key_set(jwk_set)
+            try:
+                return key_set.find_by_kid(header.get('kid'))
+            except ValueError:
+                # re-try with new jwk set
+                key_set = JsonWebKey.import_key_set(await self.fetch_jwk_set(force=True))
+                return key_set.find_by_kid(header.get('kid'))
+
+        claims = await jwt.async_decode(
+            token['id_token'], key=load_key,
+            claims_cls=claims_cls,
+            claims_options=claims_options,
+            claims_params=claims_params,
+        )
 
         # https://github.com/lepture/authlib/issues/259
         if claims.get('nonce_supported') is False:
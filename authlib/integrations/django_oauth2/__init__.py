@@ -1,6 +1,6 @@
 # flake8: noqa
 
-from .authorization_server import AuthorizationServer
+from .authorization_server import AuthorizationServer, create_token_sink
 from .resource_protector import ResourceProtector, BearerTokenValidator
 from .endpoints import RevocationEndpoint
 from .signals import (
@@ -6,6 +6,7 @@ from authlib.oauth2 import (
     HttpRequest,
     AuthorizationServer as _AuthorizationServer,
 )
+from authlib.oauth2.rfc6749 import TokenSink
 from authlib.oauth2.rfc6750 import BearerTokenGenerator
 from authlib.common.security import generate_token as _generate_token
 from authlib.common.encoding import json_dumps
@@ -21,12 +22,20 @@ class AuthorizationServer(_AuthorizationServer):
         from your_project.models import OAuth2Client, OAuth2Token
 
         server = AuthorizationServer(OAuth2Client, OAuth2Token)
+
+    Pass a ``token_sink`` to save tokens in batches::
+
+        from authlib.integrations.django_oauth2 import create_token_sink
+
+        token_sink = create_token_sink(OAuth2Token, 'tokens', durability='flush')
+        server = AuthorizationServer(OAuth2Client, OAuth2Token, token_sink)
     """
 
-    def __init__(self, client_model, token_model):
+    def __init__(self, client_model, token_model, token_sink=None):
         self.config = getattr(settings, 'AUTHLIB_OAUTH2_PROVIDER', {})
         self.client_model = client_model
         self.token_model = token_model
+        self.token_sink = token_sink
         scopes_supported = self.config.get('scopes_supported')
         super(AuthorizationServer, self).__init__(scopes_supported=scopes_supported)
         # add default token generator
@@ -55,7 +64,10 @@ class AuthorizationServer(_AuthorizationServer):
             user_id=user_id,
             **token
         )
-        item.save()
+        if self.token_sink is not None:
+            self.token_sink.put(item)
+        else:
+            item.save()
         return item
 
     def create_oauth2_request(self, request):
@@ -98,6 +110,35 @@ class AuthorizationServer(_AuthorizationServer):
         )
 
 
+def create_token_sink(token_model, using, **kwargs):
+    """Create a :class:`~authlib.oauth2.rfc6749.TokenSink` to save tokens
+    with ``token_model.objects.bulk_create``. The other parameters are
+    passed to ``TokenSink``. ``bulk_create`` does not call ``save`` of the
+    model, and does not send ``pre_save`` and ``post_save`` signals.
+
+    A batch contains the tokens of many requests, it is saved in its own
+    transaction on the database alias ``using``. It MUST be an alias that
+    the views do not use, without ``ATOMIC_REQUESTS``, so that the batch
+    does not join the transaction of the request which saves it::
+
+        DATABASES['tokens'] = dict(DATABASES['default'], ATOMIC_REQUESTS=False)
+
+    :param token_model: Token model class
+    :param using: the database alias to save tokens
+    """
+    from django.db import connections, transaction
+
+    if connections[using].settings_dict.get('ATOMIC_REQUESTS'):
+        raise ValueError(f'Database "{using}" MUST NOT use ATOMIC_REQUESTS')
+
+    def save_tokens(items):
+        if connections[using].in_atomic_block:
+            raise RuntimeError(f'Database "{using}" is in a transaction of the request')
+        with transaction.atomic(using=using):
+            token_model.objects.using(using).bulk_create(items)
+    return TokenSink(save_tokens, **kwargs)
+
+
 def create_token_generator(token_generator_conf, length=42):
     if callable(token_generator_conf):
         return token_generator_conf
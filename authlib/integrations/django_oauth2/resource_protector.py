@@ -8,13 +8,23 @@ from authlib.oauth2.rfc6749 import (
     MissingAuthorizationError,
     HttpRequest,
 )
+from authlib.oauth2.rfc6749.util import compile_scopes
 from authlib.oauth2.rfc6750 import (
     BearerTokenValidator as _BearerTokenValidator
 )
-from .signals import token_authenticated
+from .signals import token_authenticated, token_revoked
 
 
 class ResourceProtector(_ResourceProtector):
+    def register_token_validator(self, validator):
+        """Register a token validator, and connect its ``token_cache`` to
+        the ``token_revoked`` signal to invalidate the revoked tokens.
+        """
+        super(ResourceProtector, self).register_token_validator(validator)
+        token_cache = getattr(validator, 'token_cache', None)
+        if token_cache is not None:
+            token_revoked.connect(token_cache.on_token_revoked)
+
     def acquire_token(self, request, scopes=None):
         """A method to acquire current valid token with the given scope.
 
@@ -32,6 +42,8 @@ class ResourceProtector(_ResourceProtector):
         return token
 
     def __call__(self, scopes=None, optional=False):
+        scopes = compile_scopes(scopes)
+
         def wrapper(f):
             @functools.wraps(f)
             def decorated(request, *args, **kwargs):
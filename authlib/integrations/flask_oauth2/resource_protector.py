@@ -11,7 +11,8 @@ from authlib.oauth2.rfc6749 import (
     MissingAuthorizationError,
     HttpRequest,
 )
-from .signals import token_authenticated
+from authlib.oauth2.rfc6749.util import compile_scopes
+from .signals import token_authenticated, token_revoked
 from .errors import raise_http_exception
 
 
@@ -48,6 +49,15 @@ class ResourceProtector(_ResourceProtector):
             return jsonify(user.to_dict())
 
     """
+    def register_token_validator(self, validator):
+        """Register a token validator, and connect its ``token_cache`` to
+        the ``token_revoked`` signal to invalidate the revoked tokens.
+        """
+        super(ResourceProtector, self).register_token_validator(validator)
+        token_cache = getattr(validator, 'token_cache', None)
+        if token_cache is not None:
+            token_revoked.connect(token_cache.on_token_revoked)
+
     def raise_error_response(self, error):
         """Raise HTTPException for OAuth2Error. Developers can re-implement
         this method to customize the error response.
@@ -98,6 +108,8 @@ class ResourceProtector(_ResourceProtector):
             self.raise_error_response(error)
 
     def __call__(self, scopes=None, optional=False):
+        scopes = compile_scopes(scopes)
+
         def wrapper(f):
             @functools.wraps(f)
             def decorated(*args, **kwargs):
@@ -3,6 +3,7 @@ from .tokens_mixins import OAuth2AuthorizationCodeMixin, OAuth2TokenMixin
 from .functions import (
     create_query_client_func,
     create_save_token_func,
+    create_token_sink,
     create_query_token_func,
     create_revocation_endpoint,
     create_bearer_token_validator,
@@ -11,7 +12,7 @@ from .functions import (
 
 __all__ = [
     'OAuth2ClientMixin', 'OAuth2AuthorizationCodeMixin', 'OAuth2TokenMixin',
-    'create_query_client_func', 'create_save_token_func',
+    'create_query_client_func', 'create_save_token_func', 'create_token_sink',
     'create_query_token_func', 'create_revocation_endpoint',
     'create_bearer_token_validator',
 ]
@@ -14,12 +14,16 @@ def create_query_client_func(session, client_model):
     return query_client
 
 
-def create_save_token_func(session, token_model):
+def create_save_token_func(session, token_model, token_sink=None):
     """Create an ``save_token`` function that can be used in authorization
-    server.
+    server. The tokens are saved in batches if ``token_sink`` is given::
+
+        token_sink = create_token_sink(sessionmaker(bind=db.engine), Token)
+        save_token = create_save_token_func(db.session, Token, token_sink)
 
     :param session: SQLAlchemy session
     :param token_model: Token model class
+    :param token_sink: an optional :class:`~authlib.oauth2.rfc6749.TokenSink`
     """
     def save_token(token, request):
         if request.user:
@@ -32,11 +36,53 @@ def create_save_token_func(session, token_model):
             user_id=user_id,
             **token
         )
-        session.add(item)
-        session.commit()
+        if token_sink is not None:
+            token_sink.put(item)
+        else:
+            session.add(item)
+            session.commit()
     return save_token
 
 
+def create_token_sink(session_factory, token_model, **kwargs):
+    """Create a :class:`~authlib.oauth2.rfc6749.TokenSink` to save tokens
+    with ``session.bulk_save_objects`` and one commit for each batch. The
+    other parameters are passed to ``TokenSink``::
+
+        session_factory = sessionmaker(bind=db.engine)
+        token_sink = create_token_sink(
+            session_factory, Token, batch_size=200,
+            flush_interval=0.005, durability='flush',
+        )
+
+    A batch contains the tokens of many requests, it is saved in a new
+    session created by ``session_factory``, so that its commit or rollback
+    does not touch the pending changes of the request which saves it. The
+    request scoped session, e.g. ``db.session``, MUST NOT be used.
+
+    :param session_factory: a callable which creates a SQLAlchemy session,
+        e.g. ``sessionmaker``
+    :param token_model: Token model class
+    """
+    from sqlalchemy.orm import scoped_session
+    from authlib.oauth2.rfc6749 import TokenSink
+
+    if isinstance(session_factory, scoped_session):
+        raise ValueError('"session_factory" MUST create a new session for each batch')
+
+    def save_tokens(items):
+        session = session_factory()
+        try:
+            session.bulk_save_objects(items)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    return TokenSink(save_tokens, **kwargs)
+
+
 def create_query_token_func(session, token_model):
     """Create an ``query_token`` function for revocation, introspection
     token endpoints.
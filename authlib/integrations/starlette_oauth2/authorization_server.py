@@ -0,0 +1,84 @@
+from starlette.responses import Response
+from authlib.oauth2 import (
+    OAuth2Request,
+    AuthorizationServer as _AuthorizationServer,
+)
+from authlib.oauth2.rfc6750 import BearerTokenGenerator
+from authlib.common.security import generate_token
+from authlib.common.encoding import json_dumps
+from authlib.common.urls import urlparse
+
+
+class AuthorizationServer(_AuthorizationServer):
+    """Starlette implementation of :class:`authlib.oauth2.rfc6749.AuthorizationServer`,
+    for ASGI apps. The ``query_client``, ``save_token`` and the model methods
+    of grants MAY be coroutine functions::
+
+        async def query_client(client_id):
+            return await Client.get(client_id=client_id)
+
+        async def save_token(token, request):
+            await Token.create(client_id=request.client.client_id, **token)
+
+        server = AuthorizationServer(query_client, save_token)
+
+        async def issue_token(request):
+            return await server.async_create_token_response(request)
+
+        app = Starlette(routes=[
+            Route('/oauth/token', issue_token, methods=['POST']),
+        ])
+
+    Use the ``async_*`` methods of the server in Starlette endpoints, since
+    the request body can only be read asynchronously.
+
+    :param query_client: A function to get client by client_id
+    :param save_token: A function to save tokens
+    :param scopes_supported: A list of supported scopes
+    """
+
+    def __init__(self, query_client=None, save_token=None, scopes_supported=None):
+        super(AuthorizationServer, self).__init__(scopes_supported=scopes_supported)
+        self._query_client = query_client
+        self._save_token = save_token
+        self.register_token_generator('default', self.create_bearer_token_generator())
+
+    def query_client(self, client_id):
+        return self._query_client(client_id)
+
+    def save_token(self, token, request):
+        return self._save_token(token, request)
+
+    async def async_create_oauth2_request(self, request):
+        if isinstance(request, OAuth2Request):
+            return request
+
+        if request.method in ('POST', 'PUT'):
+            # OAuth requests are "application/x-www-form-urlencoded", it is
+            # decoded here without the "python-multipart" requirement. Like
+            # the form parsers of Flask and Django, malformed bodies are
+            # decoded leniently, the grants will reject missing parameters
+            body = (await request.body()).decode('utf-8', 'replace')
+            body = dict(urlparse.parse_qsl(
+                body, keep_blank_values=True, errors='replace'))
+        else:
+            body = None
+        return OAuth2Request(request.method, str(request.url), body, request.headers)
+
+    def handle_response(self, status_code, payload, headers):
+        if isinstance(payload, dict):
+            payload = json_dumps(payload)
+        return Response(payload, status_code=status_code, headers=dict(headers))
+
+    def send_signal(self, name, *args, **kwargs):
+        """Starlette has no signal system, developers MAY re-implement this
+        method to handle ``after_authenticate_client`` and
+        ``after_revoke_token``."""
+
+    def create_bearer_token_generator(self):
+        """Default method to create BearerToken generator, it does not
+        generate ``refresh_token``. Register another ``default`` token
+        generator to change it."""
+        def access_token_generator(*args, **kwargs):
+            return generate_token(42)
+        return BearerTokenGenerator(access_token_generator)
@@ -0,0 +1,71 @@
+import functools
+from starlette.responses import JSONResponse
+from authlib.oauth2 import (
+    OAuth2Error,
+    ResourceProtector as _ResourceProtector,
+)
+from authlib.oauth2.rfc6749 import (
+    MissingAuthorizationError,
+    HttpRequest,
+)
+from authlib.oauth2.rfc6749.util import compile_scopes
+
+
+class ResourceProtector(_ResourceProtector):
+    """A protecting method for resource servers in ASGI apps. The
+    ``authenticate_token`` of the registered token validator MAY be a
+    coroutine function::
+
+        from authlib.oauth2.rfc6750 import BearerTokenValidator
+
+        class MyBearerTokenValidator(BearerTokenValidator):
+            async def authenticate_token(self, token_string):
+                return await Token.get(access_token=token_string)
+
+        require_oauth = ResourceProtector()
+        require_oauth.register_token_validator(MyBearerTokenValidator())
+
+        @require_oauth('profile')
+        async def user_profile(request):
+            user = request.state.oauth_token.user
+            return JSONResponse(user.to_dict())
+    """
+
+    async def acquire_token(self, request, scopes=None):
+        """A method to acquire current valid token with the given scope.
+
+        :param request: Starlette request instance
+        :param scopes: a list of scope values
+        :return: token object
+        """
+        req = HttpRequest(request.method, str(request.url), None, request.headers)
+        req.req = request
+        if isinstance(scopes, str):
+            scopes = [scopes]
+        return await self.async_validate_request(scopes, req)
+
+    def __call__(self, scopes=None, optional=False):
+        scopes = compile_scopes(scopes)
+
+        def wrapper(f):
+            @functools.wraps(f)
+            async def decorated(request, *args, **kwargs):
+                try:
+                    token = await self.acquire_token(request, scopes)
+                    request.state.oauth_token = token
+                except MissingAuthorizationError as error:
+                    if optional:
+                        request.state.oauth_token = None
+                        return await f(request, *args, **kwargs)
+                    return return_error_response(error)
+                except OAuth2Error as error:
+                    return return_error_response(error)
+                return await f(request, *args, **kwargs)
+            return decorated
+        return wrapper
+
+
+def return_error_response(error):
+    body = dict(error.get_body())
+    headers = dict(error.get_headers())
+    return JSONResponse(body, status_code=error.status_code, headers=headers)
@@ -7,23 +7,25 @@
 """
 from .rfc7515 import (
     JsonWebSignature, JWSAlgorithm, JWSHeader, JWSObject,
+    JWSSigner, JWSVerifier,
 )
 from .rfc7516 import (
     JsonWebEncryption, JWEAlgorithm, JWEEncAlgorithm, JWEZipAlgorithm,
 )
-from .rfc7517 import Key, KeySet, JsonWebKey
+from .rfc7517 import Key, KeySet, LazyKeySet, JsonWebKey, RemoteKeySet
 from .rfc7518 import (
     register_jws_rfc7518,
     register_jwe_rfc7518,
-    ECDHESAlgorithm,
     OctKey,
-    RSAKey,
-    ECKey,
 )
-from .rfc7519 import JsonWebToken, BaseClaims, JWTClaims
-from .rfc8037 import OKPKey, register_jws_rfc8037
+from .rfc7519 import (
+    JsonWebToken, JWTIssuer, JWTVerifier,
+    BaseClaims, JWTClaims, ClaimsValidator,
+)
+from .rfc8037 import register_jws_rfc8037
 
 from .errors import JoseError
+from .util import HeaderCache, LazyRegistry
 
 # register algorithms
 register_jws_rfc7518(JsonWebSignature)
@@ -31,30 +33,46 @@ register_jws_rfc8037(JsonWebSignature)
 
 register_jwe_rfc7518(JsonWebEncryption)
 
-# attach algorithms
-ECDHESAlgorithm.ALLOWED_KEY_CLS = (ECKey, OKPKey)
 
-# register supported keys
-JsonWebKey.JWK_KEY_CLS = {
-    OctKey.kty: OctKey,
-    RSAKey.kty: RSAKey,
-    ECKey.kty: ECKey,
-    OKPKey.kty: OKPKey,
-}
+def _load_asymmetric_keys():
+    from .rfc7518.rsa_key import RSAKey
+    from .rfc7518.ec_key import ECKey
+    from .rfc8037.okp_key import OKPKey
+    return {key_cls.kty: key_cls for key_cls in (RSAKey, ECKey, OKPKey)}
+
+
+# register supported keys, the keys requiring cryptography are imported
+# on the first lookup
+JsonWebKey.JWK_KEY_CLS = LazyRegistry({OctKey.kty: OctKey})
+JsonWebKey.JWK_KEY_CLS.register_lazy(['RSA', 'EC', 'OKP'], _load_asymmetric_keys)
 
 jwt = JsonWebToken(list(JsonWebSignature.ALGORITHMS_REGISTRY.keys()))
 
 
+def __getattr__(name):
+    # keys and algorithms requiring cryptography are imported on first access
+    if name in ('RSAKey', 'ECKey', 'ECDHESAlgorithm'):
+        from . import rfc7518
+        return getattr(rfc7518, name)
+    if name == 'OKPKey':
+        from .rfc8037 import OKPKey
+        return OKPKey
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
 __all__ = [
     'JoseError',
+    'HeaderCache',
 
     'JsonWebSignature', 'JWSAlgorithm', 'JWSHeader', 'JWSObject',
+    'JWSSigner', 'JWSVerifier',
     'JsonWebEncryption', 'JWEAlgorithm', 'JWEEncAlgorithm', 'JWEZipAlgorithm',
 
-    'JsonWebKey', 'Key', 'KeySet',
+    'JsonWebKey', 'Key', 'KeySet', 'LazyKeySet', 'RemoteKeySet',
 
     'OctKey', 'RSAKey', 'ECKey', 'OKPKey',
 
-    'JsonWebToken', 'BaseClaims', 'JWTClaims',
+    'JsonWebToken', 'JWTIssuer', 'JWTVerifier', 'BaseClaims', 'JWTClaims',
+    'ClaimsValidator',
     'jwt',
 ]
@@ -0,0 +1,126 @@
+import base64
+import binascii
+from authlib.common.encoding import to_bytes, urlsafe_b64decode
+from .errors import DecodeError
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunks(data, chunk_size):
+    """Iterate bytes chunks from bytes, a file-like object or an iterable."""
+    if isinstance(data, (bytes, bytearray, memoryview, str)):
+        data = [data]
+    elif hasattr(data, 'read'):
+        data = _read_chunks(data, chunk_size)
+
+    for chunk in data:
+        if isinstance(chunk, str):
+            chunk = to_bytes(chunk)
+        if len(chunk) <= chunk_size:
+            if chunk:
+                yield bytes(chunk)
+            continue
+        # split large chunks, so that memory is bounded by chunk size
+        view = memoryview(chunk)
+        for i in range(0, len(view), chunk_size):
+            yield view[i:i + chunk_size].tobytes()
+
+
+def _read_chunks(fp, chunk_size):
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class Base64Encoder(object):
+    """Incremental base64url encoder without padding."""
+    def __init__(self):
+        self.buf = b''
+
+    def update(self, data):
+        data = self.buf + data
+        size = len(data) - len(data) % 3
+        self.buf = data[size:]
+        return base64.urlsafe_b64encode(data[:size])
+
+    def finalize(self):
+        return base64.urlsafe_b64encode(self.buf).rstrip(b'=')
+
+
+class Base64Decoder(object):
+    """Incremental base64url decoder, padding is optional."""
+    def __init__(self, name):
+        self.name = name
+        self.buf = b''
+
+    def update(self, data):
+        data = self.buf + data
+        size = len(data) - len(data) % 4
+        self.buf = data[size:]
+        return self._decode(data[:size])
+
+    def finalize(self):
+        return self._decode(self.buf)
+
+    def _decode(self, data):
+        try:
+            return urlsafe_b64decode(data)
+        except (TypeError, binascii.Error):
+            raise DecodeError('Invalid {} padding'.format(self.name))
+
+
+class SegmentReader(object):
+    """Read the dot separated segments of a compact serialization from an
+    iterable of bytes chunks."""
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buf = b''
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        for chunk in self.chunks:
+            self.buf += chunk
+            return True
+        self.eof = True
+        return False
+
+    def read_segment(self, max_size=DEFAULT_CHUNK_SIZE):
+        """Read a whole segment which is followed by a dot."""
+        while True:
+            index = self.buf.find(b'.')
+            if index >= 0:
+                segment = self.buf[:index]
+                self.buf = self.buf[index + 1:]
+                return segment
+            if len(self.buf) > max_size or not self._fill():
+                raise DecodeError('Not enough segments')
+
+    def iter_segment(self):
+        """Iterate the chunks of a large segment which is followed by a dot."""
+        while True:
+            index = self.buf.find(b'.')
+            if index >= 0:
+                data = self.buf[:index]
+                self.buf = self.buf[index + 1:]
+                if data:
+                    yield data
+                return
+            if self.buf:
+                data = self.buf
+                self.buf = b''
+                yield data
+            if not self._fill():
+                raise DecodeError('Not enough segments')
+
+    def read_last_segment(self, max_size=DEFAULT_CHUNK_SIZE):
+        """Read the remaining data as the last segment."""
+        while self._fill():
+            if len(self.buf) > max_size:
+                raise DecodeError('Invalid segment')
+        if b'.' in self.buf:
+            raise DecodeError('Too many segments')
+        return self.buf
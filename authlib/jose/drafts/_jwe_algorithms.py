@@ -6,6 +6,7 @@ from cryptography.hazmat.primitives.kdf.concatkdf import ConcatKDFHash
 from authlib.jose.errors import InvalidEncryptionAlgorithmForECDH1PUWithKeyWrappingError
 from authlib.jose.rfc7516 import JWEAlgorithmWithTagAwareKeyAgreement
 from authlib.jose.rfc7518 import AESAlgorithm, CBCHS2EncAlgorithm, ECKey, u32be_len_input
+from authlib.jose.rfc7518.derived_key_cache import load_derived_key
 from authlib.jose.rfc8037 import OKPKey
 
 
@@ -163,10 +164,14 @@ class ECDH1PUAlgorithm(JWEAlgorithmWithTagAwareKeyAgreement):
         else:
             bit_size = self.key_size
 
-        sender_pubkey = sender_key.get_op_key('wrapKey')
-        epk = key.import_key(headers['epk'])
-        epk_pubkey = epk.get_op_key('wrapKey')
-        dk = self.deliver_at_recipient(key, sender_pubkey, epk_pubkey, headers, bit_size, tag)
+        def deliver():
+            sender_pubkey = sender_key.get_op_key('wrapKey')
+            epk = key.import_key(headers['epk'])
+            epk_pubkey = epk.get_op_key('wrapKey')
+            return self.deliver_at_recipient(key, sender_pubkey, epk_pubkey, headers, bit_size, tag)
+
+        fixed_info = self.compute_fixed_info(headers, bit_size, tag)
+        dk = load_derived_key(key, headers, fixed_info, deliver, sender_key)
 
         if self.key_size is None:
             return dk
@@ -9,10 +9,10 @@
 """
 
 from .jws import JsonWebSignature
-from .models import JWSAlgorithm, JWSHeader, JWSObject
+from .models import JWSAlgorithm, JWSHeader, JWSObject, JWSSigner, JWSVerifier
 
 
 __all__ = [
     'JsonWebSignature',
-    'JWSAlgorithm', 'JWSHeader', 'JWSObject'
+    'JWSAlgorithm', 'JWSHeader', 'JWSObject', 'JWSSigner', 'JWSVerifier',
 ]
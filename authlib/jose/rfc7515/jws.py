@@ -7,7 +7,9 @@ from authlib.common.encoding import (
 from authlib.jose.util import (
     extract_header,
     extract_segment, ensure_dict,
+    run_in_executor, map_in_executor, LazyRegistry,
 )
+from authlib.common.async_helpers import maybe_await
 from authlib.jose.errors import (
     DecodeError,
     MissingAlgorithmError,
@@ -15,6 +17,7 @@ from authlib.jose.errors import (
     BadSignatureError,
     InvalidHeaderParameterNameError,
 )
+from .._stream import DEFAULT_CHUNK_SIZE, iter_chunks, Base64Encoder
 from .models import JWSHeader, JWSObject
 
 
@@ -24,15 +27,16 @@ class JsonWebSignature(object):
     REGISTERED_HEADER_PARAMETER_NAMES = frozenset([
         'alg', 'jku', 'jwk', 'kid',
         'x5u', 'x5c', 'x5t', 'x5t#S256',
-        'typ', 'cty', 'crit'
+        'typ', 'cty', 'crit', 'b64',
     ])
 
     #: Defined available JWS algorithms in the registry
-    ALGORITHMS_REGISTRY = {}
+    ALGORITHMS_REGISTRY = LazyRegistry()
 
-    def __init__(self, algorithms=None, private_headers=None):
+    def __init__(self, algorithms=None, private_headers=None, allow_unencoded_payload=False):
         self._private_headers = private_headers
         self._algorithms = algorithms
+        self._allow_unencoded_payload = allow_unencoded_payload
 
     @classmethod
     def register_algorithm(cls, algorithm):
@@ -56,20 +60,30 @@ class JsonWebSignature(object):
         :param payload: A bytes/string of payload
         :param key: Private key used to generate signature
         :return: byte
+
+        With ``"b64": false`` in ``protected`` (listed in ``crit``), the
+        payload is not encoded per RFC7797, it MUST NOT contain ``.``. It
+        is only allowed when this instance is created with
+        ``allow_unencoded_payload=True``.
         """
         jws_header = JWSHeader(protected, None)
         self._validate_private_headers(protected)
         algorithm, key = self._prepare_algorithm_key(protected, payload, key)
 
         protected_segment = json_b64encode(jws_header.protected)
-        payload_segment = urlsafe_b64encode(to_bytes(payload))
+        if _is_b64(protected, ValueError, self._allow_unencoded_payload):
+            payload_segment = urlsafe_b64encode(to_bytes(payload))
+        else:
+            payload_segment = to_bytes(payload)
+            if b'.' in payload_segment:
+                raise ValueError('Unencoded payload must not contain "."')
 
         # calculate signature
         signing_input = b'.'.join([protected_segment, payload_segment])
         signature = urlsafe_b64encode(algorithm.sign(signing_input, key))
         return b'.'.join([protected_segment, payload_segment, signature])
 
-    def deserialize_compact(self, s, key, decode=None):
+    def deserialize_compact(self, s, key, decode=None, header_cache=None):
         """Exact JWS Compact Serialization, and validate with the given key.
         If key is not provided, the returned dict will contain the signature,
         and signing input values. Via `Section 7.1`_.
@@ -77,33 +91,123 @@ class JsonWebSignature(object):
         :param s: text of JWS Compact Serialization
         :param key: key used to verify the signature
         :param decode: a function to decode payload data
+        :param header_cache: a HeaderCache of parsed protected headers
         :return: JWSObject
         :raise: BadSignatureError
 
+        A JWS with ``"b64": false`` raises :class:`DecodeError`, unless this
+        instance is created with ``allow_unencoded_payload=True``.
+
         .. _`Section 7.1`: https://tools.ietf.org/html/rfc7515#section-7.1
         """
-        try:
-            s = to_bytes(s)
-            signing_input, signature_segment = s.rsplit(b'.', 1)
-            protected_segment, payload_segment = signing_input.split(b'.', 1)
-        except ValueError:
-            raise DecodeError('Not enough segments')
+        signing_input, jws_header, payload, signature = self._extract_compact(
+            s, decode, header_cache)
+        rv = JWSObject(jws_header, payload, 'compact')
+        algorithm, key = self._prepare_algorithm_key(jws_header, payload, key)
+        if algorithm.verify(signing_input, signature, key):
+            return rv
+        raise BadSignatureError(rv)
 
-        protected = _extract_header(protected_segment)
-        jws_header = JWSHeader(protected, None)
+    async def async_deserialize_compact(self, s, key, decode=None,
+                                        header_cache=None, executor=None):
+        """Exact JWS Compact Serialization, and validate with the given key.
+        It is the same as :meth:`deserialize_compact`, except that ``key``
+        can be an async function which returns the key::
 
-        payload = _extract_payload(payload_segment)
-        if decode:
-            payload = decode(payload)
+            async def load_key(header, payload):
+                return await key_store.get(header['kid'])
+
+            await jws.async_deserialize_compact(s, load_key)
+
+        :param s: text of JWS Compact Serialization
+        :param key: key, or a (async) function to load the key
+        :param decode: a function to decode payload data
+        :param header_cache: a HeaderCache of parsed protected headers
+        :param executor: a ``concurrent.futures`` executor to verify
+            the signature in
+        :return: JWSObject
+        :raise: BadSignatureError
+        """
+        signing_input, jws_header, payload, signature = self._extract_compact(
+            s, decode, header_cache)
+        rv = JWSObject(jws_header, payload, 'compact')
+        algorithm = self._get_algorithm(jws_header)
+        if callable(key):
+            key = await maybe_await(key(jws_header, payload))
+            key = algorithm.prepare_key(key)
+        else:
+            key = self._prepare_key(algorithm, jws_header, payload, key)
+        valid = await run_in_executor(
+            executor, algorithm.verify, signing_input, signature, key)
+        if valid:
+            return rv
+        raise BadSignatureError(rv)
+
+    def serialize_detached(self, protected, payload, key, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Generate a JWS Compact Serialization with detached content, per
+        RFC7515 `Appendix F`_. The payload segment is empty, and the payload
+        is read and signed in chunks. With ``"b64": false`` in ``protected``
+        (listed in ``crit``), the payload is signed as it is, per RFC7797::
+
+            protected = {'alg': 'HS256', 'b64': False, 'crit': ['b64']}
+            with open('manifest.json', 'rb') as f:
+                s = jws.serialize_detached(protected, f, key)
 
+        :param protected: A dict of protected header
+        :param payload: bytes, a file-like object or an iterable of bytes
+        :param key: Private key used to generate signature
+        :param chunk_size: size of the chunks to read from payload
+        :return: bytes
+
+        .. _`Appendix F`: https://tools.ietf.org/html/rfc7515#appendix-F
+        """
+        jws_header = JWSHeader(protected, None)
+        self._validate_private_headers(protected)
+        algorithm, key = self._prepare_algorithm_key(protected, None, key)
+        b64 = _is_b64(protected, ValueError)
+
+        protected_segment = json_b64encode(jws_header.protected)
+        chunks = _iter_signing_input(protected_segment, payload, b64, chunk_size)
+        signature = urlsafe_b64encode(algorithm.sign_stream(chunks, key))
+        return b'.'.join([protected_segment, b'', signature])
+
+    def deserialize_detached(self, s, payload, key, header_cache=None,
+                             chunk_size=DEFAULT_CHUNK_SIZE):
+        """Exact JWS Compact Serialization with detached content, and
+        validate it with the given payload and key. The payload is read and
+        verified in chunks, see :meth:`serialize_detached`.
+
+        :param s: text of JWS Compact Serialization with empty payload
+        :param payload: bytes, a file-like object or an iterable of bytes
+        :param key: key used to verify the signature
+        :param header_cache: a HeaderCache of parsed protected headers
+        :param chunk_size: size of the chunks to read from payload
+        :return: JWSObject, the ``payload`` is the given payload
+        :raise: BadSignatureError
+        """
+        try:
+            protected_segment, payload_segment, signature_segment = to_bytes(s).split(b'.')
+        except ValueError:
+            raise DecodeError('Invalid segments length')
+        if payload_segment:
+            raise DecodeError('Payload segment must be empty')
+
+        if header_cache is None:
+            protected = _extract_header(protected_segment)
+        else:
+            protected = header_cache.extract(protected_segment, DecodeError)
+        jws_header = JWSHeader(protected, None)
+        b64 = _is_b64(protected, DecodeError)
         signature = _extract_signature(signature_segment)
+
         rv = JWSObject(jws_header, payload, 'compact')
         algorithm, key = self._prepare_algorithm_key(jws_header, payload, key)
-        if algorithm.verify(signing_input, signature, key):
+        chunks = _iter_signing_input(protected_segment, payload, b64, chunk_size)
+        if algorithm.verify_stream(chunks, signature, key):
             return rv
         raise BadSignatureError(rv)
 
-    def serialize_json(self, header_obj, payload, key):
+    def serialize_json(self, header_obj, payload, key, executor=None):
         """Generate a JWS JSON Serialization. The JWS JSON Serialization
         represents digitally signed or MACed content as a JSON object,
         per `Section 7.2`_.
@@ -111,6 +215,8 @@ class JsonWebSignature(object):
         :param header_obj: A dict/list of header
         :param payload: A string/dict of payload
         :param key: Private key used to generate signature
+        :param executor: a ``concurrent.futures`` executor to generate
+            the signatures in parallel
         :return: JWSObject
 
         Example ``header_obj`` of JWS JSON Serialization::
@@ -146,13 +252,14 @@ class JsonWebSignature(object):
             data['payload'] = to_unicode(payload_segment)
             return data
 
-        signatures = [_sign(JWSHeader.from_dict(h)) for h in header_obj]
+        headers = [JWSHeader.from_dict(h) for h in header_obj]
+        signatures = map_in_executor(executor, _sign, headers)
         return {
             'payload': to_unicode(payload_segment),
             'signatures': signatures
         }
 
-    def deserialize_json(self, obj, key, decode=None):
+    def deserialize_json(self, obj, key, decode=None, executor=None):
         """Exact JWS JSON Serialization, and validate with the given key.
         If key is not provided, it will return a dict without signature
         verification. Header will still be validated. Via `Section 7.2`_.
@@ -160,6 +267,8 @@ class JsonWebSignature(object):
         :param obj: text of JWS JSON Serialization
         :param key: key used to verify the signature
         :param decode: a function to decode payload data
+        :param executor: a ``concurrent.futures`` executor to verify
+            the signatures in parallel
         :return: JWSObject
         :raise: BadSignatureError
 
@@ -186,11 +295,13 @@ class JsonWebSignature(object):
                 return rv
             raise BadSignatureError(rv)
 
+        def _verify(header_obj):
+            return self._validate_json_jws(
+                payload_segment, payload, header_obj, key)
+
         headers = []
         is_valid = True
-        for header_obj in obj['signatures']:
-            jws_header, valid = self._validate_json_jws(
-                payload_segment, payload, header_obj, key)
+        for jws_header, valid in map_in_executor(executor, _verify, obj['signatures']):
             headers.append(jws_header)
             if not valid:
                 is_valid = False
@@ -239,7 +350,31 @@ class JsonWebSignature(object):
             return self.deserialize_json(s, key, decode)
         return self.deserialize_compact(s, key, decode)
 
-    def _prepare_algorithm_key(self, header, payload, key):
+    def _extract_compact(self, s, decode, header_cache):
+        try:
+            s = to_bytes(s)
+            signing_input, signature_segment = s.rsplit(b'.', 1)
+            protected_segment, payload_segment = signing_input.split(b'.', 1)
+        except ValueError:
+            raise DecodeError('Not enough segments')
+
+        if header_cache is None:
+            protected = _extract_header(protected_segment)
+        else:
+            protected = header_cache.extract(protected_segment, DecodeError)
+        jws_header = JWSHeader(protected, None)
+
+        if _is_b64(protected, DecodeError, self._allow_unencoded_payload):
+            payload = _extract_payload(payload_segment)
+        else:
+            payload = payload_segment
+        if decode:
+            payload = decode(payload)
+
+        signature = _extract_signature(signature_segment)
+        return signing_input, jws_header, payload, signature
+
+    def _get_algorithm(self, header):
         if 'alg' not in header:
             raise MissingAlgorithmError()
 
@@ -248,13 +383,18 @@ class JsonWebSignature(object):
             raise UnsupportedAlgorithmError()
         if alg not in self.ALGORITHMS_REGISTRY:
             raise UnsupportedAlgorithmError()
+        return self.ALGORITHMS_REGISTRY[alg]
 
-        algorithm = self.ALGORITHMS_REGISTRY[alg]
+    def _prepare_key(self, algorithm, header, payload, key):
         if callable(key):
             key = key(header, payload)
         elif key is None and 'jwk' in header:
             key = header['jwk']
-        key = algorithm.prepare_key(key)
+        return algorithm.prepare_key(key)
+
+    def _prepare_algorithm_key(self, header, payload, key):
+        algorithm = self._get_algorithm(header)
+        key = self._prepare_key(algorithm, header, payload, key)
         return algorithm, key
 
     def _validate_private_headers(self, header):
@@ -292,6 +432,32 @@ class JsonWebSignature(object):
         return jws_header, False
 
 
+def _is_b64(protected, error_cls, allow_unencoded=True):
+    b64 = protected.get('b64', True)
+    if not isinstance(b64, bool):
+        raise error_cls('Invalid "b64" header value')
+    if not b64:
+        if not allow_unencoded:
+            raise error_cls('Unencoded payload is not allowed')
+        crit = protected.get('crit')
+        if not isinstance(crit, list) or 'b64' not in crit:
+            raise error_cls('"b64" header must be listed in "crit"')
+    return b64
+
+
+def _iter_signing_input(protected_segment, payload, b64, chunk_size):
+    yield protected_segment + b'.'
+    chunks = iter_chunks(payload, chunk_size)
+    if not b64:
+        yield from chunks
+        return
+
+    encoder = Base64Encoder()
+    for chunk in chunks:
+        yield encoder.update(chunk)
+    yield encoder.finalize()
+
+
 def _extract_header(header_segment):
     return extract_header(header_segment, DecodeError)
 
@@ -30,6 +30,75 @@ class JWSAlgorithm(object):
         """
         raise NotImplementedError
 
+    def sign_stream(self, chunks, key):
+        """Sign the message in an iterable of bytes chunks. Algorithms which
+        can hash the message incrementally SHOULD override this method, the
+        default implementation joins the chunks in memory.
+
+        :param chunks: an iterable of message bytes chunks
+        :param key: private key to sign the message
+        :return: bytes
+        """
+        return self.sign(b''.join(chunks), key)
+
+    def verify_stream(self, chunks, sig, key):
+        """Verify the signature of the message in an iterable of bytes chunks.
+
+        :param chunks: an iterable of message bytes chunks
+        :param sig: result signature to be compared
+        :param key: public key to verify the signature
+        :return: boolean
+        """
+        return self.verify(b''.join(chunks), sig, key)
+
+    def prepare(self, key, operation):
+        """Create a signer or verifier bound to the prepared key, which can
+        be reused for many messages. Algorithms resolve the raw key, and the
+        hash and padding objects once::
+
+            signer = algorithm.prepare(key, 'sign')
+            sig = signer.sign(msg)
+
+        :param key: key returned by :meth:`prepare_key`
+        :param operation: key operation, ``sign`` or ``verify``
+        :return: JWSSigner or JWSVerifier
+        """
+        if operation == 'sign':
+            return JWSSigner(self.sign, key)
+        if operation == 'verify':
+            return JWSVerifier(self.verify, key)
+        raise ValueError('Unsupported operation "{}"'.format(operation))
+
+
+class JWSSigner(object):
+    """A signer created by :meth:`JWSAlgorithm.prepare`.
+
+    :param sign: a function to sign ``(msg, key)``
+    :param key: the key passed to ``sign``
+    """
+    def __init__(self, sign, key):
+        self._sign = sign
+        self.key = key
+
+    def sign(self, msg):
+        """Sign the text msg, return the signature bytes."""
+        return self._sign(msg, self.key)
+
+
+class JWSVerifier(object):
+    """A verifier created by :meth:`JWSAlgorithm.prepare`.
+
+    :param verify: a function to verify ``(msg, sig, key)``
+    :param key: the key passed to ``verify``
+    """
+    def __init__(self, verify, key):
+        self._verify = verify
+        self.key = key
+
+    def verify(self, msg, sig):
+        """Verify the signature of text msg, return a boolean."""
+        return self._verify(msg, sig, self.key)
+
 
 class JWSHeader(dict):
     """Header object for JWS. It combine the protected header and unprotected
@@ -8,7 +8,9 @@ from authlib.jose.rfc7516.models import JWEAlgorithmWithTagAwareKeyAgreement, JW
 from authlib.jose.util import (
     extract_header,
     extract_segment, ensure_dict,
+    run_in_executor, map_in_executor, LazyRegistry,
 )
+from authlib.common.async_helpers import maybe_await
 from authlib.jose.errors import (
     DecodeError,
     MissingAlgorithmError,
@@ -18,6 +20,13 @@ from authlib.jose.errors import (
     UnsupportedCompressionAlgorithmError,
     InvalidHeaderParameterNameError, InvalidAlgorithmForMultipleRecipientsMode, KeyMismatchError,
 )
+from .._stream import (
+    DEFAULT_CHUNK_SIZE,
+    iter_chunks,
+    Base64Encoder,
+    Base64Decoder,
+    SegmentReader,
+)
 
 
 class JsonWebEncryption(object):
@@ -29,9 +38,9 @@ class JsonWebEncryption(object):
         'typ', 'cty', 'crit'
     ])
 
-    ALG_REGISTRY = {}
-    ENC_REGISTRY = {}
-    ZIP_REGISTRY = {}
+    ALG_REGISTRY = LazyRegistry()
+    ENC_REGISTRY = LazyRegistry()
+    ZIP_REGISTRY = LazyRegistry()
 
     def __init__(self, algorithms=None, private_headers=None):
         self._algorithms = algorithms
@@ -144,7 +153,70 @@ class JsonWebEncryption(object):
             urlsafe_b64encode(tag)
         ])
 
-    def serialize_json(self, header_obj, payload, keys, sender_key=None):
+    def serialize_compact_stream(self, protected, payload, key, sender_key=None,
+                                 chunk_size=DEFAULT_CHUNK_SIZE):
+        """Generate a JWE Compact Serialization incrementally. It is the
+        same as :meth:`serialize_compact`, except that the payload is read
+        and encrypted in chunks::
+
+            with open('document.pdf', 'rb') as f, open('document.jwe', 'wb') as out:
+                for chunk in jwe.serialize_compact_stream(protected, f, key):
+                    out.write(chunk)
+
+        The ``enc`` (and ``zip``) algorithm MUST support incremental
+        contexts, and key agreement with key wrapping of tag-aware
+        algorithms is not supported, since the encrypted key would depend
+        on the authentication tag.
+
+        :param protected: A dict of protected header
+        :param payload: bytes, a file-like object or an iterable of bytes
+        :param key: Public key used to encrypt payload
+        :param sender_key: Sender's private key in case
+            JWEAlgorithmWithTagAwareKeyAgreement is used
+        :param chunk_size: size of chunks to read from the payload
+        :return: a generator of bytes chunks of the JWE compact serialization
+        """
+        alg = self.get_header_alg(protected)
+        enc = self.get_header_enc(protected)
+        zip_alg = self.get_header_zip(protected)
+
+        self._validate_sender_key(sender_key, alg)
+        self._validate_private_headers(protected, alg)
+        if isinstance(alg, JWEAlgorithmWithTagAwareKeyAgreement) and alg.key_size is not None:
+            raise ValueError('"{}" algorithm does not support streaming'.format(alg.name))
+
+        key = prepare_key(alg, protected, key)
+        if sender_key is not None:
+            sender_key = alg.prepare_key(sender_key)
+
+        if isinstance(alg, JWEAlgorithmWithTagAwareKeyAgreement):
+            wrapped = alg.wrap(enc, protected, key, sender_key)
+        else:
+            wrapped = alg.wrap(enc, protected, key)
+        cek = wrapped['cek']
+        ek = wrapped['ek']
+        if 'header' in wrapped:
+            protected.update(wrapped['header'])
+
+        iv = enc.generate_iv()
+        protected_segment = json_b64encode(protected)
+        aad = to_bytes(protected_segment, 'ascii')
+
+        encryptor = _create_stream_context(enc, enc.encryptor, aad, iv, cek)
+        compressor = None
+        if zip_alg:
+            compressor = _create_stream_context(zip_alg, zip_alg.compressor)
+
+        prefix = b'.'.join([
+            protected_segment,
+            urlsafe_b64encode(ek),
+            urlsafe_b64encode(iv),
+            b'',
+        ])
+        chunks = iter_chunks(payload, chunk_size)
+        return _encrypt_stream(prefix, chunks, encryptor, compressor)
+
+    def serialize_json(self, header_obj, payload, keys, sender_key=None, executor=None):
         """Generate a JWE JSON Serialization (in fully general syntax).
 
         The JWE JSON Serialization represents encrypted content as a JSON
@@ -221,6 +293,8 @@ class JsonWebEncryption(object):
         :param keys: Public keys (or a single public key) used to encrypt payload
         :param sender_key: Sender's private key in case
             JWEAlgorithmWithTagAwareKeyAgreement is used
+        :param executor: a ``concurrent.futures`` executor to encrypt the
+            CEK for the recipients in parallel
         :return: JWE JSON serialization (in fully general syntax) as dict
 
         Example of `header_obj`::
@@ -309,9 +383,11 @@ class JsonWebEncryption(object):
         if isinstance(alg, JWEAlgorithmWithTagAwareKeyAgreement) and alg.key_size is not None:
             # For a JWE algorithm with tag-aware key agreement in case key agreement with key wrapping mode is used:
             # Defer key agreement with key wrapping until authentication tag is computed
+            def _prepare(key):
+                return alg.generate_keys_and_prepare_headers(enc, key, sender_key, preset)
+
             epks = []
-            for i in range(len(keys)):
-                prep = alg.generate_keys_and_prepare_headers(enc, keys[i], sender_key, preset)
+            for i, prep in enumerate(map_in_executor(executor, _prepare, keys)):
                 if cek is None:
                     cek = prep['cek']
                 epks.append(prep['epk'])
@@ -319,11 +395,12 @@ class JsonWebEncryption(object):
         else:
             # In any other case:
             # Keep the normal steps order defined by RFC 7516
-            for i in range(len(keys)):
+            def _wrap(key):
                 if isinstance(alg, JWEAlgorithmWithTagAwareKeyAgreement):
-                    wrapped = alg.wrap(enc, shared_header, keys[i], sender_key, preset)
-                else:
-                    wrapped = alg.wrap(enc, shared_header, keys[i], preset)
+                    return alg.wrap(enc, shared_header, key, sender_key, preset)
+                return alg.wrap(enc, shared_header, key, preset)
+
+            for i, wrapped in enumerate(map_in_executor(executor, _wrap, keys)):
                 if cek is None:
                     cek = wrapped['cek']
                 recipients[i]['encrypted_key'] = wrapped['ek']
@@ -357,8 +434,10 @@ class JsonWebEncryption(object):
         if isinstance(alg, JWEAlgorithmWithTagAwareKeyAgreement) and alg.key_size is not None:
             # For a JWE algorithm with tag-aware key agreement in case key agreement with key wrapping mode is used:
             # Perform key agreement with key wrapping deferred at step 3
-            for i in range(len(keys)):
-                wrapped = alg.agree_upon_key_and_wrap_cek(enc, shared_header, keys[i], sender_key, epks[i], cek, tag)
+            def _agree_and_wrap(key, epk):
+                return alg.agree_upon_key_and_wrap_cek(enc, shared_header, key, sender_key, epk, cek, tag)
+
+            for i, wrapped in enumerate(map_in_executor(executor, _agree_and_wrap, keys, epks)):
                 recipients[i]['encrypted_key'] = wrapped['ek']
 
         # step 8: build resulting message
@@ -411,7 +490,7 @@ class JsonWebEncryption(object):
 
         return self.serialize_compact(header, payload, key, sender_key)
 
-    def deserialize_compact(self, s, key, decode=None, sender_key=None):
+    def deserialize_compact(self, s, key, decode=None, sender_key=None, header_cache=None):
         """Extract JWE Compact Serialization.
 
         :param s: JWE Compact Serialization as bytes
@@ -420,6 +499,7 @@ class JsonWebEncryption(object):
         :param decode: Function to decode payload data
         :param sender_key: Sender's public key in case
             JWEAlgorithmWithTagAwareKeyAgreement is used
+        :param header_cache: a HeaderCache of parsed protected headers
         :return: dict with `header` and `payload` keys where `header` value is
             a dict containing protected header fields
         """
@@ -429,7 +509,10 @@ class JsonWebEncryption(object):
         except ValueError:
             raise DecodeError('Not enough segments')
 
-        protected = extract_header(protected_s, DecodeError)
+        if header_cache is None:
+            protected = extract_header(protected_s, DecodeError)
+        else:
+            protected = header_cache.extract(protected_s, DecodeError)
         ek = extract_segment(ek_s, DecodeError, 'encryption key')
         iv = extract_segment(iv_s, DecodeError, 'initialization vector')
         ciphertext = extract_segment(ciphertext_s, DecodeError, 'ciphertext')
@@ -477,15 +560,114 @@ class JsonWebEncryption(object):
             payload = decode(payload)
         return {'header': protected, 'payload': payload}
 
-    def deserialize_json(self, obj, key, decode=None, sender_key=None):
+    async def async_deserialize_compact(self, s, key, decode=None, sender_key=None,
+                                        header_cache=None, executor=None):
+        """Extract JWE Compact Serialization. It is the same as
+        :meth:`deserialize_compact`, except that ``key`` can be an async
+        function which returns the key.
+
+        :param s: JWE Compact Serialization as bytes
+        :param key: Private key, or a (async) function to load the key
+        :param decode: Function to decode payload data
+        :param sender_key: Sender's public key in case
+            JWEAlgorithmWithTagAwareKeyAgreement is used
+        :param header_cache: a HeaderCache of parsed protected headers
+        :param executor: a ``concurrent.futures`` executor to decrypt
+            the payload in
+        :return: dict with `header` and `payload` keys
+        """
+        if callable(key):
+            protected_s = to_bytes(s).split(b'.', 1)[0]
+            if header_cache is None:
+                protected = extract_header(protected_s, DecodeError)
+            else:
+                protected = header_cache.extract(protected_s, DecodeError)
+            key = await maybe_await(key(protected, None))
+
+        return await run_in_executor(
+            executor, self.deserialize_compact,
+            s, key, decode, sender_key, header_cache,
+        )
+
+    def deserialize_compact_stream(self, s, key, sender_key=None,
+                                   chunk_size=DEFAULT_CHUNK_SIZE):
+        """Extract JWE Compact Serialization incrementally. The header is
+        parsed and the content encryption key is unwrapped immediately, the
+        payload is a generator which decrypts the ciphertext in chunks::
+
+            with open('document.jwe', 'rb') as f:
+                data = jwe.deserialize_compact_stream(f, key)
+                with open('document.pdf', 'wb') as out:
+                    for chunk in data['payload']:
+                        out.write(chunk)
+
+        The authentication tag is verified after the last chunk is
+        decrypted. If the generator raises an error, the plaintext which
+        has been produced MUST be discarded.
+
+        :param s: bytes, a file-like object or an iterable of bytes
+        :param key: Private key used to decrypt payload
+            (optionally can be a tuple of kid and essentially key)
+        :param sender_key: Sender's public key in case
+            JWEAlgorithmWithTagAwareKeyAgreement is used
+        :param chunk_size: size of chunks to read from the input
+        :return: dict with `header` and `payload` keys where `payload` is
+            a generator of bytes chunks
+        """
+        reader = SegmentReader(iter_chunks(s, chunk_size))
+        protected_s = reader.read_segment()
+        protected = extract_header(protected_s, DecodeError)
+        ek = extract_segment(reader.read_segment(), DecodeError, 'encryption key')
+        iv = extract_segment(reader.read_segment(), DecodeError, 'initialization vector')
+
+        alg = self.get_header_alg(protected)
+        enc = self.get_header_enc(protected)
+        zip_alg = self.get_header_zip(protected)
+
+        self._validate_sender_key(sender_key, alg)
+        self._validate_private_headers(protected, alg)
+        if isinstance(alg, JWEAlgorithmWithTagAwareKeyAgreement) and alg.key_size is not None:
+            raise ValueError('"{}" algorithm does not support streaming'.format(alg.name))
+
+        if isinstance(key, tuple) and len(key) == 2:
+            # Ignore separately provided kid, extract essentially key only
+            key = key[1]
+
+        key = prepare_key(alg, protected, key)
+        if sender_key is not None:
+            sender_key = alg.prepare_key(sender_key)
+
+        if isinstance(alg, JWEAlgorithmWithTagAwareKeyAgreement):
+            cek = alg.unwrap(enc, ek, protected, key, sender_key)
+        else:
+            cek = alg.unwrap(enc, ek, protected, key)
+
+        aad = to_bytes(protected_s, 'ascii')
+        decryptor = _create_stream_context(enc, enc.decryptor, aad, iv, cek)
+        decompressor = None
+        if zip_alg:
+            decompressor = _create_stream_context(zip_alg, zip_alg.decompressor)
+
+        payload = _decrypt_stream(reader, decryptor, decompressor, chunk_size)
+        return {'header': protected, 'payload': payload}
+
+    def deserialize_json(self, obj, key, decode=None, sender_key=None, metrics=None):
         """Extract JWE JSON Serialization.
 
+        The recipients are matched with the key by the ``kid``, ``jwk``,
+        ``x5t`` and ``x5t#S256`` values in their headers, a ``kid`` can also
+        be the thumbprint of the key. Only the matching recipients are
+        unwrapped, the recipients without an identifier of the key are tried
+        one by one when there is no match.
+
         :param obj: JWE JSON Serialization as dict or str
         :param key: Private key used to decrypt payload
             (optionally can be a tuple of kid and essentially key)
         :param decode: Function to decode payload data
         :param sender_key: Sender's public key in case
             JWEAlgorithmWithTagAwareKeyAgreement is used
+        :param metrics: a dict to save the number of unwrap attempts
+            as ``metrics['unwrap_attempts']``
         :return: dict with `header` and `payload` keys where `header` value is
             a dict containing `protected`, `unprotected`, `recipients` and/or
             `aad` keys
@@ -554,25 +736,26 @@ class JsonWebEncryption(object):
             return alg.unwrap(enc, ek, header, key)
 
         def _unwrap_for_matching_recipient(unwrap_func):
-            if kid is not None:
-                for recipient in recipients:
-                    if recipient['header'].get('kid') == kid:
-                        header = JWEHeader(protected, unprotected, recipient['header'])
-                        return unwrap_func(recipient['encrypted_key'], header)
+            matched, unknown = _match_recipients(recipients, key, kid)
 
-            # Since no explicit match has been found, iterate over all the recipients
+            # If no explicit match has been found, try the unknown recipients
+            attempts = 0
             error = None
-            for recipient in recipients:
-                header = JWEHeader(protected, unprotected, recipient['header'])
-                try:
-                    return unwrap_func(recipient['encrypted_key'], header)
-                except Exception as e:
-                    error = e
-            else:
-                if error is None:
-                    raise KeyMismatchError()
-                else:
-                    raise error
+            try:
+                for recipient in matched or unknown:
+                    header = JWEHeader(protected, unprotected, recipient['header'])
+                    attempts += 1
+                    try:
+                        return unwrap_func(recipient['encrypted_key'], header)
+                    except Exception as e:
+                        error = e
+            finally:
+                if metrics is not None:
+                    metrics['unwrap_attempts'] = attempts
+
+            if error is None:
+                raise KeyMismatchError()
+            raise error
 
         if isinstance(alg, JWEAlgorithmWithTagAwareKeyAgreement):
             # For a JWE algorithm with tag-aware key agreement:
@@ -720,3 +903,109 @@ def prepare_key(alg, header, key):
     elif key is None and 'jwk' in header:
         key = header['jwk']
     return alg.prepare_key(key)
+
+
+def _match_recipients(recipients, key, kid):
+    """Split the recipients into the ones which are identified by the key,
+    and the ones which can not be told apart from the key."""
+    matched = []
+    unknown = []
+    thumbprint = []
+    tokens = key.tokens
+    fields = ['kty'] + list(key.REQUIRED_JSON_FIELDS)
+
+    def get_thumbprint():
+        if not thumbprint:
+            thumbprint.append(key.thumbprint())
+        return thumbprint[0]
+
+    for recipient in recipients:
+        rv = _match_recipient(recipient['header'], tokens, fields, kid, get_thumbprint)
+        if rv:
+            matched.append(recipient)
+        elif rv is None:
+            unknown.append(recipient)
+    return matched, unknown
+
+
+def _match_recipient(header, tokens, fields, kid, get_thumbprint):
+    # True for a match, False for another key, None if it is unknown
+    rv = None
+    value = header.get('kid')
+    if value is not None:
+        if value == kid or value == get_thumbprint():
+            return True
+        if kid is not None:
+            rv = False
+
+    jwk = header.get('jwk')
+    if isinstance(jwk, dict):
+        if all(jwk.get(k) == tokens.get(k) for k in fields):
+            return True
+        rv = False
+
+    for name in ('x5t', 'x5t#S256'):
+        value = header.get(name)
+        expected = tokens.get(name)
+        if value is not None and expected is not None:
+            if value == expected:
+                return True
+            rv = False
+    return rv
+
+
+def _create_stream_context(algorithm, factory, *args):
+    try:
+        return factory(*args)
+    except NotImplementedError:
+        raise ValueError('"{}" algorithm does not support streaming'.format(algorithm.name))
+
+
+def _encrypt_stream(prefix, chunks, encryptor, compressor):
+    yield prefix
+    encoder = Base64Encoder()
+    for chunk in chunks:
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+        data = encoder.update(encryptor.update(chunk))
+        if data:
+            yield data
+
+    if compressor is not None:
+        data = encryptor.update(compressor.flush())
+    else:
+        data = b''
+    ciphertext, tag = encryptor.finalize()
+    yield encoder.update(data + ciphertext) + encoder.finalize()
+    yield b'.' + urlsafe_b64encode(tag)
+
+
+def _decrypt_stream(reader, decryptor, decompressor, chunk_size):
+    decoder = Base64Decoder('ciphertext')
+    for chunk in reader.iter_segment():
+        data = decryptor.update(decoder.update(chunk))
+        for rv in _decompress(decompressor, data, chunk_size):
+            yield rv
+
+    data = decryptor.update(decoder.finalize())
+    tag = extract_segment(reader.read_last_segment(), DecodeError, 'authentication tag')
+    data += decryptor.finalize(tag)
+    for rv in _decompress(decompressor, data, chunk_size):
+        yield rv
+    if decompressor is not None:
+        data = decompressor.flush()
+        if data:
+            yield data
+
+
+def _decompress(decompressor, data, chunk_size):
+    if decompressor is None:
+        if data:
+            yield data
+        return
+
+    while data:
+        rv = decompressor.decompress(data, chunk_size)
+        if rv:
+            yield rv
+        data = decompressor.unconsumed_tail
@@ -89,6 +89,29 @@ class JWEEncAlgorithm(object):
         """
         raise NotImplementedError
 
+    def encryptor(self, aad, iv, key):
+        """Create an incremental encryption context, which has
+        ``update(data)`` returning ciphertext bytes, and ``finalize()``
+        returning a tuple of the remaining ciphertext and the tag.
+
+        :param aad: additional authenticated data in bytes
+        :param iv: initialization vector in bytes
+        :param key: encrypted key in bytes
+        """
+        raise NotImplementedError
+
+    def decryptor(self, aad, iv, key):
+        """Create an incremental decryption context, which has
+        ``update(data)`` returning plaintext bytes, and ``finalize(tag)``
+        returning the remaining plaintext. The tag is only verified in
+        ``finalize``.
+
+        :param aad: additional authenticated data in bytes
+        :param iv: initialization vector in bytes
+        :param key: encrypted key in bytes
+        """
+        raise NotImplementedError
+
 
 class JWEZipAlgorithm(object):
     name = None
@@ -102,6 +125,17 @@ class JWEZipAlgorithm(object):
     def decompress(self, s):
         raise NotImplementedError
 
+    def compressor(self):
+        """Create an incremental compression context, which has
+        ``compress(data)`` and ``flush()``, like ``zlib.compressobj``."""
+        raise NotImplementedError
+
+    def decompressor(self):
+        """Create an incremental decompression context, which has
+        ``decompress(data, max_length)``, ``unconsumed_tail`` and
+        ``flush()``, like ``zlib.decompressobj``."""
+        raise NotImplementedError
+
 
 class JWESharedHeader(dict):
     """Shared header object for JWE.
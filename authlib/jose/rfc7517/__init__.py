@@ -10,8 +10,13 @@
 from ._cryptography_key import load_pem_key
 from .base_key import Key
 from .asymmetric_key import AsymmetricKey
-from .key_set import KeySet
+from .key_set import KeySet, LazyKeySet
 from .jwk import JsonWebKey
+from .key_cache import KeyCache, set_key_cache, get_key_cache
+from .remote_key_set import RemoteKeySet
 
 
-__all__ = ['Key', 'AsymmetricKey', 'KeySet', 'JsonWebKey', 'load_pem_key']
+__all__ = [
+    'Key', 'AsymmetricKey', 'KeySet', 'LazyKeySet', 'JsonWebKey', 'load_pem_key',
+    'KeyCache', 'set_key_cache', 'get_key_cache', 'RemoteKeySet',
+]
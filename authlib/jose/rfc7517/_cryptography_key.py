@@ -1,12 +1,14 @@
-from cryptography.x509 import load_pem_x509_certificate
-from cryptography.hazmat.primitives.serialization import (
-    load_pem_private_key, load_pem_public_key, load_ssh_public_key,
-)
-from cryptography.hazmat.backends import default_backend
 from authlib.common.encoding import to_bytes
 
 
 def load_pem_key(raw, ssh_type=None, key_type=None, password=None):
+    # cryptography is imported on the first call, it is expensive to import
+    from cryptography.x509 import load_pem_x509_certificate
+    from cryptography.hazmat.primitives.serialization import (
+        load_pem_private_key, load_pem_public_key, load_ssh_public_key,
+    )
+    from cryptography.hazmat.backends import default_backend
+
     raw = to_bytes(raw)
 
     if ssh_type and raw.startswith(ssh_type):
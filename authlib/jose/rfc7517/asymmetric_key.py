@@ -1,10 +1,7 @@
 from authlib.common.encoding import to_bytes
-from cryptography.hazmat.primitives.serialization import (
-    Encoding, PrivateFormat, PublicFormat,
-    BestAvailableEncryption, NoEncryption,
-)
 from ._cryptography_key import load_pem_key
 from .base_key import Key
+from .key_cache import load_cached_key
 
 
 class AsymmetricKey(Key):
@@ -24,7 +21,7 @@ class AsymmetricKey(Key):
     def public_only(self):
         if self.private_key:
             return False
-        if 'd' in self.tokens:
+        if 'd' in self._get_tokens():
             return False
         return True
 
@@ -54,21 +51,25 @@ class AsymmetricKey(Key):
         if self.private_key:
             return self.private_key
 
-        if self.tokens:
+        if self._get_tokens():
             self.load_raw_key()
         return self.private_key
 
     def load_raw_key(self):
-        if 'd' in self.tokens:
-            self.private_key = self.load_private_key()
+        tokens = self._get_tokens()
+        if 'd' in tokens:
+            parts = [self.kty] + [tokens.get(k) for k in self.PRIVATE_KEY_FIELDS]
+            self.private_key = load_cached_key(parts, self.load_private_key)
         else:
-            self.public_key = self.load_public_key()
+            parts = [self.kty] + [tokens.get(k) for k in self.PUBLIC_KEY_FIELDS]
+            self.public_key = load_cached_key(parts, self.load_public_key)
 
     def load_dict_key(self):
         if self.private_key:
             self._dict_data.update(self.dumps_private_key())
         else:
             self._dict_data.update(self.dumps_public_key())
+        self._tokens = None
 
     def dumps_private_key(self):
         raise NotImplementedError()
@@ -116,6 +117,10 @@ class AsymmetricKey(Key):
         :param password: encrypt private key with password
         :return: bytes
         """
+        from cryptography.hazmat.primitives.serialization import (
+            Encoding, PrivateFormat, PublicFormat,
+            BestAvailableEncryption, NoEncryption,
+        )
 
         if encoding is None or encoding == 'PEM':
             encoding = Encoding.PEM
@@ -159,7 +164,7 @@ class AsymmetricKey(Key):
     def import_key(cls, raw, options=None):
         if isinstance(raw, cls):
             if options is not None:
-                raw.options.update(options)
+                raw.update_options(options)
             return raw
 
         if isinstance(raw, cls.PUBLIC_KEY_CLS):
@@ -173,7 +178,10 @@ class AsymmetricKey(Key):
                 password = options.pop('password', None)
             else:
                 password = None
-            raw_key = load_pem_key(raw, cls.SSH_PUBLIC_PREFIX, password=password)
+            raw_key = load_cached_key(
+                [b'pem', cls.SSH_PUBLIC_PREFIX, password, raw],
+                lambda: load_pem_key(raw, cls.SSH_PUBLIC_PREFIX, password=password),
+            )
             if isinstance(raw_key, cls.PUBLIC_KEY_CLS):
                 key = cls(public_key=raw_key, options=options)
             elif isinstance(raw_key, cls.PRIVATE_KEY_CLS):
@@ -8,6 +8,9 @@ from authlib.common.encoding import (
 )
 from ..errors import InvalidUseError
 
+SIG_KEY_OPS = frozenset(['sign', 'verify'])
+ENC_KEY_OPS = frozenset(['decrypt', 'encrypt', 'wrapKey', 'unwrapKey'])
+
 
 class Key(object):
     """This is the base class for a JSON Web Key."""
@@ -28,30 +31,73 @@ class Key(object):
     REQUIRED_JSON_FIELDS = []
 
     def __init__(self, options=None):
-        self.options = options or {}
-        self._dict_data = {}
+        self._options = options or {}
+        self._data = {}
+        self._tokens = None
+        self._key_ops = None
+        self._use = None
+
+    @property
+    def options(self):
+        return self._options
+
+    @options.setter
+    def options(self, options):
+        self._options = options
+        self._tokens = None
+
+    @property
+    def _dict_data(self):
+        return self._data
+
+    @_dict_data.setter
+    def _dict_data(self, data):
+        self._data = data
+        self._tokens = None
 
     @property
     def tokens(self):
-        if not self._dict_data:
+        """A copy of the JSON Web Key parameters of this key."""
+        return dict(self._get_tokens())
+
+    def _get_tokens(self):
+        # the JWK view is memoized, it is rebuilt after ``options`` or
+        # ``_dict_data`` are replaced, or after ``update_options``
+        tokens = self._tokens
+        if tokens is not None:
+            return tokens
+
+        if not self._data:
             self.load_dict_key()
 
-        rv = dict(self._dict_data)
-        rv['kty'] = self.kty
+        tokens = dict(self._data)
+        tokens['kty'] = self.kty
         for k in self.ALLOWED_PARAMS:
-            if k not in rv and k in self.options:
-                rv[k] = self.options[k]
-        return rv
+            if k not in tokens and k in self._options:
+                tokens[k] = self._options[k]
+
+        key_ops = tokens.get('key_ops')
+        if key_ops is not None:
+            key_ops = frozenset(key_ops)
+        self._key_ops = key_ops
+        self._use = tokens.get('use')
+        self._tokens = tokens
+        return tokens
+
+    def update_options(self, options):
+        """Update the options of this key, e.g. ``kid``, ``use``."""
+        self._options.update(options)
+        self._tokens = None
 
     @property
     def kid(self):
-        return self.tokens.get('kid')
+        return self._get_tokens().get('kid')
 
     def keys(self):
-        return self.tokens.keys()
+        return self._get_tokens().keys()
 
     def __getitem__(self, item):
-        return self.tokens[item]
+        return self._get_tokens()[item]
 
     @property
     def public_only(self):
@@ -69,19 +115,20 @@ class Key(object):
         :param operation: key operation value, such as "sign", "encrypt".
         :raise: ValueError
         """
-        key_ops = self.tokens.get('key_ops')
+        self._get_tokens()
+        key_ops = self._key_ops
         if key_ops is not None and operation not in key_ops:
             raise ValueError('Unsupported key_op "{}"'.format(operation))
 
         if operation in self.PRIVATE_KEY_OPS and self.public_only:
             raise ValueError('Invalid key_op "{}" for public key'.format(operation))
 
-        use = self.tokens.get('use')
+        use = self._use
         if use:
-            if operation in ['sign', 'verify']:
+            if operation in SIG_KEY_OPS:
                 if use != 'sig':
                     raise InvalidUseError()
-            elif operation in ['decrypt', 'encrypt', 'wrapKey', 'unwrapKey']:
+            elif operation in ENC_KEY_OPS:
                 if use != 'enc':
                     raise InvalidUseError()
 
@@ -100,8 +147,9 @@ class Key(object):
         fields.sort()
         data = OrderedDict()
 
+        tokens = self._get_tokens()
         for k in fields:
-            data[k] = self.tokens[k]
+            data[k] = tokens[k]
 
         json_data = json_dumps(data)
         digest_data = hashlib.sha256(to_bytes(json_data)).digest()
@@ -1,6 +1,7 @@
 from authlib.common.encoding import json_loads
-from .key_set import KeySet
+from .key_set import KeySet, LazyKeySet
 from ._cryptography_key import load_pem_key
+from .key_cache import load_cached_key
 
 
 class JsonWebKey(object):
@@ -33,7 +34,7 @@ class JsonWebKey(object):
             kty = raw.get('kty')
 
         if kty is None:
-            raw_key = load_pem_key(raw)
+            raw_key = load_cached_key([b'pem', None, None, raw], lambda: load_pem_key(raw))
             for _kty in cls.JWK_KEY_CLS:
                 key_cls = cls.JWK_KEY_CLS[_kty]
                 if key_cls.validate_raw_key(raw_key):
@@ -43,14 +44,20 @@ class JsonWebKey(object):
         return key_cls.import_key(raw, options)
 
     @classmethod
-    def import_key_set(cls, raw):
+    def import_key_set(cls, raw, lazy=False, max_materialized=None):
         """Import KeySet from string, dict or a list of keys.
 
+        :param raw: string, dict or a list of keys
+        :param lazy: import each key on its first use, see :class:`LazyKeySet`
+        :param max_materialized: max number of imported keys to keep in
+            memory for a lazy key set
         :return: KeySet instance
         """
         raw = _transform_raw_key(raw)
         if isinstance(raw, dict) and 'keys' in raw:
             keys = raw.get('keys')
+            if lazy:
+                return LazyKeySet(keys, cls.import_key, max_materialized)
             return KeySet([cls.import_key(k) for k in keys])
         raise ValueError('Invalid key set format')
 
@@ -0,0 +1,97 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from authlib.common.encoding import to_bytes
+
+KeyCacheInfo = namedtuple('KeyCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class KeyCache(object):
+    """A bounded LRU cache of materialized ``cryptography`` key objects,
+    keyed by a digest of the raw key input (PEM bytes or JWK parameters).
+    The cache is process-wide and opt-in, enable it with::
+
+        from authlib.jose.rfc7517 import KeyCache, set_key_cache
+        set_key_cache(KeyCache(maxsize=512))
+
+    :param maxsize: max number of keys to keep in memory
+    """
+    def __init__(self, maxsize=256):
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive number')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, cache_key, loader):
+        """Get the key of ``cache_key`` from cache, or call ``loader`` to
+        create the key and save it into cache."""
+        with self._lock:
+            try:
+                rv = self._data[cache_key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._data.move_to_end(cache_key)
+                self.hits += 1
+                return rv
+
+        rv = loader()
+        with self._lock:
+            self._data[cache_key] = rv
+            self._data.move_to_end(cache_key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return rv
+
+    def clear(self):
+        """Remove all keys and reset the hit/miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self):
+        """Report cache statistics, like ``functools.lru_cache``."""
+        with self._lock:
+            return KeyCacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+
+_key_cache = None
+
+
+def set_key_cache(cache):
+    """Install a process-wide :class:`KeyCache`, pass ``None`` to disable it."""
+    global _key_cache
+    _key_cache = cache
+
+
+def get_key_cache():
+    """Get the process-wide :class:`KeyCache`, ``None`` if it is disabled."""
+    return _key_cache
+
+
+def load_cached_key(parts, loader):
+    """Call ``loader`` through the process-wide key cache, ``parts`` is a
+    list of values identifying the raw key input."""
+    cache = _key_cache
+    if cache is None:
+        return loader()
+    return cache.load(_digest(parts), loader)
+
+
+def _digest(parts):
+    h = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            h.update(b'\xff' * 4)
+            continue
+        part = to_bytes(part)
+        h.update(len(part).to_bytes(4, 'big'))
+        h.update(part)
+    return h.digest()
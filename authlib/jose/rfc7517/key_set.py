@@ -1,12 +1,43 @@
+import random
+import threading
+from collections import OrderedDict
 from authlib.common.encoding import json_dumps
+from .base_key import Key
 
 
 class KeySet(object):
-    """This class represents a JSON Web Key Set."""
+    """This class represents a JSON Web Key Set. Keys are indexed by
+    ``kid``, and by ``kty``, ``alg`` and ``use`` values. The indexes are
+    updated when :attr:`keys` is changed, either with :meth:`add_key` and
+    :meth:`remove_key`, or in place, e.g. ``key_set.keys.append(key)``.
+    """
+
+    #: key parameters which can be used in :meth:`find_keys`
+    INDEXED_PARAMS = ('kty', 'alg', 'use')
 
     def __init__(self, keys):
         self.keys = keys
 
+    @property
+    def keys(self):
+        return self._keys
+
+    @keys.setter
+    def keys(self, keys):
+        self._keys = _KeyList(self, keys)
+        self._indexes = None
+
+    def add_key(self, key):
+        """Add a key into this key set."""
+        self._keys.append(key)
+
+    def remove_key(self, key):
+        """Remove a key from this key set.
+
+        :raise: ValueError
+        """
+        self._keys.remove(key)
+
     def as_dict(self, is_private=False, **params):
         """Represent this key as a dict of the JSON Web Key Set."""
         return {'keys': [k.as_dict(is_private, **params) for k in self.keys]}
@@ -23,7 +54,272 @@ class KeySet(object):
         :return: Key instance
         :raise: ValueError
         """
-        for k in self.keys:
-            if k.kid == kid:
-                return k
+        _check_kid(kid)
+        keys = self._get_indexes()[0].get(kid)
+        if keys:
+            return keys[0]
         raise ValueError('Invalid JSON Web Key Set')
+
+    def random_key(self):
+        """Pick a random key of this key set.
+
+        :return: Key instance
+        """
+        return random.choice(self._keys)
+
+    def find_keys(self, kty=None, alg=None, use=None):
+        """Find all the keys matching the given ``kty``, ``alg`` and ``use``
+        values. Parameters which are ``None`` are not compared.
+
+        :return: list of Key instances, in the order of this key set
+        """
+        query = [
+            (name, value) for name, value in zip(self.INDEXED_PARAMS, (kty, alg, use))
+            if value is not None
+        ]
+        if not query:
+            return list(self._keys)
+
+        params_index = self._get_indexes()[1]
+        buckets = [(params_index[name].get(value, []), name, value) for name, value in query]
+        buckets.sort(key=lambda b: len(b[0]))
+        candidates, _, _ = buckets[0]
+        rv = []
+        for k in candidates:
+            if all(_get_param(k, name) == value for _, name, value in buckets[1:]):
+                rv.append(k)
+        return rv
+
+    def _get_indexes(self):
+        indexes = self._indexes
+        if indexes is None:
+            indexes = ({}, {name: {} for name in self.INDEXED_PARAMS})
+            for k in self._keys:
+                self._index_key(indexes, k)
+            self._indexes = indexes
+        return indexes
+
+    def _index_key(self, indexes, key):
+        kid_index, params_index = indexes
+        kid_index.setdefault(key.kid, []).append(key)
+        for name in self.INDEXED_PARAMS:
+            params_index[name].setdefault(_get_param(key, name), []).append(key)
+
+    def _on_append(self, key):
+        # keys are appended at the end, the order of the indexes is kept
+        if self._indexes is not None:
+            self._index_key(self._indexes, key)
+
+    def _on_remove(self, key):
+        indexes = self._indexes
+        if indexes is not None:
+            kid_index, params_index = indexes
+            _remove_from_index(kid_index, key.kid, key)
+            for name in self.INDEXED_PARAMS:
+                _remove_from_index(params_index[name], _get_param(key, name), key)
+
+    def _on_change(self):
+        self._indexes = None
+
+
+class _KeyList(list):
+    """The list of :attr:`KeySet.keys`, which updates the indexes of its
+    key set when it is changed."""
+    __slots__ = ('_key_set',)
+
+    def __init__(self, key_set, keys=()):
+        super(_KeyList, self).__init__(keys)
+        self._key_set = key_set
+
+    def append(self, key):
+        super(_KeyList, self).append(key)
+        self._key_set._on_append(key)
+
+    def remove(self, key):
+        super(_KeyList, self).remove(key)
+        self._key_set._on_remove(key)
+
+
+def _invalidating(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        rv = method(self, *args, **kwargs)
+        self._key_set._on_change()
+        return rv
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ('extend', 'insert', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(_KeyList, _name, _invalidating(_name))
+
+
+class LazyKeySet(KeySet):
+    """A JSON Web Key Set which keeps the raw JWK dicts, and imports a key
+    only when it is used. Keys are indexed with the raw ``kid``, ``kty``,
+    ``alg`` and ``use`` values, so that :meth:`find_by_kid` and
+    :meth:`find_keys` only import the matched keys. Create it with::
+
+        key_set = JsonWebKey.import_key_set(raw, lazy=True, max_materialized=1000)
+
+    When ``max_materialized`` is set, the least recently used imported keys
+    are dropped once there are more imported keys than the budget, they are
+    imported again on the next use. Invalid JWK dicts raise errors when they
+    are used, not when the key set is created. :attr:`keys` imports all the
+    keys and returns them as a tuple, use :meth:`add_key` and
+    :meth:`remove_key` to change the keys.
+
+    :param keys: a list of JWK dicts or Key instances
+    :param import_key: a function to import a JWK dict into a Key
+    :param max_materialized: max number of imported keys to keep in memory
+    """
+    def __init__(self, keys, import_key, max_materialized=None):
+        if max_materialized is not None and max_materialized < 1:
+            raise ValueError('max_materialized must be a positive number')
+        self.import_key = import_key
+        self.max_materialized = max_materialized
+        self._materialized = OrderedDict()
+        self._lock = threading.Lock()
+        super(LazyKeySet, self).__init__(keys)
+
+    @property
+    def keys(self):
+        # a tuple, since changing a copy would not change this key set
+        return tuple(self._materialize(entry) for entry in self._keys)
+
+    @keys.setter
+    def keys(self, keys):
+        self._materialized = OrderedDict()
+        KeySet.keys.fset(self, [_LazyKey(k) for k in keys])
+
+    def add_key(self, key):
+        """Add a key or a JWK dict into this key set."""
+        super(LazyKeySet, self).add_key(_LazyKey(key))
+
+    def remove_key(self, key):
+        """Remove a key or a JWK dict from this key set.
+
+        :raise: ValueError
+        """
+        entry = self._find_entry(key)
+        super(LazyKeySet, self).remove_key(entry)
+        with self._lock:
+            self._materialized.pop(entry, None)
+
+    def find_by_kid(self, kid):
+        """Find the key matches the given kid value, the key is imported
+        if it is not yet.
+
+        :param kid: A string of kid
+        :return: Key instance
+        :raise: ValueError
+        """
+        _check_kid(kid)
+        keys = self._get_indexes()[0].get(kid)
+        if keys:
+            return self._materialize(keys[0])
+        raise ValueError('Invalid JSON Web Key Set')
+
+    def random_key(self):
+        """Pick a random key of this key set, only the picked key is
+        imported.
+
+        :return: Key instance
+        """
+        return self._materialize(random.choice(self._keys))
+
+    def find_keys(self, kty=None, alg=None, use=None):
+        """Find all the keys matching the given ``kty``, ``alg`` and ``use``
+        values, only the matched keys are imported.
+
+        :return: list of Key instances, in the order of this key set
+        """
+        entries = super(LazyKeySet, self).find_keys(kty, alg, use)
+        return [self._materialize(entry) for entry in entries]
+
+    @property
+    def materialized_count(self):
+        """Number of imported keys which are kept in memory."""
+        return sum(1 for entry in self._keys if entry.key is not None)
+
+    def _materialize(self, entry):
+        key = entry.key
+        if key is not None:
+            if entry.raw is not None and self.max_materialized is not None:
+                with self._lock:
+                    if entry in self._materialized:
+                        self._materialized.move_to_end(entry)
+            return key
+
+        # import a copy, since importing may update the JWK dict
+        key = self.import_key(dict(entry.raw))
+        with self._lock:
+            if entry.key is not None:
+                return entry.key
+            entry.key = key
+            if self.max_materialized is not None:
+                self._materialized[entry] = True
+                while len(self._materialized) > self.max_materialized:
+                    cold, _ = self._materialized.popitem(last=False)
+                    cold.key = None
+        return key
+
+    def _find_entry(self, key):
+        for entry in self._keys:
+            if entry.key is key or entry.raw is key:
+                return entry
+
+        if isinstance(key, Key):
+            # the key might have been dropped from memory
+            thumbprint = key.thumbprint()
+            for entry in self._get_indexes()[0].get(key.kid, []):
+                if entry.raw is not None and \
+                        self._materialize(entry).thumbprint() == thumbprint:
+                    return entry
+        raise ValueError('Key is not in this key set')
+
+
+class _LazyKey(object):
+    __slots__ = ('raw', 'key')
+
+    def __init__(self, raw):
+        if isinstance(raw, Key):
+            self.raw = None
+            self.key = raw
+        else:
+            self.raw = raw
+            self.key = None
+
+    @property
+    def kid(self):
+        if self.raw is None:
+            return self.key.kid
+        return self.raw.get('kid')
+
+    def __getitem__(self, name):
+        if self.raw is None:
+            return self.key[name]
+        return self.raw[name]
+
+
+def _get_param(key, name):
+    try:
+        return key[name]
+    except KeyError:
+        return None
+
+
+def _check_kid(kid):
+    # kid comes from the token header, it can be any JSON value
+    if kid is not None and not isinstance(kid, str):
+        raise ValueError('Invalid JSON Web Key Set')
+
+
+def _remove_from_index(index, value, key):
+    keys = index.get(value)
+    if keys:
+        keys.remove(key)
+        if not keys:
+            del index[value]
@@ -0,0 +1,162 @@
+import re
+import time
+import logging
+import threading
+from .jwk import JsonWebKey
+
+log = logging.getLogger(__name__)
+
+_MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)')
+
+
+class RemoteKeySet(object):
+    """A JSON Web Key Set loaded from a remote ``jwks_uri``. The key set is
+    cached with HTTP caching headers, and it is refreshed in a background
+    thread before it is expired. ``fetch`` is a function that accepts a
+    dict of request headers, and returns a response with ``status_code``,
+    ``headers`` and ``json()``, e.g. a response of requests::
+
+        def fetch(headers):
+            return requests.get(jwks_uri, headers=headers, timeout=5)
+
+        key_set = RemoteKeySet(fetch)
+        claims = jwt.decode(s, key_set)
+
+    Concurrent refreshes are collapsed into one request. When a token
+    contains an unknown ``kid``, the key set will be re-fetched at most once
+    per ``unknown_kid_cooldown`` seconds.
+
+    :param fetch: a function to fetch the remote JWK set
+    :param default_ttl: seconds to cache the key set without ``max-age``
+    :param min_ttl: min seconds to cache the key set
+    :param max_ttl: max seconds to cache the key set
+    :param refresh_ahead: seconds before expiration to refresh the key set
+        in background
+    :param unknown_kid_cooldown: min seconds between re-fetches caused by
+        unknown ``kid`` values
+    """
+    def __init__(self, fetch, default_ttl=300, min_ttl=60, max_ttl=86400,
+                 refresh_ahead=30, unknown_kid_cooldown=60):
+        self.fetch = fetch
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.refresh_ahead = refresh_ahead
+        self.unknown_kid_cooldown = unknown_kid_cooldown
+
+        self.fetch_count = 0
+        self._key_set = None
+        self._etag = None
+        self._expires_at = 0
+        self._generation = 0
+        self._last_forced_at = None
+        self._refresh_lock = threading.Lock()
+        self._background_refreshing = False
+
+    def __call__(self, header, payload):
+        return self.find_by_kid(header.get('kid'))
+
+    def find_by_kid(self, kid):
+        """Find the key matches the given kid value. When the kid is unknown,
+        the key set will be re-fetched, unless it is in cooldown.
+
+        :param kid: A string of kid
+        :return: Key instance
+        :raise: ValueError
+        """
+        key_set = self.get_key_set()
+        try:
+            return key_set.find_by_kid(kid)
+        except ValueError:
+            now = time.monotonic()
+            last_forced_at = self._last_forced_at
+            if last_forced_at is not None and \
+                    now - last_forced_at < self.unknown_kid_cooldown:
+                raise
+            self._last_forced_at = now
+            key_set = self.refresh()
+            return key_set.find_by_kid(kid)
+
+    def get_key_set(self):
+        """Get the cached :class:`KeySet`, fetch it when it is expired."""
+        key_set = self._key_set
+        now = time.monotonic()
+        if key_set is None or now >= self._expires_at:
+            return self.refresh()
+
+        if now >= self._expires_at - self.refresh_ahead:
+            self._refresh_in_background()
+        return key_set
+
+    def refresh(self):
+        """Fetch the remote key set. If another thread is fetching the key
+        set, wait for its result instead of sending another request."""
+        generation = self._generation
+        with self._refresh_lock:
+            if self._generation != generation and self._key_set is not None:
+                return self._key_set
+            return self._fetch()
+
+    def _refresh_in_background(self):
+        if self._background_refreshing:
+            return
+        self._background_refreshing = True
+        thread = threading.Thread(target=self._background_refresh, daemon=True)
+        thread.start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as error:
+            log.warning('Failed to refresh JWK set: %r', error)
+        finally:
+            self._background_refreshing = False
+
+    def _fetch(self):
+        request_headers = {}
+        if self._etag and self._key_set is not None:
+            request_headers['If-None-Match'] = self._etag
+
+        self.fetch_count += 1
+        try:
+            resp = self.fetch(request_headers)
+            if resp.status_code == 304 and self._key_set is not None:
+                key_set = self._key_set
+            elif resp.status_code == 200:
+                key_set = JsonWebKey.import_key_set(resp.json())
+                self._etag = _get_header(resp.headers, 'ETag')
+            else:
+                raise ValueError('Invalid JWK set response: {}'.format(resp.status_code))
+        except Exception:
+            if self._key_set is None:
+                raise
+            # keep the stale key set, and retry later
+            log.warning('Failed to fetch JWK set, use the cached one')
+            self._expires_at = time.monotonic() + self.min_ttl
+            return self._key_set
+
+        self._expires_at = time.monotonic() + self._get_ttl(resp.headers)
+        self._key_set = key_set
+        self._generation += 1
+        return key_set
+
+    def _get_ttl(self, headers):
+        ttl = self.default_ttl
+        cache_control = _get_header(headers, 'Cache-Control')
+        if cache_control:
+            m = _MAX_AGE_RE.search(cache_control)
+            if m:
+                ttl = int(m.group(1))
+            elif 'no-cache' in cache_control or 'no-store' in cache_control:
+                ttl = 0
+        return min(max(ttl, self.min_ttl), self.max_ttl)
+
+
+def _get_header(headers, name):
+    value = headers.get(name)
+    if value is not None:
+        return value
+    name = name.lower()
+    for k in headers:
+        if k.lower() == name:
+            return headers[k]
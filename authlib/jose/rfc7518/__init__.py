@@ -1,24 +1,73 @@
+from ..util import register_lazy
 from .oct_key import OctKey
-from .rsa_key import RSAKey
-from .ec_key import ECKey
-from .jws_algs import JWS_ALGORITHMS
-from .jwe_algs import JWE_ALG_ALGORITHMS, AESAlgorithm, ECDHESAlgorithm, u32be_len_input
-from .jwe_encs import JWE_ENC_ALGORITHMS, CBCHS2EncAlgorithm
+from .jws_hmac import HMAC_ALGORITHMS
 from .jwe_zips import DeflateZipAlgorithm
+from .derived_key_cache import DerivedKeyCache, set_derived_key_cache, get_derived_key_cache
 
+# the algorithms and keys requiring cryptography are registered lazily, their
+# modules are imported on the first lookup
+JWS_ALGORITHM_NAMES = (
+    'RS256', 'RS384', 'RS512',
+    'ES256', 'ES384', 'ES512', 'ES256K',
+    'PS256', 'PS384', 'PS512',
+)
+JWE_ALG_ALGORITHM_NAMES = (
+    'dir', 'RSA1_5', 'RSA-OAEP', 'RSA-OAEP-256',
+    'A128KW', 'A192KW', 'A256KW',
+    'A128GCMKW', 'A192GCMKW', 'A256GCMKW',
+    'ECDH-ES', 'ECDH-ES+A128KW', 'ECDH-ES+A192KW', 'ECDH-ES+A256KW',
+)
+JWE_ENC_ALGORITHM_NAMES = (
+    'A128CBC-HS256', 'A192CBC-HS384', 'A256CBC-HS512',
+    'A128GCM', 'A192GCM', 'A256GCM',
+)
 
-def register_jws_rfc7518(cls):
-    for algorithm in JWS_ALGORITHMS:
-        cls.register_algorithm(algorithm)
+_LAZY_ATTRIBUTES = {
+    'RSAKey': 'rsa_key',
+    'ECKey': 'ec_key',
+    'JWS_ALGORITHMS': 'jws_algs',
+    'JWE_ALG_ALGORITHMS': 'jwe_algs',
+    'AESAlgorithm': 'jwe_algs',
+    'ECDHESAlgorithm': 'jwe_algs',
+    'u32be_len_input': 'jwe_algs',
+    'JWE_ENC_ALGORITHMS': 'jwe_encs',
+    'CBCHS2EncAlgorithm': 'jwe_encs',
+}
 
 
-def register_jwe_rfc7518(cls):
-    for algorithm in JWE_ALG_ALGORITHMS:
-        cls.register_algorithm(algorithm)
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    import importlib
+    module = importlib.import_module('.' + module_name, __name__)
+    return getattr(module, name)
+
+
+def _load_jws_algorithms():
+    from .jws_algs import JWS_ALGORITHMS
+    return {alg.name: alg for alg in JWS_ALGORITHMS}
+
 
-    for algorithm in JWE_ENC_ALGORITHMS:
+def _load_jwe_alg_algorithms():
+    from .jwe_algs import JWE_ALG_ALGORITHMS
+    return {alg.name: alg for alg in JWE_ALG_ALGORITHMS}
+
+
+def _load_jwe_enc_algorithms():
+    from .jwe_encs import JWE_ENC_ALGORITHMS
+    return {alg.name: alg for alg in JWE_ENC_ALGORITHMS}
+
+
+def register_jws_rfc7518(cls):
+    for algorithm in HMAC_ALGORITHMS:
         cls.register_algorithm(algorithm)
+    register_lazy(cls.ALGORITHMS_REGISTRY, JWS_ALGORITHM_NAMES, _load_jws_algorithms)
+
 
+def register_jwe_rfc7518(cls):
+    register_lazy(cls.ALG_REGISTRY, JWE_ALG_ALGORITHM_NAMES, _load_jwe_alg_algorithms)
+    register_lazy(cls.ENC_REGISTRY, JWE_ENC_ALGORITHM_NAMES, _load_jwe_enc_algorithms)
     cls.register_algorithm(DeflateZipAlgorithm())
 
 
@@ -32,4 +81,8 @@ __all__ = [
     'AESAlgorithm',
     'ECDHESAlgorithm',
     'CBCHS2EncAlgorithm',
+    'DeflateZipAlgorithm',
+    'DerivedKeyCache',
+    'set_derived_key_cache',
+    'get_derived_key_cache',
 ]
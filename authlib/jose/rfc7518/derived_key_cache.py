@@ -0,0 +1,118 @@
+import time
+import threading
+from collections import OrderedDict
+from ..errors import InvalidUseError
+
+EPK_PUBLIC_FIELDS = ('kty', 'crv', 'x', 'y')
+
+
+class DerivedKeyCache(object):
+    """A bounded cache of keys derived by ECDH-ES and ECDH-1PU key agreement
+    when decrypting JWE. A derived key is identified by the recipient key
+    (``kid`` and thumbprint), the ephemeral public key, the sender key of
+    ECDH-1PU, and the Concat KDF info of ``alg``/``enc``, ``apu`` and
+    ``apv``. The cache is process-wide and opt-in, enable it with::
+
+        from authlib.jose.rfc7518 import DerivedKeyCache, set_derived_key_cache
+        set_derived_key_cache(DerivedKeyCache(maxsize=1024, ttl=300))
+
+    The cache only helps when the same ephemeral key is used again, e.g. a
+    burst of messages from one sender, or repeated decryption of the same
+    token. Call :meth:`clear` with the ``kid`` of a rotated key to remove its
+    derived keys.
+
+    :param maxsize: max number of derived keys to keep in memory
+    :param ttl: seconds to keep a derived key
+    """
+    def __init__(self, maxsize=1024, ttl=300):
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive number')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, cache_key, loader):
+        """Get the derived key of ``cache_key`` from cache, or call
+        ``loader`` to derive the key and save it into cache."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(cache_key)
+            if item is not None and item[0] > now:
+                self._data.move_to_end(cache_key)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+
+        rv = loader()
+        with self._lock:
+            self._data[cache_key] = (now + self.ttl, rv)
+            self._data.move_to_end(cache_key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return rv
+
+    def clear(self, kid=None):
+        """Remove all the derived keys, or only the derived keys of the
+        recipient key with the given ``kid``."""
+        with self._lock:
+            if kid is None:
+                self._data.clear()
+                return
+            for cache_key in [k for k in self._data if k[0] == kid]:
+                del self._data[cache_key]
+
+    def __len__(self):
+        return len(self._data)
+
+
+_derived_key_cache = None
+
+
+def set_derived_key_cache(cache):
+    """Install a process-wide :class:`DerivedKeyCache`, pass ``None`` to
+    disable it."""
+    global _derived_key_cache
+    _derived_key_cache = cache
+
+
+def get_derived_key_cache():
+    """Get the process-wide :class:`DerivedKeyCache`, ``None`` if it is
+    disabled."""
+    return _derived_key_cache
+
+
+def load_derived_key(key, headers, fixed_info, loader, sender_key=None):
+    """Call ``loader`` through the process-wide derived key cache."""
+    cache = _derived_key_cache
+    if cache is None:
+        return loader()
+
+    epk = headers.get('epk')
+    if not isinstance(epk, dict):
+        return loader()
+    epk_id = tuple(epk.get(k) for k in EPK_PUBLIC_FIELDS)
+    if not all(v is None or isinstance(v, str) for v in epk_id):
+        return loader()
+    if not isinstance(epk.get('key_ops', []), list):
+        return loader()
+
+    # the "wrapKey" checks of the loader are skipped on a cache hit,
+    # they are done before the lookup
+    _check_wrap_key_op(epk.get('key_ops'), epk.get('use'))
+    sender_id = None
+    if sender_key is not None:
+        sender_key.check_key_op('wrapKey')
+        sender_id = sender_key.thumbprint()
+    cache_key = (key.kid, key.thumbprint(), epk_id, sender_id, fixed_info)
+    return cache.load(cache_key, loader)
+
+
+def _check_wrap_key_op(key_ops, use):
+    # the same as ``Key.check_key_op('wrapKey')``, without importing the key
+    if key_ops is not None and 'wrapKey' not in key_ops:
+        raise ValueError('Unsupported key_op "wrapKey"')
+    if use and use != 'enc':
+        raise InvalidUseError()
@@ -20,6 +20,8 @@ from authlib.jose.rfc7516 import JWEAlgorithm
 from .rsa_key import RSAKey
 from .ec_key import ECKey
 from .oct_key import OctKey
+from ..rfc8037.okp_key import OKPKey
+from .derived_key_cache import load_derived_key
 
 
 class DirectAlgorithm(JWEAlgorithm):
@@ -193,7 +195,7 @@ class AESGCMAlgorithm(JWEAlgorithm):
 
 class ECDHESAlgorithm(JWEAlgorithm):
     EXTRA_HEADERS = ['epk', 'apu', 'apv']
-    ALLOWED_KEY_CLS = ECKey
+    ALLOWED_KEY_CLS = (ECKey, OKPKey)
 
     # https://tools.ietf.org/html/rfc7518#section-4.6
     def __init__(self, key_size=None):
@@ -301,9 +303,13 @@ class ECDHESAlgorithm(JWEAlgorithm):
         else:
             bit_size = self.key_size
 
-        epk = key.import_key(headers['epk'])
-        public_key = epk.get_op_key('wrapKey')
-        dk = self.deliver(key, public_key, headers, bit_size)
+        def deliver():
+            epk = key.import_key(headers['epk'])
+            public_key = epk.get_op_key('wrapKey')
+            return self.deliver(key, public_key, headers, bit_size)
+
+        fixed_info = self.compute_fixed_info(headers, bit_size)
+        dk = load_derived_key(key, headers, fixed_info, deliver)
 
         if self.key_size is None:
             return dk
@@ -89,6 +89,24 @@ class CBCHS2EncAlgorithm(JWEEncAlgorithm):
         unpad = PKCS7(AES.block_size).unpadder()
         return unpad.update(data) + unpad.finalize()
 
+    def encryptor(self, aad, iv, key):
+        """Create an incremental encryption context of AES_CBC_HMAC_SHA2."""
+        self.check_iv(iv)
+        hkey = key[:self.key_len]
+        ekey = key[self.key_len:]
+        cipher = Cipher(AES(ekey), CBC(iv), backend=default_backend())
+        return _CBCHS2Encryptor(self, cipher.encryptor(), aad, iv, hkey)
+
+    def decryptor(self, aad, iv, key):
+        """Create an incremental decryption context of AES_CBC_HMAC_SHA2.
+        The authentication tag is verified in ``finalize``, the plaintext
+        MUST be discarded if it raises an error."""
+        self.check_iv(iv)
+        hkey = key[:self.key_len]
+        dkey = key[self.key_len:]
+        cipher = Cipher(AES(dkey), CBC(iv), backend=default_backend())
+        return _CBCHS2Decryptor(self, cipher.decryptor(), aad, iv, hkey)
+
 
 class GCMEncAlgorithm(JWEEncAlgorithm):
     # Use of an IV of size 96 bits is REQUIRED with this algorithm.
@@ -133,6 +151,89 @@ class GCMEncAlgorithm(JWEEncAlgorithm):
         d.authenticate_additional_data(aad)
         return d.update(ciphertext) + d.finalize()
 
+    def encryptor(self, aad, iv, key):
+        """Create an incremental encryption context of AES GCM."""
+        self.check_iv(iv)
+        cipher = Cipher(AES(key), GCM(iv), backend=default_backend())
+        enc = cipher.encryptor()
+        enc.authenticate_additional_data(aad)
+        return _GCMEncryptor(enc)
+
+    def decryptor(self, aad, iv, key):
+        """Create an incremental decryption context of AES GCM. The
+        authentication tag is verified in ``finalize``, the plaintext MUST
+        be discarded if it raises an error."""
+        self.check_iv(iv)
+        cipher = Cipher(AES(key), GCM(iv), backend=default_backend())
+        d = cipher.decryptor()
+        d.authenticate_additional_data(aad)
+        return _GCMDecryptor(d)
+
+
+class _CBCHS2Encryptor(object):
+    def __init__(self, enc_alg, enc, aad, iv, hkey):
+        self.enc_alg = enc_alg
+        self.enc = enc
+        self.aad = aad
+        self.padder = PKCS7(AES.block_size).padder()
+        self.mac = hmac.new(hkey, aad + iv, enc_alg.hash_alg)
+
+    def update(self, data):
+        ciphertext = self.enc.update(self.padder.update(data))
+        self.mac.update(ciphertext)
+        return ciphertext
+
+    def finalize(self):
+        ciphertext = self.enc.update(self.padder.finalize()) + self.enc.finalize()
+        self.mac.update(ciphertext)
+        self.mac.update(encode_int(len(self.aad) * 8, 64))
+        tag = self.mac.digest()[:self.enc_alg.key_len]
+        return ciphertext, tag
+
+
+class _CBCHS2Decryptor(object):
+    def __init__(self, enc_alg, d, aad, iv, hkey):
+        self.enc_alg = enc_alg
+        self.d = d
+        self.aad = aad
+        self.unpadder = PKCS7(AES.block_size).unpadder()
+        self.mac = hmac.new(hkey, aad + iv, enc_alg.hash_alg)
+
+    def update(self, data):
+        self.mac.update(data)
+        return self.unpadder.update(self.d.update(data))
+
+    def finalize(self, tag):
+        self.mac.update(encode_int(len(self.aad) * 8, 64))
+        _tag = self.mac.digest()[:self.enc_alg.key_len]
+        if not hmac.compare_digest(_tag, tag):
+            raise InvalidTag()
+        data = self.d.finalize()
+        return self.unpadder.update(data) + self.unpadder.finalize()
+
+
+class _GCMEncryptor(object):
+    def __init__(self, enc):
+        self.enc = enc
+
+    def update(self, data):
+        return self.enc.update(data)
+
+    def finalize(self):
+        ciphertext = self.enc.finalize()
+        return ciphertext, self.enc.tag
+
+
+class _GCMDecryptor(object):
+    def __init__(self, d):
+        self.d = d
+
+    def update(self, data):
+        return self.d.update(data)
+
+    def finalize(self, tag):
+        return self.d.finalize_with_tag(tag)
+
 
 JWE_ENC_ALGORITHMS = [
     CBCHS2EncAlgorithm(128, 256),  # A128CBC-HS256
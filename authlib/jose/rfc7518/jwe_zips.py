@@ -1,20 +1,115 @@
 import zlib
 from ..rfc7516 import JWEZipAlgorithm, JsonWebEncryption
+from ..errors import DecodeError
 
 
 class DeflateZipAlgorithm(JWEZipAlgorithm):
+    """DEFLATE compression for the ``zip`` header. The decompressed size is
+    limited, to reject "zip bombs". Register an instance with other
+    settings to replace the default one::
+
+        JsonWebEncryption.register_algorithm(
+            DeflateZipAlgorithm(level=9, max_size=1024 * 1024, max_ratio=100)
+        )
+
+    :param level: compression level from 0 to 9, -1 is the zlib default
+    :param max_size: max size in bytes of a decompressed payload
+    :param max_ratio: max ratio of decompressed size to compressed size
+    """
     name = 'DEF'
     description = 'DEFLATE'
 
+    #: default max size of a decompressed payload, 10 MiB
+    MAX_SIZE = 10 * 1024 * 1024
+
+    def __init__(self, level=-1, max_size=MAX_SIZE, max_ratio=None):
+        if not -1 <= level <= 9:
+            raise ValueError('Invalid compression level: {!r}'.format(level))
+        self.level = level
+        self.max_size = max_size
+        self.max_ratio = max_ratio
+
     def compress(self, s):
         """Compress bytes data with DEFLATE algorithm."""
-        data = zlib.compress(s)
+        data = zlib.compress(s, self.level)
         # drop gzip headers and tail
         return data[2:-4]
 
     def decompress(self, s):
-        """Decompress DEFLATE bytes data."""
-        return zlib.decompress(s, -zlib.MAX_WBITS)
+        """Decompress DEFLATE bytes data. The data is inflated until the
+        size limit, a larger output raises :class:`DecodeError`."""
+        limit = self.max_size
+        if self.max_ratio is not None:
+            limit = min(limit, len(s) * self.max_ratio)
+
+        d = zlib.decompressobj(-zlib.MAX_WBITS)
+        try:
+            data = d.decompress(s, limit + 1)
+            if len(data) <= limit and not d.unconsumed_tail:
+                data += d.flush()
+        except zlib.error:
+            raise DecodeError('Invalid compressed payload')
+
+        if len(data) > limit or d.unconsumed_tail:
+            raise DecodeError('Decompressed payload is too large')
+        if not d.eof:
+            raise DecodeError('Invalid compressed payload')
+        return data
+
+    def compressor(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    def decompressor(self):
+        """Create an incremental decompression context, which has the same
+        size limits as :meth:`decompress`. The ratio is checked against the
+        compressed bytes which have been read."""
+        return _BoundedDecompressor(self.max_size, self.max_ratio)
+
+
+class _BoundedDecompressor(object):
+    def __init__(self, max_size, max_ratio):
+        self.max_size = max_size
+        self.max_ratio = max_ratio
+        self.size = 0
+        self.consumed = 0
+        self._d = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    @property
+    def unconsumed_tail(self):
+        return self._d.unconsumed_tail
+
+    def decompress(self, data, max_length=0):
+        limit = self._get_limit(len(data))
+        if max_length <= 0 or max_length > limit - self.size + 1:
+            max_length = limit - self.size + 1
+        try:
+            rv = self._d.decompress(data, max_length)
+        except zlib.error:
+            raise DecodeError('Invalid compressed payload')
+        self.consumed += len(data) - len(self._d.unconsumed_tail)
+        return self._check(rv)
+
+    def flush(self):
+        try:
+            rv = self._d.flush()
+        except zlib.error:
+            raise DecodeError('Invalid compressed payload')
+        rv = self._check(rv)
+        if not self._d.eof:
+            raise DecodeError('Invalid compressed payload')
+        return rv
+
+    def _get_limit(self, pending=0):
+        limit = self.max_size
+        if self.max_ratio is not None:
+            limit = min(limit, (self.consumed + pending) * self.max_ratio)
+        return limit
+
+    def _check(self, rv):
+        self.size += len(rv)
+        if self.size > self._get_limit(len(self._d.unconsumed_tail)):
+            raise DecodeError('Decompressed payload is too large')
+        return rv
 
 
 def register_jwe_rfc7518():
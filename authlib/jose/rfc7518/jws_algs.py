@@ -8,66 +8,22 @@
     .. _`Section 3`: https://tools.ietf.org/html/rfc7518#section-3
 """
 
-import hmac
-import hashlib
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric.utils import (
-    decode_dss_signature, encode_dss_signature
+    decode_dss_signature, encode_dss_signature, Prehashed,
 )
 from cryptography.hazmat.primitives.asymmetric.ec import ECDSA
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.exceptions import InvalidSignature
 from ..rfc7515 import JWSAlgorithm
-from .oct_key import OctKey
+from .jws_hmac import (  # noqa: F401
+    NoneAlgorithm, HMACAlgorithm, HMAC_ALGORITHMS, _get_op_key, _prepare,
+)
 from .rsa_key import RSAKey
 from .ec_key import ECKey
 from .util import encode_int, decode_int
 
 
-class NoneAlgorithm(JWSAlgorithm):
-    name = 'none'
-    description = 'No digital signature or MAC performed'
-
-    def prepare_key(self, raw_data):
-        return None
-
-    def sign(self, msg, key):
-        return b''
-
-    def verify(self, msg, sig, key):
-        return False
-
-
-class HMACAlgorithm(JWSAlgorithm):
-    """HMAC using SHA algorithms for JWS. Available algorithms:
-
-    - HS256: HMAC using SHA-256
-    - HS384: HMAC using SHA-384
-    - HS512: HMAC using SHA-512
-    """
-    SHA256 = hashlib.sha256
-    SHA384 = hashlib.sha384
-    SHA512 = hashlib.sha512
-
-    def __init__(self, sha_type):
-        self.name = 'HS{}'.format(sha_type)
-        self.description = 'HMAC using SHA-{}'.format(sha_type)
-        self.hash_alg = getattr(self, 'SHA{}'.format(sha_type))
-
-    def prepare_key(self, raw_data):
-        return OctKey.import_key(raw_data)
-
-    def sign(self, msg, key):
-        # it is faster than the one in cryptography
-        op_key = key.get_op_key('sign')
-        return hmac.new(op_key, msg, self.hash_alg).digest()
-
-    def verify(self, msg, sig, key):
-        op_key = key.get_op_key('verify')
-        v_sig = hmac.new(op_key, msg, self.hash_alg).digest()
-        return hmac.compare_digest(sig, v_sig)
-
-
 class RSAAlgorithm(JWSAlgorithm):
     """RSA using SHA algorithms for JWS. Available algorithms:
 
@@ -84,18 +40,35 @@ class RSAAlgorithm(JWSAlgorithm):
         self.description = 'RSASSA-PKCS1-v1_5 using SHA-{}'.format(sha_type)
         self.hash_alg = getattr(self, 'SHA{}'.format(sha_type))
         self.padding = padding.PKCS1v15()
+        self._hash = self.hash_alg()
+        self._prehashed = Prehashed(self._hash)
 
     def prepare_key(self, raw_data):
         return RSAKey.import_key(raw_data)
 
+    def prepare(self, key, operation):
+        return _prepare(self._sign, self._verify, _get_op_key(key, operation), operation)
+
     def sign(self, msg, key):
-        op_key = key.get_op_key('sign')
-        return op_key.sign(msg, self.padding, self.hash_alg())
+        return self._sign(msg, key.get_op_key('sign'))
 
     def verify(self, msg, sig, key):
-        op_key = key.get_op_key('verify')
+        return self._verify(msg, sig, key.get_op_key('verify'))
+
+    def sign_stream(self, chunks, key):
+        digest = _digest(self.hash_alg, chunks)
+        return self._sign(digest, key.get_op_key('sign'), self._prehashed)
+
+    def verify_stream(self, chunks, sig, key):
+        digest = _digest(self.hash_alg, chunks)
+        return self._verify(digest, sig, key.get_op_key('verify'), self._prehashed)
+
+    def _sign(self, msg, op_key, algorithm=None):
+        return op_key.sign(msg, self.padding, algorithm or self._hash)
+
+    def _verify(self, msg, sig, op_key, algorithm=None):
         try:
-            op_key.verify(sig, msg, self.padding, self.hash_alg())
+            op_key.verify(sig, msg, self.padding, algorithm or self._hash)
             return True
         except InvalidSignature:
             return False
@@ -117,6 +90,8 @@ class ECAlgorithm(JWSAlgorithm):
         self.curve = curve
         self.description = f'ECDSA using {self.curve} and SHA-{sha_type}'
         self.hash_alg = getattr(self, 'SHA{}'.format(sha_type))
+        self._ecdsa = ECDSA(self.hash_alg())
+        self._prehashed_ecdsa = ECDSA(Prehashed(self.hash_alg()))
 
     def prepare_key(self, raw_data):
         key = ECKey.import_key(raw_data)
@@ -124,15 +99,37 @@ class ECAlgorithm(JWSAlgorithm):
             raise ValueError(f'Key for "{self.name}" not supported, only "{self.curve}" allowed')
         return key
 
+    def prepare(self, key, operation):
+        # the curve key size is resolved once with the raw key
+        op_key = _get_op_key(key, operation)
+        return _prepare(self._sign, self._verify, (op_key, op_key.curve.key_size), operation)
+
     def sign(self, msg, key):
         op_key = key.get_op_key('sign')
-        der_sig = op_key.sign(msg, ECDSA(self.hash_alg()))
+        return self._sign(msg, (op_key, key.curve_key_size))
+
+    def verify(self, msg, sig, key):
+        op_key = key.get_op_key('verify')
+        return self._verify(msg, sig, (op_key, key.curve_key_size))
+
+    def sign_stream(self, chunks, key):
+        digest = _digest(self.hash_alg, chunks)
+        op_key = key.get_op_key('sign')
+        return self._sign(digest, (op_key, key.curve_key_size), self._prehashed_ecdsa)
+
+    def verify_stream(self, chunks, sig, key):
+        digest = _digest(self.hash_alg, chunks)
+        op_key = key.get_op_key('verify')
+        return self._verify(digest, sig, (op_key, key.curve_key_size), self._prehashed_ecdsa)
+
+    def _sign(self, msg, prepared, ecdsa=None):
+        op_key, size = prepared
+        der_sig = op_key.sign(msg, ecdsa or self._ecdsa)
         r, s = decode_dss_signature(der_sig)
-        size = key.curve_key_size
         return encode_int(r, size) + encode_int(s, size)
 
-    def verify(self, msg, sig, key):
-        key_size = key.curve_key_size
+    def _verify(self, msg, sig, prepared, ecdsa=None):
+        op_key, key_size = prepared
         length = (key_size + 7) // 8
 
         if len(sig) != 2 * length:
@@ -143,8 +140,7 @@ class ECAlgorithm(JWSAlgorithm):
         der_sig = encode_dss_signature(r, s)
 
         try:
-            op_key = key.get_op_key('verify')
-            op_key.verify(der_sig, msg, ECDSA(self.hash_alg()))
+            op_key.verify(der_sig, msg, ecdsa or self._ecdsa)
             return True
         except InvalidSignature:
             return False
@@ -166,43 +162,52 @@ class RSAPSSAlgorithm(JWSAlgorithm):
         tpl = 'RSASSA-PSS using SHA-{} and MGF1 with SHA-{}'
         self.description = tpl.format(sha_type, sha_type)
         self.hash_alg = getattr(self, 'SHA{}'.format(sha_type))
+        self.padding = padding.PSS(
+            mgf=padding.MGF1(self.hash_alg()),
+            salt_length=self.hash_alg.digest_size
+        )
+        self._hash = self.hash_alg()
+        self._prehashed = Prehashed(self._hash)
 
     def prepare_key(self, raw_data):
         return RSAKey.import_key(raw_data)
 
+    def prepare(self, key, operation):
+        return _prepare(self._sign, self._verify, _get_op_key(key, operation), operation)
+
     def sign(self, msg, key):
-        op_key = key.get_op_key('sign')
-        return op_key.sign(
-            msg,
-            padding.PSS(
-                mgf=padding.MGF1(self.hash_alg()),
-                salt_length=self.hash_alg.digest_size
-            ),
-            self.hash_alg()
-        )
+        return self._sign(msg, key.get_op_key('sign'))
 
     def verify(self, msg, sig, key):
-        op_key = key.get_op_key('verify')
+        return self._verify(msg, sig, key.get_op_key('verify'))
+
+    def sign_stream(self, chunks, key):
+        digest = _digest(self.hash_alg, chunks)
+        return self._sign(digest, key.get_op_key('sign'), self._prehashed)
+
+    def verify_stream(self, chunks, sig, key):
+        digest = _digest(self.hash_alg, chunks)
+        return self._verify(digest, sig, key.get_op_key('verify'), self._prehashed)
+
+    def _sign(self, msg, op_key, algorithm=None):
+        return op_key.sign(msg, self.padding, algorithm or self._hash)
+
+    def _verify(self, msg, sig, op_key, algorithm=None):
         try:
-            op_key.verify(
-                sig,
-                msg,
-                padding.PSS(
-                    mgf=padding.MGF1(self.hash_alg()),
-                    salt_length=self.hash_alg.digest_size
-                ),
-                self.hash_alg()
-            )
+            op_key.verify(sig, msg, self.padding, algorithm or self._hash)
             return True
         except InvalidSignature:
             return False
 
 
-JWS_ALGORITHMS = [
-    NoneAlgorithm(),  # none
-    HMACAlgorithm(256),  # HS256
-    HMACAlgorithm(384),  # HS384
-    HMACAlgorithm(512),  # HS512
+def _digest(hash_alg, chunks):
+    h = hashes.Hash(hash_alg())
+    for chunk in chunks:
+        h.update(chunk)
+    return h.finalize()
+
+
+JWS_ALGORITHMS = HMAC_ALGORITHMS + [
     RSAAlgorithm(256),  # RS256
     RSAAlgorithm(384),  # RS384
     RSAAlgorithm(512),  # RS512
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+    authlib.jose.rfc7518
+    ~~~~~~~~~~~~~~~~~~~~
+
+    "none" and HMAC "alg" (Algorithm) Header Parameter Values for JWS per
+    `Section 3`_. They are kept apart from the other JWS algorithms, since
+    they don't require cryptography.
+
+    .. _`Section 3`: https://tools.ietf.org/html/rfc7518#section-3
+"""
+
+import hmac
+import hashlib
+from ..rfc7515 import JWSAlgorithm, JWSSigner, JWSVerifier
+from .oct_key import OctKey
+
+
+class NoneAlgorithm(JWSAlgorithm):
+    name = 'none'
+    description = 'No digital signature or MAC performed'
+
+    def prepare_key(self, raw_data):
+        return None
+
+    def sign(self, msg, key):
+        return b''
+
+    def verify(self, msg, sig, key):
+        return False
+
+    def sign_stream(self, chunks, key):
+        return b''
+
+    def verify_stream(self, chunks, sig, key):
+        return False
+
+
+class HMACAlgorithm(JWSAlgorithm):
+    """HMAC using SHA algorithms for JWS. Available algorithms:
+
+    - HS256: HMAC using SHA-256
+    - HS384: HMAC using SHA-384
+    - HS512: HMAC using SHA-512
+    """
+    SHA256 = hashlib.sha256
+    SHA384 = hashlib.sha384
+    SHA512 = hashlib.sha512
+
+    def __init__(self, sha_type):
+        self.name = 'HS{}'.format(sha_type)
+        self.description = 'HMAC using SHA-{}'.format(sha_type)
+        self.hash_alg = getattr(self, 'SHA{}'.format(sha_type))
+
+    def prepare_key(self, raw_data):
+        return OctKey.import_key(raw_data)
+
+    def prepare(self, key, operation):
+        # the keyed hash is created once, and copied for each message
+        h = hmac.new(_get_op_key(key, operation), digestmod=self.hash_alg)
+        return _prepare(self._sign, self._verify, h, operation)
+
+    def sign(self, msg, key):
+        # it is faster than the one in cryptography
+        op_key = key.get_op_key('sign')
+        return hmac.new(op_key, msg, self.hash_alg).digest()
+
+    def verify(self, msg, sig, key):
+        op_key = key.get_op_key('verify')
+        v_sig = hmac.new(op_key, msg, self.hash_alg).digest()
+        return hmac.compare_digest(sig, v_sig)
+
+    def sign_stream(self, chunks, key):
+        h = hmac.new(key.get_op_key('sign'), digestmod=self.hash_alg)
+        for chunk in chunks:
+            h.update(chunk)
+        return h.digest()
+
+    def verify_stream(self, chunks, sig, key):
+        h = hmac.new(key.get_op_key('verify'), digestmod=self.hash_alg)
+        for chunk in chunks:
+            h.update(chunk)
+        return hmac.compare_digest(sig, h.digest())
+
+    @staticmethod
+    def _sign(msg, h):
+        h = h.copy()
+        h.update(msg)
+        return h.digest()
+
+    def _verify(self, msg, sig, h):
+        return hmac.compare_digest(sig, self._sign(msg, h))
+
+
+def _get_op_key(key, operation):
+    if operation not in ('sign', 'verify'):
+        raise ValueError('Unsupported operation "{}"'.format(operation))
+    return key.get_op_key(operation)
+
+
+def _prepare(sign, verify, prepared_key, operation):
+    if operation == 'sign':
+        return JWSSigner(sign, prepared_key)
+    return JWSVerifier(verify, prepared_key)
+
+
+HMAC_ALGORITHMS = [
+    NoneAlgorithm(),  # none
+    HMACAlgorithm(256),  # HS256
+    HMACAlgorithm(384),  # HS384
+    HMACAlgorithm(512),  # HS512
+]
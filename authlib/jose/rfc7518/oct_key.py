@@ -33,7 +33,7 @@ class OctKey(Key):
         return self.raw_key
 
     def load_raw_key(self):
-        self.raw_key = urlsafe_b64decode(to_bytes(self.tokens['k']))
+        self.raw_key = urlsafe_b64decode(to_bytes(self._get_tokens()['k']))
 
     def load_dict_key(self):
         k = to_unicode(urlsafe_b64encode(self.raw_key))
@@ -56,7 +56,7 @@ class OctKey(Key):
         """Import a key from bytes, string, or dict data."""
         if isinstance(raw, cls):
             if options is not None:
-                raw.options.update(options)
+                raw.update_options(options)
             return raw
 
         if isinstance(raw, dict):
@@ -9,8 +9,9 @@
     https://tools.ietf.org/html/rfc7519
 """
 
-from .jwt import JsonWebToken
-from .claims import BaseClaims, JWTClaims
+from .jwt import JsonWebToken, JWTIssuer, JWTVerifier
+from .claims import BaseClaims, JWTClaims, ClaimsValidator
 
 
-__all__ = ['JsonWebToken', 'BaseClaims', 'JWTClaims']
+__all__ = ['JsonWebToken', 'JWTIssuer', 'JWTVerifier', 'BaseClaims', 'JWTClaims',
+           'ClaimsValidator']
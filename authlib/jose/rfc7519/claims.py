@@ -1,4 +1,5 @@
 import time
+from collections.abc import Mapping
 from authlib.jose.errors import (
     MissingClaimError,
     InvalidClaimError,
@@ -52,6 +53,9 @@ class BaseClaims(dict):
             raise error
 
     def _validate_essential_claims(self):
+        if isinstance(self.options, ClaimsValidator):
+            return self.options.validate_essential_claims(self)
+
         for k in self.options:
             if self.options[k].get('essential'):
                 if k not in self:
@@ -60,6 +64,9 @@ class BaseClaims(dict):
                     raise InvalidClaimError(k)
 
     def _validate_claim_value(self, claim_name):
+        if isinstance(self.options, ClaimsValidator):
+            return self.options.validate_claim_value(self, claim_name)
+
         option = self.options.get(claim_name)
         if not option:
             return
@@ -104,6 +111,10 @@ class JWTClaims(BaseClaims):
         self.validate_jti()
 
         # Validate custom claims
+        if isinstance(self.options, ClaimsValidator):
+            self.options.validate_custom_claims(self)
+            return
+
         for key in self.options.keys():
             if key not in self.REGISTERED_CLAIMS:
                 self._validate_claim_value(key)
@@ -140,6 +151,9 @@ class JWTClaims(BaseClaims):
         interpretation of audience values is generally application specific.
         Use of this claim is OPTIONAL.
         """
+        if isinstance(self.options, ClaimsValidator):
+            return self.options.validate_aud(self)
+
         aud_option = self.options.get('aud')
         aud = self.get('aud')
         if not aud_option or not aud:
@@ -218,5 +232,140 @@ class JWTClaims(BaseClaims):
         self._validate_claim_value('jti')
 
 
+class ClaimsValidator(Mapping):
+    """A precompiled ``options`` for :class:`BaseClaims`. The options are
+    parsed only once, ``values`` are converted into frozensets, and the
+    ``validate`` functions are bound to their claims. Pass it as the
+    ``options`` of claims, or ``claims_options`` of ``jwt.decode``::
+
+        claims_options = ClaimsValidator({
+            "iss": {"essential": True, "values": ["https://example.com"]},
+            "aud": {"essential": True, "value": "client-id"},
+        })
+        claims = jwt.decode(s, key, claims_options=claims_options)
+
+    It is a read-only mapping of the original options.
+
+    :param options: validate options, the same format of :class:`BaseClaims`
+    """
+    def __init__(self, options):
+        self._options = dict(options)
+        self._essential_claims = tuple(
+            k for k, option in self._options.items()
+            if option and option.get('essential')
+        )
+        self._checks = {}
+        for k, option in self._options.items():
+            check = _compile_option(option)
+            if check:
+                self._checks[k] = check
+        self._aud_values = _compile_aud_values(self._options.get('aud'))
+        self._custom_claims = {}
+
+    def __getitem__(self, key):
+        return self._options[key]
+
+    def __iter__(self):
+        return iter(self._options)
+
+    def __len__(self):
+        return len(self._options)
+
+    def validate_essential_claims(self, claims):
+        for k in self._essential_claims:
+            if k not in claims:
+                raise MissingClaimError(k)
+            elif not claims[k]:
+                raise InvalidClaimError(k)
+
+    def validate_claim_value(self, claims, claim_name):
+        check = self._checks.get(claim_name)
+        if check is None:
+            return
+
+        option_value, option_values, validate = check
+        value = claims.get(claim_name)
+        if option_value and value != option_value:
+            raise InvalidClaimError(claim_name)
+
+        if option_values is not None and not _contains(option_values, value):
+            raise InvalidClaimError(claim_name)
+
+        if validate and not validate(claims, value):
+            raise InvalidClaimError(claim_name)
+
+    def validate_custom_claims(self, claims):
+        cls = type(claims)
+        names = self._custom_claims.get(cls)
+        if names is None:
+            registered = cls.REGISTERED_CLAIMS
+            names = tuple(k for k in self._checks if k not in registered)
+            self._custom_claims[cls] = names
+
+        for k in names:
+            self.validate_claim_value(claims, k)
+
+    def validate_aud(self, claims):
+        aud_values = self._aud_values
+        aud = claims.get('aud')
+        if aud_values is None or not aud:
+            return
+
+        if isinstance(aud, list):
+            try:
+                valid = not aud_values.isdisjoint(aud)
+            except TypeError:
+                valid = any(_contains(aud_values, v) for v in aud)
+        else:
+            valid = _contains(aud_values, aud)
+        if not valid:
+            raise InvalidClaimError('aud')
+
+
+def _compile_option(option):
+    if not option:
+        return None
+
+    option_value = option.get('value')
+    option_values = option.get('values')
+    validate = option.get('validate')
+    if option_values:
+        option_values = _to_frozenset(option_values)
+    else:
+        option_values = None
+
+    if not option_value and option_values is None and not validate:
+        return None
+    return option_value, option_values, validate
+
+
+def _compile_aud_values(option):
+    if not option:
+        return None
+    aud_values = option.get('values')
+    if not aud_values:
+        aud_value = option.get('value')
+        if aud_value:
+            aud_values = [aud_value]
+    if not aud_values:
+        return None
+    return _to_frozenset(aud_values)
+
+
+def _to_frozenset(values):
+    try:
+        return frozenset(values)
+    except TypeError:
+        # unhashable values, e.g. list of lists
+        return tuple(values)
+
+
+def _contains(values, value):
+    try:
+        return value in values
+    except TypeError:
+        return False
+
+
 def _validate_numeric_time(s):
     return isinstance(s, (int, float))
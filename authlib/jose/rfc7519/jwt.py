@@ -2,13 +2,22 @@ import re
 import random
 import datetime
 import calendar
+from collections import deque
 from authlib.common.encoding import (
     to_bytes, to_unicode,
     json_loads, json_dumps,
+    json_b64encode, urlsafe_b64encode,
 )
-from .claims import JWTClaims
-from ..errors import DecodeError, InsecureClaimError
-from ..rfc7515 import JsonWebSignature
+from .claims import JWTClaims, ClaimsValidator
+from ..errors import (
+    DecodeError,
+    InsecureClaimError,
+    MissingAlgorithmError,
+    UnsupportedAlgorithmError,
+    BadSignatureError,
+)
+from ..util import extract_header, extract_segment
+from ..rfc7515 import JsonWebSignature, JWSHeader, JWSObject, JWSVerifier
 from ..rfc7516 import JsonWebEncryption
 from ..rfc7517 import KeySet, Key
 
@@ -51,12 +60,7 @@ class JsonWebToken(object):
         :return: bytes
         """
         header['typ'] = 'JWT'
-
-        for k in ['exp', 'iat', 'nbf']:
-            # convert datetime into timestamp
-            claim = payload.get(k)
-            if isinstance(claim, datetime.datetime):
-                payload[k] = calendar.timegm(claim.utctimetuple())
+        convert_datetime_claims(payload)
 
         if check:
             self.check_sensitive_data(payload)
@@ -104,6 +108,272 @@ class JsonWebToken(object):
             params=claims_params,
         )
 
+    async def async_decode(self, s, key, claims_cls=None, claims_options=None,
+                           claims_params=None, executor=None):
+        """Decode the JWT with the given key. It is the same as :meth:`decode`,
+        except that ``key`` can be an async function, which is useful to
+        load keys from a remote JWK set::
+
+            async def load_key(header, payload):
+                jwk_set = await fetch_jwk_set()
+                return jwk_set.find_by_kid(header['kid'])
+
+            claims = await jwt.async_decode(s, load_key)
+
+        :param s: text of JWT
+        :param key: key, or a (async) function to load the key
+        :param claims_cls: class to be used for JWT claims
+        :param claims_options: `options` parameters for claims_cls
+        :param claims_params: `params` parameters for claims_cls
+        :param executor: a ``concurrent.futures`` executor to verify the
+            signature (or decrypt the payload) in
+        :return: claims_cls instance
+        :raise: BadSignatureError
+        """
+        if claims_cls is None:
+            claims_cls = JWTClaims
+
+        if callable(key):
+            load_key = key
+        else:
+            load_key = create_load_key(prepare_raw_key(key))
+
+        s = to_bytes(s)
+        dot_count = s.count(b'.')
+        if dot_count == 2:
+            data = await self._jws.async_deserialize_compact(
+                s, load_key, decode_payload, executor=executor)
+        elif dot_count == 4:
+            data = await self._jwe.async_deserialize_compact(
+                s, load_key, decode_payload, executor=executor)
+        else:
+            raise DecodeError('Invalid input segments length')
+        return claims_cls(
+            data['payload'], data['header'],
+            options=claims_options,
+            params=claims_params,
+        )
+
+    def compile_issuer(self, header, key, check=True):
+        """Create a reusable :class:`JWTIssuer` to encode many JWS tokens
+        with the same header and key. The protected header segment is encoded
+        once and the signing key is prepared once::
+
+            issuer = jwt.compile_issuer({'alg': 'RS256'}, private_key)
+            for s in issuer.encode_many(payloads):
+                ...
+
+        :param header: A dict of JWS header template
+        :param key: key used to sign the signature
+        :param check: check if sensitive data in payload
+        :return: JWTIssuer instance
+        """
+        return JWTIssuer(self, header, key, check=check)
+
+    def compile_verifier(self, key, algorithms=None, claims_cls=None,
+                         claims_options=None, claims_params=None, leeway=0,
+                         header_cache=None):
+        """Create a reusable :class:`JWTVerifier` for JWS tokens. Keys are
+        resolved and imported once, instead of on every :meth:`decode`::
+
+            verifier = jwt.compile_verifier(public_key, ['RS256'])
+            claims = verifier.verify(s)
+
+        :param key: key used to verify the signature
+        :param algorithms: allowed ``alg`` values, default to the algorithms
+            of this instance
+        :param claims_cls: class to be used for JWT claims
+        :param claims_options: `options` parameters for claims_cls
+        :param claims_params: `params` parameters for claims_cls
+        :param leeway: leeway in seconds for time based claims
+        :param header_cache: a HeaderCache of parsed protected headers
+        :return: JWTVerifier instance
+        """
+        if algorithms is None:
+            algorithms = self._jws._algorithms
+        return JWTVerifier(
+            key, algorithms,
+            claims_cls=claims_cls,
+            claims_options=claims_options,
+            claims_params=claims_params,
+            leeway=leeway,
+            header_cache=header_cache,
+        )
+
+
+class JWTIssuer(object):
+    """A precompiled issuer of JWT in JWS Compact Serialization. The header
+    template is encoded into the protected segment once, and the key is
+    resolved and prepared once. Only payloads are encoded per token.
+    """
+    def __init__(self, jwt, header, key, check=True):
+        if 'enc' in header:
+            raise ValueError('JWTIssuer does not support JWE')
+
+        header = dict(header)
+        header['typ'] = 'JWT'
+        key = find_encode_key(key, header)
+
+        jws = jwt._jws
+        jws._validate_private_headers(header)
+        self.algorithm, self.key = jws._prepare_algorithm_key(header, None, key)
+        self._signer = self.algorithm.prepare(self.key, 'sign')
+        self.header = header
+        self.check = check
+        self._jwt = jwt
+        self._protected_segment = json_b64encode(header)
+
+    def encode(self, payload):
+        """Encode a JWT with the given payload.
+
+        :param payload: A dict to be encoded
+        :return: bytes
+        """
+        convert_datetime_claims(payload)
+        if self.check:
+            self._jwt.check_sensitive_data(payload)
+
+        payload_segment = urlsafe_b64encode(to_bytes(json_dumps(payload)))
+        signing_input = b'.'.join([self._protected_segment, payload_segment])
+        signature = urlsafe_b64encode(self._signer.sign(signing_input))
+        return b'.'.join([signing_input, signature])
+
+    def encode_many(self, payloads, executor=None, buffer_size=64):
+        """Encode an iterable of payloads, and yield the tokens in the same
+        order. Pass a ``concurrent.futures`` executor to sign tokens
+        concurrently, which is useful for RSA and EC algorithms.
+
+        :param payloads: An iterable of payload dicts
+        :param executor: An optional ``concurrent.futures.Executor``
+        :param buffer_size: max number of pending tokens in the executor
+        :return: generator of bytes
+        """
+        if executor is None:
+            for payload in payloads:
+                yield self.encode(payload)
+            return
+
+        pending = deque()
+        for payload in payloads:
+            pending.append(executor.submit(self.encode, payload))
+            if len(pending) >= buffer_size:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+class JWTVerifier(object):
+    """A precompiled verifier of JWT in JWS Compact Serialization. The
+    allowed algorithms are pinned, and the prepared key of each ``alg`` (and
+    ``kid`` for key sets) is kept in memory after the first use.
+
+    The given key material is resolved once, create a new verifier when the
+    keys are rotated. A callable ``key`` is called for every token.
+    """
+    def __init__(self, key, algorithms=None, claims_cls=None,
+                 claims_options=None, claims_params=None, leeway=0,
+                 header_cache=None):
+        if claims_cls is None:
+            claims_cls = JWTClaims
+
+        registry = JsonWebSignature.ALGORITHMS_REGISTRY
+        if algorithms is None:
+            algorithms = registry.keys()
+        elif isinstance(algorithms, str):
+            algorithms = [algorithms]
+        self.algorithms = {
+            name: registry[name] for name in algorithms if name in registry
+        }
+
+        self._is_dynamic = callable(key)
+        if self._is_dynamic:
+            self._load_key = key
+            self._is_key_set = False
+        else:
+            key = prepare_raw_key(key)
+            self._load_key = create_load_key(key)
+            self._is_key_set = isinstance(key, KeySet) or \
+                (isinstance(key, dict) and 'keys' in key)
+        self._prepared_keys = {}
+
+        self.claims_cls = claims_cls
+        if isinstance(claims_options, dict):
+            claims_options = ClaimsValidator(claims_options)
+        self.claims_options = claims_options
+        self.claims_params = claims_params
+        self.leeway = leeway
+        self.header_cache = header_cache
+
+    def verify(self, s, now=None):
+        """Verify the signature of the JWT, and validate its claims.
+
+        :param s: text of JWT
+        :param now: timestamp used to validate time based claims
+        :return: claims_cls instance
+        :raise: DecodeError, BadSignatureError, JoseError of claims
+        """
+        s = to_bytes(s)
+        if s.count(b'.') != 2:
+            raise DecodeError('Invalid input segments length')
+
+        signing_input, signature_segment = s.rsplit(b'.', 1)
+        protected_segment, payload_segment = signing_input.split(b'.', 1)
+
+        if self.header_cache is None:
+            protected = extract_header(protected_segment, DecodeError)
+        else:
+            protected = self.header_cache.extract(protected_segment, DecodeError)
+        if protected.get('b64', True) is not True:
+            raise DecodeError('Unencoded payload is not allowed')
+        header = JWSHeader(protected, None)
+        payload = decode_payload(
+            extract_segment(payload_segment, DecodeError, 'payload'))
+        signature = extract_segment(signature_segment, DecodeError, 'signature')
+
+        verifier = self._get_verifier(header, payload)
+        if not verifier.verify(signing_input, signature):
+            raise BadSignatureError(JWSObject(header, payload, 'compact'))
+
+        claims = self.claims_cls(
+            payload, header,
+            options=self.claims_options,
+            params=self.claims_params,
+        )
+        claims.validate(now=now, leeway=self.leeway)
+        return claims
+
+    def _get_verifier(self, header, payload):
+        alg = header.get('alg')
+        if alg is None:
+            raise MissingAlgorithmError()
+
+        algorithm = self.algorithms.get(alg)
+        if algorithm is None:
+            raise UnsupportedAlgorithmError()
+
+        if self._is_dynamic:
+            key = algorithm.prepare_key(self._load_key(header, payload))
+            return JWSVerifier(algorithm.verify, key)
+
+        # only kid values found in the key set can be cached
+        cache_key = (alg, _get_kid(header)) if self._is_key_set else alg
+        try:
+            verifier = self._prepared_keys[cache_key]
+        except KeyError:
+            key = algorithm.prepare_key(self._load_key(header, payload))
+            verifier = algorithm.prepare(key, 'verify')
+            self._prepared_keys[cache_key] = verifier
+        return verifier
+
+
+def convert_datetime_claims(payload):
+    for k in ['exp', 'iat', 'nbf']:
+        # convert datetime into timestamp
+        claim = payload.get(k)
+        if isinstance(claim, datetime.datetime):
+            payload[k] = calendar.timegm(claim.utctimetuple())
+
 
 def decode_payload(bytes_payload):
     try:
@@ -133,17 +403,17 @@ def find_encode_key(key, header):
         if kid:
             return key.find_by_kid(kid)
 
-        rv = random.choice(key.keys)
+        rv = key.random_key()
         # use side effect to add kid value into header
         header['kid'] = rv.kid
         return rv
 
     if isinstance(key, dict) and 'keys' in key:
         keys = key['keys']
-        kid = header.get('kid')
-        for k in keys:
-            if k.get('kid') == kid:
-                return k
+        kid = _get_kid(header)
+        rv = create_kid_index(keys).get(kid)
+        if rv is not None:
+            return rv
 
         if not kid:
             rv = random.choice(keys)
@@ -159,18 +429,37 @@ def find_encode_key(key, header):
     return key
 
 
+def create_kid_index(keys):
+    """Index the JWK dicts of a raw JWK set by kid, the first key wins."""
+    kid_index = {}
+    for k in keys:
+        kid_index.setdefault(k.get('kid'), k)
+    return kid_index
+
+
 def create_load_key(key):
+    if isinstance(key, dict) and 'keys' in key:
+        kid_index = create_kid_index(key['keys'])
+    else:
+        kid_index = None
+
     def load_key(header, payload):
         if isinstance(key, KeySet):
             return key.find_by_kid(header.get('kid'))
 
-        if isinstance(key, dict) and 'keys' in key:
-            keys = key['keys']
-            kid = header.get('kid')
-            for k in keys:
-                if k.get('kid') == kid:
-                    return k
-            raise ValueError('Invalid JSON Web Key Set')
+        if kid_index is not None:
+            k = kid_index.get(_get_kid(header))
+            if k is None:
+                raise ValueError('Invalid JSON Web Key Set')
+            return k
         return key
 
     return load_key
+
+
+def _get_kid(header):
+    # kid is a value of the token header, it can be any JSON value
+    kid = header.get('kid')
+    if kid is not None and not isinstance(kid, str):
+        raise ValueError('Invalid JSON Web Key Set')
+    return kid
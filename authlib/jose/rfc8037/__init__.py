@@ -1,5 +1,21 @@
-from .okp_key import OKPKey
-from .jws_eddsa import register_jws_rfc8037
+from ..util import register_lazy
+
+
+def __getattr__(name):
+    # OKPKey requires cryptography, it is imported on first access
+    if name == 'OKPKey':
+        from .okp_key import OKPKey
+        return OKPKey
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def _load_jws_algorithms():
+    from .jws_eddsa import EdDSAAlgorithm
+    return {'EdDSA': EdDSAAlgorithm()}
+
+
+def register_jws_rfc8037(cls):
+    register_lazy(cls.ALGORITHMS_REGISTRY, ['EdDSA'], _load_jws_algorithms)
 
 
 __all__ = ['register_jws_rfc8037', 'OKPKey']
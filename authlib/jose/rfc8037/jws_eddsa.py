@@ -1,5 +1,5 @@
 from cryptography.exceptions import InvalidSignature
-from ..rfc7515 import JWSAlgorithm
+from ..rfc7515 import JWSAlgorithm, JWSSigner, JWSVerifier
 from .okp_key import OKPKey
 
 
@@ -10,18 +10,27 @@ class EdDSAAlgorithm(JWSAlgorithm):
     def prepare_key(self, raw_data):
         return OKPKey.import_key(raw_data)
 
+    def prepare(self, key, operation):
+        if operation == 'sign':
+            return JWSSigner(self._sign, key.get_op_key('sign'))
+        if operation == 'verify':
+            return JWSVerifier(self._verify, key.get_op_key('verify'))
+        raise ValueError('Unsupported operation "{}"'.format(operation))
+
     def sign(self, msg, key):
-        op_key = key.get_op_key('sign')
-        return op_key.sign(msg)
+        return self._sign(msg, key.get_op_key('sign'))
 
     def verify(self, msg, sig, key):
-        op_key = key.get_op_key('verify')
+        return self._verify(msg, sig, key.get_op_key('verify'))
+
+    @staticmethod
+    def _sign(msg, op_key):
+        return op_key.sign(msg)
+
+    @staticmethod
+    def _verify(msg, sig, op_key):
         try:
             op_key.verify(sig, msg)
             return True
         except InvalidSignature:
             return False
-
-
-def register_jws_rfc8037(cls):
-    cls.register_algorithm(EdDSAAlgorithm())
@@ -1,4 +1,7 @@
 import binascii
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from authlib.common.encoding import urlsafe_b64decode, json_loads, to_unicode
 from authlib.jose.errors import DecodeError
 
@@ -16,6 +19,51 @@ def extract_header(header_segment, error_cls):
     return header
 
 
+class HeaderCache(object):
+    """A bounded LRU cache of parsed protected headers, keyed by the
+    header segment bytes. Tokens from one issuer usually share the same
+    protected header, pass the cache to ``deserialize_compact`` to skip
+    decoding it again::
+
+        header_cache = HeaderCache()
+        jws.deserialize_compact(s, key, header_cache=header_cache)
+
+    Only headers with plain values (no nested objects or arrays) are cached,
+    and every call gets its own copy of the cached header.
+
+    :param maxsize: max number of headers to keep in memory
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def extract(self, header_segment, error_cls):
+        with self._lock:
+            header = self._data.get(header_segment)
+            if header is not None:
+                self._data.move_to_end(header_segment)
+                return dict(header)
+
+        header = extract_header(header_segment, error_cls)
+        if all(isinstance(v, _PLAIN_TYPES) for v in header.values()):
+            with self._lock:
+                self._data[header_segment] = dict(header)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return header
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
 def extract_segment(segment, error_cls, name='payload'):
     try:
         return urlsafe_b64decode(segment)
@@ -35,3 +83,108 @@ def ensure_dict(s, structure_name):
         raise DecodeError('Invalid {}'.format(structure_name))
 
     return s
+
+
+async def run_in_executor(executor, func, *args):
+    """Call ``func`` in the given ``concurrent.futures`` executor, or call
+    it directly when executor is ``None``."""
+    if executor is None:
+        return func(*args)
+    import asyncio
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
+
+
+def map_in_executor(executor, func, *iterables):
+    """Call ``func`` with the items of ``iterables`` in the given
+    ``concurrent.futures`` executor, and return the results in order.
+    Call it directly when executor is ``None``."""
+    if executor is None:
+        return list(map(func, *iterables))
+    return list(executor.map(func, *iterables))
+
+
+class LazyRegistry(MutableMapping):
+    """A registry of algorithms or key classes by name. Besides the values
+    set directly, a group of names can be registered with a loader, which is
+    called on the first lookup of any of the names, so that the modules (and
+    backends) of the values are only imported when they are used::
+
+        def load_rsa_algorithms():
+            from .jws_algs import RSA_ALGORITHMS
+            return {alg.name: alg for alg in RSA_ALGORITHMS}
+
+        registry.register_lazy(['RS256', 'RS384', 'RS512'], load_rsa_algorithms)
+
+    It is a mapping like a dict, every value read from it is loaded, e.g.
+    ``dict(registry)``. Checking a name with ``in`` or listing ``keys()``
+    does not call the loaders.
+    """
+    def __init__(self, *args, **kwargs):
+        self._data = {}
+        self.update(*args, **kwargs)
+
+    def register_lazy(self, names, loader):
+        entry = _LazyEntry(loader)
+        for name in names:
+            self._data[name] = entry
+
+    def __getitem__(self, name):
+        value = self._data[name]
+        if isinstance(value, _LazyEntry):
+            return self._resolve(name, value)
+        return value
+
+    def __setitem__(self, name, value):
+        self._data[name] = value
+
+    def __delitem__(self, name):
+        del self._data[name]
+
+    def __contains__(self, name):
+        return name in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self))
+
+    def copy(self):
+        return LazyRegistry(self)
+
+    def _resolve(self, name, entry):
+        value = entry.load()[name]
+        with _lazy_lock:
+            # the name may be registered again by another thread
+            if self._data.get(name) is entry:
+                self._data[name] = value
+        return value
+
+
+def register_lazy(registry, names, loader):
+    """Register ``names`` with ``loader`` into a :class:`LazyRegistry`, or
+    load them at once for a plain dict registry."""
+    if isinstance(registry, LazyRegistry):
+        registry.register_lazy(names, loader)
+    else:
+        registry.update(loader())
+
+
+class _LazyEntry(object):
+    def __init__(self, loader):
+        self.loader = loader
+        self.values = None
+
+    def load(self):
+        if self.values is None:
+            with _lazy_lock:
+                if self.values is None:
+                    self.values = self.loader()
+        return self.values
+
+
+_lazy_lock = threading.RLock()
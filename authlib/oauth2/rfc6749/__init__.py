@@ -33,6 +33,8 @@ from .models import ClientMixin, AuthorizationCodeMixin, TokenMixin
 from .authenticate_client import ClientAuthentication
 from .authorization_server import AuthorizationServer
 from .resource_protector import ResourceProtector, TokenValidator
+from .token_cache import TokenCache
+from .token_sink import TokenSink
 from .token_endpoint import TokenEndpoint
 from .grants import (
     BaseGrant,
@@ -69,6 +71,7 @@ __all__ = [
     'AuthorizationServer',
     'ResourceProtector',
     'TokenValidator',
+    'TokenCache', 'TokenSink',
     'TokenEndpoint',
     'BaseGrant',
     'AuthorizationEndpointMixin',
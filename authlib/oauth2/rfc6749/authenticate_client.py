@@ -16,6 +16,7 @@
 """
 
 import logging
+from authlib.common.async_helpers import run_steps, async_run_steps
 from .errors import InvalidClientError
 from .util import extract_basic_authorization
 
@@ -34,12 +35,26 @@ class ClientAuthentication(object):
         }
 
     def register(self, method, func):
+        """Register a client auth method. The ``func`` MAY be a coroutine
+        function, which is only supported by :meth:`async_authenticate`."""
         self._methods[method] = func
 
     def authenticate(self, request, methods, endpoint):
+        return run_steps(self._authenticate(request, methods, endpoint))
+
+    async def async_authenticate(self, request, methods, endpoint):
+        """The same as :meth:`authenticate`, with ``query_client`` and the
+        registered auth methods that MAY be coroutine functions."""
+        return await async_run_steps(self._authenticate(request, methods, endpoint))
+
+    def _authenticate(self, request, methods, endpoint):
         for method in methods:
             func = self._methods[method]
-            client = func(self.query_client, request)
+            steps = _BUILTIN_STEPS.get(func)
+            if steps is None:
+                client = yield func(self.query_client, request)
+            else:
+                client = yield from steps(self.query_client, request)
             if client and client.check_endpoint_auth_method(method, endpoint):
                 request.auth_method = method
                 return client
@@ -56,37 +71,49 @@ def authenticate_client_secret_basic(query_client, request):
     """Authenticate client by ``client_secret_basic`` method. The client
     uses HTTP Basic for authentication.
     """
+    return run_steps(_authenticate_client_secret_basic(query_client, request))
+
+
+def authenticate_client_secret_post(query_client, request):
+    """Authenticate client by ``client_secret_post`` method. The client
+    uses POST parameters for authentication.
+    """
+    return run_steps(_authenticate_client_secret_post(query_client, request))
+
+
+def authenticate_none(query_client, request):
+    """Authenticate public client by ``none`` method. The client
+    does not have a client secret.
+    """
+    return run_steps(_authenticate_none(query_client, request))
+
+
+def _authenticate_client_secret_basic(query_client, request):
     client_id, client_secret = extract_basic_authorization(request.headers)
     if client_id and client_secret:
-        client = _validate_client(query_client, client_id, request.state, 401)
+        client = yield from _validate_client(query_client, client_id, request.state, 401)
         if client.check_client_secret(client_secret):
             log.debug(f'Authenticate {client_id} via "client_secret_basic" success')
             return client
     log.debug(f'Authenticate {client_id} via "client_secret_basic" failed')
 
 
-def authenticate_client_secret_post(query_client, request):
-    """Authenticate client by ``client_secret_post`` method. The client
-    uses POST parameters for authentication.
-    """
+def _authenticate_client_secret_post(query_client, request):
     data = request.form
     client_id = data.get('client_id')
     client_secret = data.get('client_secret')
     if client_id and client_secret:
-        client = _validate_client(query_client, client_id, request.state)
+        client = yield from _validate_client(query_client, client_id, request.state)
         if client.check_client_secret(client_secret):
             log.debug(f'Authenticate {client_id} via "client_secret_post" success')
             return client
     log.debug(f'Authenticate {client_id} via "client_secret_post" failed')
 
 
-def authenticate_none(query_client, request):
-    """Authenticate public client by ``none`` method. The client
-    does not have a client secret.
-    """
+def _authenticate_none(query_client, request):
     client_id = request.client_id
     if client_id and not request.data.get('client_secret'):
-        client = _validate_client(query_client, client_id, request.state)
+        client = yield from _validate_client(query_client, client_id, request.state)
         log.debug(f'Authenticate {client_id} via "none" success')
         return client
     log.debug(f'Authenticate {client_id} via "none" failed')
@@ -96,8 +123,15 @@ def _validate_client(query_client, client_id, state=None, status_code=400):
     if client_id is None:
         raise InvalidClientError(state=state, status_code=status_code)
 
-    client = query_client(client_id)
+    client = yield query_client(client_id)
     if not client:
         raise InvalidClientError(state=state, status_code=status_code)
 
     return client
+
+
+_BUILTIN_STEPS = {
+    authenticate_client_secret_basic: _authenticate_client_secret_basic,
+    authenticate_client_secret_post: _authenticate_client_secret_post,
+    authenticate_none: _authenticate_none,
+}
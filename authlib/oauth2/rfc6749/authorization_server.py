@@ -5,6 +5,12 @@ from .errors import (
     UnsupportedResponseTypeError,
     UnsupportedGrantTypeError,
 )
+from .grants.base import (
+    BaseGrant,
+    AuthorizationEndpointMixin,
+    TokenEndpointMixin,
+    _EMPTY_HOOKS,
+)
 from .util import scope_to_list
 
 
@@ -20,6 +26,9 @@ class AuthorizationServer(object):
         self._client_auth = None
         self._authorization_grants = []
         self._token_grants = []
+        # grants indexed by "response_type" and "grant_type"
+        self._authorization_grant_index = ({}, [])
+        self._token_grant_index = ({}, [])
         self._endpoints = {}
 
     def query_client(self, client_id):
@@ -90,6 +99,14 @@ class AuthorizationServer(object):
             self._client_auth = ClientAuthentication(self.query_client)
         return self._client_auth(request, methods, endpoint)
 
+    async def async_authenticate_client(self, request, methods, endpoint='token'):
+        """The same as :meth:`authenticate_client`, with ``query_client``
+        that MAY be a coroutine function.
+        """
+        if self._client_auth is None and self.query_client:
+            self._client_auth = ClientAuthentication(self.query_client)
+        return await self._client_auth.async_authenticate(request, methods, endpoint)
+
     def register_client_auth_method(self, method, func):
         """Add more client auth method. The default methods are:
 
@@ -136,6 +153,16 @@ class AuthorizationServer(object):
         """
         raise NotImplementedError()
 
+    async def async_create_oauth2_request(self, request):
+        """Create an OAuth2Request instance for the ``async_*`` methods. ASGI
+        framework integrations re-implement this method to read the request
+        body, the default one calls :meth:`create_oauth2_request`.
+
+        :param request: the "request" instance in framework
+        :return: OAuth2Request instance
+        """
+        return self.create_oauth2_request(request)
+
     def create_json_request(self, request):
         """This method MUST be implemented in framework integrations. It is
         used to create an HttpRequest instance.
@@ -169,13 +196,38 @@ class AuthorizationServer(object):
 
             authorization_server.register_grant(AuthorizationCodeGrant)
 
+        Extensions are applied to each grant instance. An extension which
+        only registers hooks, and checks the request in its hooks, can set
+        ``HOOKS_ONLY = True``, it is applied once here, and its hooks are
+        shared by all the grant instances of this server. Such an extension
+        is called with a hook table instead of a grant instance, it can only
+        call ``register_hook``.
+
         :param grant_cls: a grant class.
         :param extensions: extensions for the grant class.
         """
+        hooks, extensions = _compile_hooks(grant_cls, extensions)
         if hasattr(grant_cls, 'check_authorization_endpoint'):
-            self._authorization_grants.append((grant_cls, extensions))
+            if _is_default_check(grant_cls.check_authorization_endpoint,
+                                 AuthorizationEndpointMixin.check_authorization_endpoint):
+                keys = set(grant_cls.RESPONSE_TYPES)
+                check = None
+            else:
+                keys = None
+                check = _check_authorization_endpoint
+            self._authorization_grants.append((keys, (grant_cls, hooks, extensions, check)))
+            self._authorization_grant_index = _index_grants(self._authorization_grants)
+
         if hasattr(grant_cls, 'check_token_endpoint'):
-            self._token_grants.append((grant_cls, extensions))
+            if _is_default_check(grant_cls.check_token_endpoint,
+                                 TokenEndpointMixin.check_token_endpoint):
+                keys = {grant_cls.GRANT_TYPE}
+                check = _check_token_endpoint_method
+            else:
+                keys = None
+                check = _check_token_endpoint
+            self._token_grants.append((keys, (grant_cls, hooks, extensions, check)))
+            self._token_grant_index = _index_grants(self._token_grants)
 
     def register_endpoint(self, endpoint_cls):
         """Add extra endpoint to authorization server. e.g.
@@ -193,9 +245,10 @@ class AuthorizationServer(object):
         :param request: OAuth2Request instance.
         :return: grant instance
         """
-        for (grant_cls, extensions) in self._authorization_grants:
-            if grant_cls.check_authorization_endpoint(request):
-                return _create_grant(grant_cls, extensions, request, self)
+        grant = _find_grant(
+            self._authorization_grant_index, request.response_type, request, self)
+        if grant is not None:
+            return grant
         raise UnsupportedResponseTypeError(request.response_type)
 
     def get_consent_grant(self, request=None, end_user=None):
@@ -209,15 +262,24 @@ class AuthorizationServer(object):
         grant.validate_consent_request()
         return grant
 
+    async def async_get_consent_grant(self, request=None, end_user=None):
+        """The same as :meth:`get_consent_grant`, for ASGI apps."""
+        request = await self.async_create_oauth2_request(request)
+        request.user = end_user
+
+        grant = self.get_authorization_grant(request)
+        await grant.async_validate_consent_request()
+        return grant
+
     def get_token_grant(self, request):
         """Find the token grant for current request.
 
         :param request: OAuth2Request instance.
         :return: grant instance
         """
-        for (grant_cls, extensions) in self._token_grants:
-            if grant_cls.check_token_endpoint(request):
-                return _create_grant(grant_cls, extensions, request, self)
+        grant = _find_grant(self._token_grant_index, request.grant_type, request, self)
+        if grant is not None:
+            return grant
         raise UnsupportedGrantTypeError(request.grant_type)
 
     def create_endpoint_response(self, name, request=None):
@@ -237,6 +299,25 @@ class AuthorizationServer(object):
         except OAuth2Error as error:
             return self.handle_error_response(request, error)
 
+    async def async_create_endpoint_response(self, name, request=None):
+        """The same as :meth:`create_endpoint_response`, for ASGI apps. The
+        endpoint MUST be a :class:`TokenEndpoint`.
+
+        :param name: Endpoint name
+        :param request: HTTP request instance.
+        :return: Response
+        """
+        if name not in self._endpoints:
+            raise RuntimeError(f'There is no "{name}" endpoint.')
+
+        endpoint = self._endpoints[name]
+        request = await endpoint.async_create_endpoint_request(request)
+        try:
+            args = await endpoint.async_create_endpoint_response(request)
+            return self.handle_response(*args)
+        except OAuth2Error as error:
+            return self.handle_error_response(request, error)
+
     def create_authorization_response(self, request=None, grant_user=None):
         """Validate authorization request and create authorization response.
 
@@ -258,6 +339,29 @@ class AuthorizationServer(object):
         except OAuth2Error as error:
             return self.handle_error_response(request, error)
 
+    async def async_create_authorization_response(self, request=None, grant_user=None):
+        """The same as :meth:`create_authorization_response`, for ASGI apps.
+        The model methods MAY be coroutine functions, they are awaited by
+        the ``async_*`` methods of grants.
+
+        :param request: HTTP request instance.
+        :param grant_user: if granted, it is resource owner. If denied,
+            it is None.
+        :returns: Response
+        """
+        request = await self.async_create_oauth2_request(request)
+        try:
+            grant = self.get_authorization_grant(request)
+        except UnsupportedResponseTypeError as error:
+            return self.handle_error_response(request, error)
+
+        try:
+            redirect_uri = await grant.async_validate_authorization_request()
+            args = await grant.async_create_authorization_response(redirect_uri, grant_user)
+            return self.handle_response(*args)
+        except OAuth2Error as error:
+            return self.handle_error_response(request, error)
+
     def create_token_response(self, request=None):
         """Validate token request and create token response.
 
@@ -276,13 +380,118 @@ class AuthorizationServer(object):
         except OAuth2Error as error:
             return self.handle_error_response(request, error)
 
+    async def async_create_token_response(self, request=None):
+        """The same as :meth:`create_token_response`, for ASGI apps. The
+        ``query_client``, ``save_token`` and the model methods of grants
+        MAY be coroutine functions::
+
+            class Server(AuthorizationServer):
+                async def query_client(self, client_id):
+                    return await Client.get(client_id=client_id)
+
+            response = await server.async_create_token_response(request)
+
+        :param request: HTTP request instance
+        """
+        request = await self.async_create_oauth2_request(request)
+        try:
+            grant = self.get_token_grant(request)
+        except UnsupportedGrantTypeError as error:
+            return self.handle_error_response(request, error)
+
+        try:
+            await grant.async_validate_token_request()
+            args = await grant.async_create_token_response()
+            return self.handle_response(*args)
+        except OAuth2Error as error:
+            return self.handle_error_response(request, error)
+
     def handle_error_response(self, request, error):
         return self.handle_response(*error(self.get_error_uri(request, error)))
 
 
-def _create_grant(grant_cls, extensions, request, server):
-    grant = grant_cls(request, server)
-    if extensions:
-        for ext in extensions:
-            ext(grant)
-    return grant
+def _compile_hooks(grant_cls, extensions):
+    """Apply the ``HOOKS_ONLY`` extensions to a hook table, to collect
+    their hooks. The other extensions are returned, they are applied to
+    each grant instance."""
+    extensions = extensions or ()
+    hooks_only = [ext for ext in extensions if _is_hooks_only(ext)]
+    others = tuple(ext for ext in extensions if not _is_hooks_only(ext))
+    if not hooks_only:
+        return None, others
+
+    table = _HookTable(grant_cls)
+    for ext in hooks_only:
+        ext(table)
+    return table._hooks, others
+
+
+class _HookTable(object):
+    """Passed to the ``HOOKS_ONLY`` extensions in place of a grant, there
+    is no request when the grant is registered."""
+    register_hook = BaseGrant.register_hook
+
+    def __init__(self, grant_cls):
+        self.grant_cls = grant_cls
+        self._hooks = _EMPTY_HOOKS
+
+    def __getattr__(self, name):
+        raise AttributeError(
+            f'A HOOKS_ONLY extension of {self.grant_cls.__name__} can only '
+            f'call "register_hook", "{name}" is not available')
+
+
+def _is_hooks_only(ext):
+    # a subclass which overrides __call__ MUST set HOOKS_ONLY again
+    for klass in type(ext).__mro__:
+        if 'HOOKS_ONLY' in vars(klass):
+            return bool(klass.HOOKS_ONLY)
+        if '__call__' in vars(klass):
+            return False
+    return False
+
+
+def _is_default_check(method, default_method):
+    return getattr(method, '__func__', None) is default_method.__func__
+
+
+def _check_token_endpoint_method(grant_cls, request):
+    return request.method in grant_cls.TOKEN_ENDPOINT_HTTP_METHODS
+
+
+def _check_token_endpoint(grant_cls, request):
+    return grant_cls.check_token_endpoint(request)
+
+
+def _check_authorization_endpoint(grant_cls, request):
+    return grant_cls.check_authorization_endpoint(request)
+
+
+def _index_grants(grants):
+    """Index the registered grants by the value of "response_type" or
+    "grant_type". Grants with a custom check method are added to every
+    key, and to the list for other values, in registration order.
+    """
+    index = {}
+    others = []
+    for keys, entry in grants:
+        if keys is None:
+            others.append(entry)
+            for entries in index.values():
+                entries.append(entry)
+        else:
+            for key in keys:
+                index.setdefault(key, list(others)).append(entry)
+    return index, others
+
+
+def _find_grant(grant_index, key, request, server):
+    index, others = grant_index
+    for grant_cls, hooks, extensions, check in index.get(key, others):
+        if check is None or check(grant_cls, request):
+            grant = grant_cls(request, server)
+            if hooks is not None:
+                grant._hooks = hooks
+            for ext in extensions:
+                ext(grant)
+            return grant
@@ -1,4 +1,5 @@
 import logging
+from authlib.common.async_helpers import run_steps, async_run_steps, async_version_of
 from authlib.common.urls import add_params_to_uri
 from authlib.common.security import generate_token
 from .base import BaseGrant, AuthorizationEndpointMixin, TokenEndpointMixin
@@ -107,6 +108,20 @@ class AuthorizationCodeGrant(BaseGrant, AuthorizationEndpointMixin, TokenEndpoin
         """
         return validate_code_authorization_request(self)
 
+    @async_version_of('validate_authorization_request')
+    async def async_validate_authorization_request(self):
+        """The same as :meth:`validate_authorization_request`, with
+        ``query_client`` that MAY be a coroutine function."""
+        return await async_validate_code_authorization_request(self)
+
+    @async_version_of('validate_consent_request')
+    async def async_validate_consent_request(self):
+        """The same as :meth:`validate_consent_request`, with
+        ``query_client`` that MAY be a coroutine function."""
+        redirect_uri = await self.async_validate_authorization_request()
+        self.execute_hook('after_validate_consent_request', redirect_uri)
+        self.redirect_uri = redirect_uri
+
     def create_authorization_response(self, redirect_uri, grant_user):
         """If the resource owner grants the access request, the authorization
         server issues an authorization code and delivers it to the client by
@@ -146,13 +161,23 @@ class AuthorizationCodeGrant(BaseGrant, AuthorizationEndpointMixin, TokenEndpoin
             resource owner, otherwise pass None.
         :returns: (status_code, body, headers)
         """
+        return run_steps(self._create_authorization_response(redirect_uri, grant_user))
+
+    @async_version_of('create_authorization_response')
+    async def async_create_authorization_response(self, redirect_uri, grant_user):
+        """The same as :meth:`create_authorization_response`, with
+        :meth:`save_authorization_code` that MAY be a coroutine function."""
+        return await async_run_steps(
+            self._create_authorization_response(redirect_uri, grant_user))
+
+    def _create_authorization_response(self, redirect_uri, grant_user):
         if not grant_user:
             raise AccessDeniedError(state=self.request.state, redirect_uri=redirect_uri)
 
         self.request.user = grant_user
 
         code = self.generate_authorization_code()
-        self.save_authorization_code(code, self.request)
+        yield self.save_authorization_code(code, self.request)
 
         params = [('code', code)]
         if self.request.state:
@@ -206,7 +231,17 @@ class AuthorizationCodeGrant(BaseGrant, AuthorizationEndpointMixin, TokenEndpoin
 
         # authenticate the client if client authentication is included
         client = self.authenticate_token_endpoint_client()
+        run_steps(self._validate_token_request(client))
+
+    @async_version_of('validate_token_request')
+    async def async_validate_token_request(self):
+        """The same as :meth:`validate_token_request`, with ``query_client``
+        and :meth:`query_authorization_code` that MAY be coroutine
+        functions."""
+        client = await self.async_authenticate_token_endpoint_client()
+        await async_run_steps(self._validate_token_request(client))
 
+    def _validate_token_request(self, client):
         log.debug('Validate token request of %r', client)
         if not client.check_grant_type(self.GRANT_TYPE):
             raise UnauthorizedClientError(
@@ -219,7 +254,7 @@ class AuthorizationCodeGrant(BaseGrant, AuthorizationEndpointMixin, TokenEndpoin
         # ensure that the authorization code was issued to the authenticated
         # confidential client, or if the client is public, ensure that the
         # code was issued to "client_id" in the request
-        authorization_code = self.query_authorization_code(code, client)
+        authorization_code = yield self.query_authorization_code(code, client)
         if not authorization_code:
             raise InvalidGrantError('Invalid "code" in request.')
 
@@ -263,10 +298,20 @@ class AuthorizationCodeGrant(BaseGrant, AuthorizationEndpointMixin, TokenEndpoin
 
         .. _`Section 4.1.4`: https://tools.ietf.org/html/rfc6749#section-4.1.4
         """
+        return run_steps(self._create_token_response(self.save_token))
+
+    @async_version_of('create_token_response')
+    async def async_create_token_response(self):
+        """The same as :meth:`create_token_response`, with ``save_token``,
+        :meth:`authenticate_user` and :meth:`delete_authorization_code` that
+        MAY be coroutine functions."""
+        return await async_run_steps(self._create_token_response(self.async_save_token))
+
+    def _create_token_response(self, save_token):
         client = self.request.client
         authorization_code = self.request.credential
 
-        user = self.authenticate_user(authorization_code)
+        user = yield self.authenticate_user(authorization_code)
         if not user:
             raise InvalidGrantError('There is no "user" for this code.')
         self.request.user = user
@@ -279,9 +324,9 @@ class AuthorizationCodeGrant(BaseGrant, AuthorizationEndpointMixin, TokenEndpoin
         )
         log.debug('Issue token %r to %r', token, client)
 
-        self.save_token(token)
+        yield save_token(token)
         self.execute_hook('process_token', token=token)
-        self.delete_authorization_code(authorization_code)
+        yield self.delete_authorization_code(authorization_code)
         return 200, token, self.TOKEN_RESPONSE_HEADER
 
     def generate_authorization_code(self):
@@ -348,6 +393,16 @@ class AuthorizationCodeGrant(BaseGrant, AuthorizationEndpointMixin, TokenEndpoin
 
 
 def validate_code_authorization_request(grant):
+    return run_steps(_validate_code_authorization_request(grant))
+
+
+async def async_validate_code_authorization_request(grant):
+    """The same as :func:`validate_code_authorization_request`, with
+    ``query_client`` that MAY be a coroutine function."""
+    return await async_run_steps(_validate_code_authorization_request(grant))
+
+
+def _validate_code_authorization_request(grant):
     request = grant.request
     client_id = request.client_id
     log.debug('Validate authorization request of %r', client_id)
@@ -355,7 +410,7 @@ def validate_code_authorization_request(grant):
     if client_id is None:
         raise InvalidClientError(state=request.state)
 
-    client = grant.server.query_client(client_id)
+    client = yield grant.server.query_client(client_id)
     if not client:
         raise InvalidClientError(state=request.state)
 
@@ -1,6 +1,15 @@
 from authlib.consts import default_json_headers
+from authlib.common.async_helpers import maybe_await, ensure_sync, async_version_of
 from ..errors import InvalidRequestError
 
+#: An empty hook table, hooks are registered into a copy of it
+_EMPTY_HOOKS = {
+    'after_validate_authorization_request': (),
+    'after_validate_consent_request': (),
+    'after_validate_token_request': (),
+    'process_token': (),
+}
+
 
 class BaseGrant(object):
     #: Allowed client auth methods for token endpoint
@@ -20,12 +29,9 @@ class BaseGrant(object):
         self.redirect_uri = None
         self.request = request
         self.server = server
-        self._hooks = {
-            'after_validate_authorization_request': set(),
-            'after_validate_consent_request': set(),
-            'after_validate_token_request': set(),
-            'process_token': set(),
-        }
+        # the hook table can be shared by grant instances, it is copied
+        # before registering a hook
+        self._hooks = _EMPTY_HOOKS
 
     @property
     def client(self):
@@ -71,9 +77,26 @@ class BaseGrant(object):
             client=client, grant=self)
         return client
 
+    async def async_authenticate_token_endpoint_client(self):
+        """The same as :meth:`authenticate_token_endpoint_client`, used by
+        the ``async_*`` methods of :class:`AuthorizationServer`.
+        """
+        client = await self.server.async_authenticate_client(
+            self.request, self.TOKEN_ENDPOINT_AUTH_METHODS)
+        self.server.send_signal(
+            'after_authenticate_client',
+            client=client, grant=self)
+        return client
+
     def save_token(self, token):
         """A method to save token into database."""
-        return self.server.save_token(token, self.request)
+        return ensure_sync(self.server.save_token(token, self.request), 'save_token')
+
+    @async_version_of('save_token')
+    async def async_save_token(self, token):
+        """Save token into database, ``server.save_token`` MAY be a
+        coroutine function."""
+        return await maybe_await(self.server.save_token(token, self.request))
 
     def validate_requested_scope(self):
         """Validate if requested scope is supported by Authorization Server."""
@@ -85,7 +108,10 @@ class BaseGrant(object):
         if hook_type not in self._hooks:
             raise ValueError('Hook type %s is not in %s.',
                              hook_type, self._hooks)
-        self._hooks[hook_type].add(hook)
+        hooks = self._hooks[hook_type]
+        if hook not in hooks:
+            self._hooks = dict(self._hooks)
+            self._hooks[hook_type] = hooks + (hook,)
 
     def execute_hook(self, hook_type, *args, **kwargs):
         for hook in self._hooks[hook_type]:
@@ -110,6 +136,21 @@ class TokenEndpointMixin(object):
     def create_token_response(self):
         raise NotImplementedError()
 
+    async def async_validate_token_request(self):
+        """Validate token request for the ``async_*`` methods of
+        :class:`AuthorizationServer`. Grants with model methods that MAY be
+        coroutine functions re-implement it, the default one calls
+        :meth:`validate_token_request`.
+        """
+        return self.validate_token_request()
+
+    async def async_create_token_response(self):
+        """Create token response for the ``async_*`` methods of
+        :class:`AuthorizationServer`, the default one calls
+        :meth:`create_token_response`.
+        """
+        return self.create_token_response()
+
 
 class AuthorizationEndpointMixin(object):
     RESPONSE_TYPES = set()
@@ -145,3 +186,25 @@ class AuthorizationEndpointMixin(object):
 
     def create_authorization_response(self, redirect_uri, grant_user):
         raise NotImplementedError()
+
+    async def async_validate_consent_request(self):
+        """Validate consent request for the ``async_*`` methods of
+        :class:`AuthorizationServer`. Grants with model methods that MAY be
+        coroutine functions re-implement it, the default one calls
+        :meth:`validate_consent_request`.
+        """
+        self.validate_consent_request()
+
+    async def async_validate_authorization_request(self):
+        """Validate authorization request for the ``async_*`` methods of
+        :class:`AuthorizationServer`, the default one calls
+        :meth:`validate_authorization_request`.
+        """
+        return self.validate_authorization_request()
+
+    async def async_create_authorization_response(self, redirect_uri, grant_user):
+        """Create authorization response for the ``async_*`` methods of
+        :class:`AuthorizationServer`, the default one calls
+        :meth:`create_authorization_response`.
+        """
+        return self.create_authorization_response(redirect_uri, grant_user)
@@ -1,4 +1,5 @@
 import logging
+from authlib.common.async_helpers import run_steps, async_run_steps, async_version_of
 from .base import BaseGrant, TokenEndpointMixin
 from ..errors import UnauthorizedClientError
 
@@ -62,6 +63,16 @@ class ClientCredentialsGrant(BaseGrant, TokenEndpointMixin):
         # ignore validate for grant_type, since it is validated by
         # check_token_endpoint
         client = self.authenticate_token_endpoint_client()
+        self._validate_token_request(client)
+
+    @async_version_of('validate_token_request')
+    async def async_validate_token_request(self):
+        """The same as :meth:`validate_token_request`, with ``query_client``
+        that MAY be a coroutine function."""
+        client = await self.async_authenticate_token_endpoint_client()
+        self._validate_token_request(client)
+
+    def _validate_token_request(self, client):
         log.debug('Validate token request of %r', client)
 
         if not client.check_grant_type(self.GRANT_TYPE):
@@ -95,9 +106,18 @@ class ClientCredentialsGrant(BaseGrant, TokenEndpointMixin):
 
         :returns: (status_code, body, headers)
         """
+        return run_steps(self._create_token_response(self.save_token))
+
+    @async_version_of('create_token_response')
+    async def async_create_token_response(self):
+        """The same as :meth:`create_token_response`, with ``save_token``
+        that MAY be a coroutine function."""
+        return await async_run_steps(self._create_token_response(self.async_save_token))
+
+    def _create_token_response(self, save_token):
         client = self.request.client
         token = self.generate_token(scope=self.request.scope, include_refresh_token=False)
         log.debug('Issue token %r to %r', token, client)
-        self.save_token(token)
+        yield save_token(token)
         self.execute_hook('process_token', self, token=token)
         return 200, token, self.TOKEN_RESPONSE_HEADER
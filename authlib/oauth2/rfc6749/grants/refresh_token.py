@@ -9,6 +9,7 @@
 """
 
 import logging
+from authlib.common.async_helpers import run_steps, async_run_steps, async_version_of
 from .base import BaseGrant, TokenEndpointMixin
 from ..util import scope_to_list
 from ..errors import (
@@ -31,24 +32,18 @@ class RefreshTokenGrant(BaseGrant, TokenEndpointMixin):
     #: The authorization server MAY issue a new refresh token
     INCLUDE_NEW_REFRESH_TOKEN = False
 
-    def _validate_request_client(self):
-        # require client authentication for confidential clients or for any
-        # client that was issued client credentials (or with other
-        # authentication requirements)
-        client = self.authenticate_token_endpoint_client()
+    def _validate_request_client(self, client):
         log.debug('Validate token request of %r', client)
 
         if not client.check_grant_type(self.GRANT_TYPE):
             raise UnauthorizedClientError()
 
-        return client
-
     def _validate_request_token(self, client):
         refresh_token = self.request.form.get('refresh_token')
         if refresh_token is None:
             raise InvalidRequestError('Missing "refresh_token" in request.')
 
-        token = self.authenticate_refresh_token(refresh_token)
+        token = yield self.authenticate_refresh_token(refresh_token)
         if not token or not token.check_client(client):
             raise InvalidGrantError()
         return token
@@ -100,9 +95,24 @@ class RefreshTokenGrant(BaseGrant, TokenEndpointMixin):
 
             grant_type=refresh_token&refresh_token=tGzv3JOkF0XG5Qx2TlKWIA
         """
-        client = self._validate_request_client()
+        # require client authentication for confidential clients or for any
+        # client that was issued client credentials (or with other
+        # authentication requirements)
+        client = self.authenticate_token_endpoint_client()
+        run_steps(self._validate_token_request(client))
+
+    @async_version_of('validate_token_request')
+    async def async_validate_token_request(self):
+        """The same as :meth:`validate_token_request`, with ``query_client``
+        and :meth:`authenticate_refresh_token` that MAY be coroutine
+        functions."""
+        client = await self.async_authenticate_token_endpoint_client()
+        await async_run_steps(self._validate_token_request(client))
+
+    def _validate_token_request(self, client):
+        self._validate_request_client(client)
         self.request.client = client
-        token = self._validate_request_token(client)
+        token = yield from self._validate_request_token(client)
         self._validate_token_scope(token)
         self.request.credential = token
 
@@ -112,8 +122,18 @@ class RefreshTokenGrant(BaseGrant, TokenEndpointMixin):
         verification or is invalid, the authorization server returns an error
         response as described in Section 5.2.
         """
+        return run_steps(self._create_token_response(self.save_token))
+
+    @async_version_of('create_token_response')
+    async def async_create_token_response(self):
+        """The same as :meth:`create_token_response`, with ``save_token``,
+        :meth:`authenticate_user` and :meth:`revoke_old_credential` that MAY
+        be coroutine functions."""
+        return await async_run_steps(self._create_token_response(self.async_save_token))
+
+    def _create_token_response(self, save_token):
         credential = self.request.credential
-        user = self.authenticate_user(credential)
+        user = yield self.authenticate_user(credential)
         if not user:
             raise InvalidRequestError('There is no "user" for this token.')
 
@@ -122,9 +142,9 @@ class RefreshTokenGrant(BaseGrant, TokenEndpointMixin):
         log.debug('Issue token %r to %r', token, client)
 
         self.request.user = user
-        self.save_token(token)
+        yield save_token(token)
         self.execute_hook('process_token', token=token)
-        self.revoke_old_credential(credential)
+        yield self.revoke_old_credential(credential)
         return 200, token, self.TOKEN_RESPONSE_HEADER
 
     def issue_token(self, user, credential):
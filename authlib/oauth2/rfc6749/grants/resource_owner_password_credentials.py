@@ -1,4 +1,5 @@
 import logging
+from authlib.common.async_helpers import run_steps, async_run_steps, async_version_of
 from .base import BaseGrant, TokenEndpointMixin
 from ..errors import (
     UnauthorizedClientError,
@@ -84,6 +85,16 @@ class ResourceOwnerPasswordCredentialsGrant(BaseGrant, TokenEndpointMixin):
         # ignore validate for grant_type, since it is validated by
         # check_token_endpoint
         client = self.authenticate_token_endpoint_client()
+        run_steps(self._validate_token_request(client))
+
+    @async_version_of('validate_token_request')
+    async def async_validate_token_request(self):
+        """The same as :meth:`validate_token_request`, with ``query_client``
+        and :meth:`authenticate_user` that MAY be coroutine functions."""
+        client = await self.async_authenticate_token_endpoint_client()
+        await async_run_steps(self._validate_token_request(client))
+
+    def _validate_token_request(self, client):
         log.debug('Validate token request of %r', client)
 
         if not client.check_grant_type(self.GRANT_TYPE):
@@ -96,7 +107,7 @@ class ResourceOwnerPasswordCredentialsGrant(BaseGrant, TokenEndpointMixin):
             raise InvalidRequestError('Missing "password" in request.')
 
         log.debug('Authenticate user of %r', params['username'])
-        user = self.authenticate_user(
+        user = yield self.authenticate_user(
             params['username'],
             params['password']
         )
@@ -134,11 +145,20 @@ class ResourceOwnerPasswordCredentialsGrant(BaseGrant, TokenEndpointMixin):
 
         :returns: (status_code, body, headers)
         """
+        return run_steps(self._create_token_response(self.save_token))
+
+    @async_version_of('create_token_response')
+    async def async_create_token_response(self):
+        """The same as :meth:`create_token_response`, with ``save_token``
+        that MAY be a coroutine function."""
+        return await async_run_steps(self._create_token_response(self.async_save_token))
+
+    def _create_token_response(self, save_token):
         user = self.request.user
         scope = self.request.scope
         token = self.generate_token(user=user, scope=scope)
         log.debug('Issue token %r to %r', token, self.request.client)
-        self.save_token(token)
+        yield save_token(token)
         self.execute_hook('process_token', token=token)
         return 200, token, self.TOKEN_RESPONSE_HEADER
 
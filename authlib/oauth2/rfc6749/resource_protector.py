@@ -6,36 +6,29 @@
 
     .. _`Section 7`: https://tools.ietf.org/html/rfc6749#section-7
 """
-from .util import scope_to_list
+from authlib.common.async_helpers import maybe_await
+from .util import scope_insufficient
 from .errors import MissingAuthorizationError, UnsupportedTokenTypeError
 
 
 class TokenValidator(object):
     """Base token validator class. Subclass this validator to register
     into ResourceProtector instance.
+
+    :param realm: realm of the ``WWW-Authenticate`` header
+    :param token_cache: an optional :class:`TokenCache` of the tokens
+        returned by :meth:`authenticate_token`
     """
     TOKEN_TYPE = 'bearer'
 
-    def __init__(self, realm=None, **extra_attributes):
+    def __init__(self, realm=None, token_cache=None, **extra_attributes):
         self.realm = realm
+        self.token_cache = token_cache
         self.extra_attributes = extra_attributes
 
     @staticmethod
     def scope_insufficient(token_scopes, required_scopes):
-        if not required_scopes:
-            return False
-
-        token_scopes = scope_to_list(token_scopes)
-        if not token_scopes:
-            return True
-
-        token_scopes = set(token_scopes)
-        for scope in required_scopes:
-            resource_scopes = set(scope_to_list(scope))
-            if token_scopes.issuperset(resource_scopes):
-                return False
-
-        return True
+        return scope_insufficient(token_scopes, required_scopes)
 
     def authenticate_token(self, token_string):
         """A method to query token from database with the given token string.
@@ -49,6 +42,26 @@ class TokenValidator(object):
         """
         raise NotImplementedError()
 
+    def load_token(self, token_string):
+        """Get the token of the given token string, from ``token_cache`` if
+        it is configured, otherwise with :meth:`authenticate_token`."""
+        if self.token_cache is None:
+            return self.authenticate_token(token_string)
+        return self.token_cache.load(
+            token_string, lambda: self.authenticate_token(token_string))
+
+    async def async_load_token(self, token_string):
+        """The same as :meth:`load_token`, with :meth:`authenticate_token`
+        that MAY be a coroutine function::
+
+            async def authenticate_token(self, token_string):
+                return await Token.get(access_token=token_string)
+        """
+        if self.token_cache is None:
+            return await maybe_await(self.authenticate_token(token_string))
+        return await self.token_cache.async_load(
+            token_string, lambda: self.authenticate_token(token_string))
+
     def validate_request(self, request):
         """A method to validate if the HTTP request is valid or not. Developers MUST
         re-implement this method.  For instance, your server requires a
@@ -135,6 +148,15 @@ class ResourceProtector(object):
         """Validate the request and return a token."""
         validator, token_string = self.parse_request_authorization(request)
         validator.validate_request(request)
-        token = validator.authenticate_token(token_string)
+        token = validator.load_token(token_string)
+        validator.validate_token(token, scopes, request)
+        return token
+
+    async def async_validate_request(self, scopes, request):
+        """The same as :meth:`validate_request`, for ASGI apps, the token is
+        loaded with :meth:`TokenValidator.async_load_token`."""
+        validator, token_string = self.parse_request_authorization(request)
+        validator.validate_request(request)
+        token = await validator.async_load_token(token_string)
         validator.validate_token(token, scopes, request)
         return token
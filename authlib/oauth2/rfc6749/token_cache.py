@@ -0,0 +1,159 @@
+"""
+    authlib.oauth2.rfc6749.token_cache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A cache of tokens loaded by ``TokenValidator.authenticate_token``.
+"""
+import time
+import threading
+from collections import OrderedDict
+from authlib.common.async_helpers import maybe_await
+
+
+class TokenCache(object):
+    """A bounded cache of the tokens loaded by a :class:`TokenValidator`,
+    keyed by the token string. Pass it to the validator to skip the database
+    query for tokens that were seen recently::
+
+        from authlib.oauth2.rfc6749 import TokenCache
+
+        token_cache = TokenCache(maxsize=1024, ttl=60, negative_ttl=5)
+        require_oauth.register_token_validator(
+            MyBearerTokenValidator(token_cache=token_cache)
+        )
+
+    A token is kept for ``ttl`` seconds, but never after it expires, and an
+    unknown token string is kept for ``negative_ttl`` seconds. The Flask and
+    Django ``ResourceProtector`` connect the cache to their ``token_revoked``
+    signal, other revocations MUST call :meth:`invalidate`. A revoked token
+    is accepted for at most ``ttl`` seconds by other processes, check
+    :meth:`stats` for the hit rate and the max age of the served tokens.
+
+    The cached token objects are shared by requests, they should not depend
+    on a database session.
+
+    :param maxsize: max number of tokens to keep in memory
+    :param ttl: seconds to keep a token
+    :param negative_ttl: seconds to keep an unknown token string
+    """
+    def __init__(self, maxsize=1024, ttl=60, negative_ttl=5):
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive number')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.max_age = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, token_string, loader):
+        """Get the token of ``token_string`` from cache, or call ``loader``
+        to query the token and save it into cache."""
+        now = time.time()
+        hit, token = self._get(token_string, now)
+        if hit:
+            return token
+        token = loader()
+        self._set(token_string, token, now)
+        return token
+
+    async def async_load(self, token_string, loader):
+        """The same as :meth:`load`, with a ``loader`` that MAY return an
+        awaitable."""
+        now = time.time()
+        hit, token = self._get(token_string, now)
+        if hit:
+            return token
+        token = await maybe_await(loader())
+        self._set(token_string, token, now)
+        return token
+
+    def _get(self, token_string, now):
+        with self._lock:
+            item = self._data.get(token_string)
+            if item is not None and item[0] > now:
+                self._data.move_to_end(token_string)
+                self.hits += 1
+                self.max_age = max(self.max_age, now - item[1])
+                return True, item[2]
+            self.misses += 1
+            return False, None
+
+    def _set(self, token_string, token, now):
+        if token is None:
+            expires_at = now + self.negative_ttl
+        else:
+            expires_at = now + self.ttl
+            token_expires_at = self.get_expires_at(token)
+            if token_expires_at is not None:
+                expires_at = min(expires_at, token_expires_at)
+
+        if expires_at > now:
+            with self._lock:
+                self._data[token_string] = (expires_at, now, token)
+                self._data.move_to_end(token_string)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def get_expires_at(self, token):
+        """Get the timestamp when the token expires, ``None`` if it is
+        unknown. Developers MAY re-implement this method for their token
+        models, the default one works with ``issued_at`` and ``expires_in``
+        attributes::
+
+            def get_expires_at(self, token):
+                return token.expires_at
+        """
+        issued_at = getattr(token, 'issued_at', None)
+        expires_in = getattr(token, 'expires_in', None)
+        if issued_at and expires_in:
+            return issued_at + expires_in
+        return None
+
+    def get_token_string(self, token):
+        """Get the access token string of the token to invalidate, it uses
+        the ``access_token`` attribute by default."""
+        return getattr(token, 'access_token', None)
+
+    def invalidate(self, token_string):
+        """Remove the token of the given token string."""
+        with self._lock:
+            if self._data.pop(token_string, None) is not None:
+                self.invalidations += 1
+
+    def on_token_revoked(self, sender, token=None, **kwargs):
+        """A receiver of ``token_revoked`` signals to invalidate the revoked
+        token::
+
+            token_revoked.connect(token_cache.on_token_revoked)
+        """
+        if token is not None:
+            token_string = self.get_token_string(token)
+            if token_string:
+                self.invalidate(token_string)
+
+    def clear(self):
+        """Remove all the tokens."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Get the statistics of this cache: ``size``, ``hits``, ``misses``,
+        ``hit_rate``, ``invalidations``, and ``max_age`` in seconds of the
+        tokens served from cache, which is how stale a token can be."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'invalidations': self.invalidations,
+                'max_age': self.max_age,
+            }
+
+    def __len__(self):
+        return len(self._data)
@@ -17,6 +17,9 @@ class TokenEndpoint(object):
     def create_endpoint_request(self, request):
         return self.server.create_oauth2_request(request)
 
+    async def async_create_endpoint_request(self, request):
+        return await self.server.async_create_oauth2_request(request)
+
     def authenticate_endpoint_client(self, request):
         """Authentication client for endpoint with ``CLIENT_AUTH_METHODS``.
         """
@@ -25,8 +28,25 @@ class TokenEndpoint(object):
         request.client = client
         return client
 
+    async def async_authenticate_endpoint_client(self, request):
+        """The same as :meth:`authenticate_endpoint_client`, with
+        ``query_client`` that MAY be a coroutine function.
+        """
+        client = await self.server.async_authenticate_client(
+            request, self.CLIENT_AUTH_METHODS, self.ENDPOINT_NAME)
+        request.client = client
+        return client
+
     def authenticate_token(self, request, client):
         raise NotImplementedError()
 
     def create_endpoint_response(self, request):
         raise NotImplementedError()
+
+    async def async_create_endpoint_response(self, request):
+        """Create endpoint response for
+        :meth:`AuthorizationServer.async_create_endpoint_response`.
+        Endpoints with model methods that MAY be coroutine functions
+        re-implement it, the default one calls :meth:`create_endpoint_response`.
+        """
+        return self.create_endpoint_response(request)
@@ -0,0 +1,266 @@
+"""
+    authlib.oauth2.rfc6749.token_sink
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A write-behind buffer of the tokens issued by ``AuthorizationServer``,
+    to save them into database in batches.
+"""
+import os
+import time
+import atexit
+import logging
+import threading
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+
+class TokenSink(object):
+    """Buffer the token items of ``save_token`` and save them in batches
+    with one ``save_tokens(items)`` call, e.g. a bulk insert and a single
+    commit. A batch is saved when it has ``batch_size`` items, or when its
+    first item has waited ``flush_interval`` seconds.
+
+    There are two durability modes:
+
+    * ``flush``: :meth:`put` returns after the batch of the item is saved,
+      and raises the error of ``save_tokens`` for its item. The token is in
+      database before the token response is sent. Concurrent requests share
+      a batch, while a batch is saved the new items are collected into the
+      next one.
+    * ``async``: :meth:`put` returns at once, a background thread saves the
+      batches. The tokens of at most ``max_pending`` items can be lost when
+      the process crashes, or when ``save_tokens`` fails, and a token MAY
+      be used before it is saved. :meth:`put` blocks when there are
+      ``max_pending`` items waiting.
+
+    Pass it to the integrations, e.g. with SQLAlchemy::
+
+        from authlib.integrations.sqla_oauth2 import create_token_sink
+
+        token_sink = create_token_sink(
+            sessionmaker(bind=db.engine), Token, durability='flush')
+        save_token = create_save_token_func(db.session, Token, token_sink)
+
+    ``save_tokens`` is called in the thread of any request in ``flush``
+    mode, it MUST save the items with its own session or connection, not
+    the one of the current request. When a batch fails, its items are saved
+    again one by one, so that only the failing items get an error, hence
+    ``save_tokens`` MUST save all the items or none of them.
+
+    :param save_tokens: a function to save a list of token items
+    :param batch_size: max number of items in a batch
+    :param flush_interval: seconds to wait for more items of a batch
+    :param durability: ``flush`` or ``async``
+    :param max_pending: max number of items waiting in ``async`` mode
+    """
+    DURABILITY_MODES = ('flush', 'async')
+
+    def __init__(self, save_tokens, batch_size=100, flush_interval=0.0,
+                 durability='flush', max_pending=10000):
+        if durability not in self.DURABILITY_MODES:
+            raise ValueError(f'durability must be one of {self.DURABILITY_MODES}')
+        if batch_size < 1:
+            raise ValueError('batch_size must be a positive number')
+        if max_pending < batch_size:
+            raise ValueError('max_pending must not be less than batch_size')
+        self.save_tokens = save_tokens
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.max_pending = max_pending
+        self.saved = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.errors = 0
+        self.dropped = 0
+        self._cond = threading.Condition()
+        self._batches = deque()
+        self._pending = 0
+        self._flushing = False
+        self._closed = False
+        self._thread = None
+        self._pid = None
+
+    def put(self, item):
+        """Add a token item into the current batch."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('TokenSink is closed')
+            batch = self._add(item)
+            index = len(batch.items) - 1
+            if self.durability == 'async':
+                self._start_thread()
+                return
+
+            while not batch.done:
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                delay = self._get_delay()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                self._flush_next()
+
+        error = batch.results[index]
+        if error is _INTERRUPTED:
+            raise RuntimeError('Saving tokens was interrupted')
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """Save all the buffered items now, in the calling thread."""
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            while self._batches:
+                self._flush_next()
+
+    def close(self):
+        """Save all the buffered items and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    def stats(self):
+        """Get the statistics of this sink: ``pending`` items, ``saved``
+        items, ``batches``, ``mean_batch`` and ``max_batch`` sizes,
+        ``errors`` of the items failed to save, and ``dropped`` items in
+        ``async`` mode."""
+        with self._cond:
+            return {
+                'pending': self._pending,
+                'saved': self.saved,
+                'batches': self.batches,
+                'mean_batch': self.saved / self.batches if self.batches else 0.0,
+                'max_batch': self.max_batch,
+                'errors': self.errors,
+                'dropped': self.dropped,
+            }
+
+    def __len__(self):
+        return self._pending
+
+    def _add(self, item):
+        # a forked process has a copy of the items of its parent, they
+        # are saved by the parent
+        pid = os.getpid()
+        if self._pid != pid:
+            self._pid = pid
+            self._batches.clear()
+            self._pending = 0
+            self._flushing = False
+            self._thread = None
+
+        while self.durability == 'async' and self._pending >= self.max_pending:
+            self._cond.wait()
+
+        if not self._batches or len(self._batches[-1].items) >= self.batch_size:
+            self._batches.append(_Batch())
+            self._cond.notify_all()
+        batch = self._batches[-1]
+        batch.items.append(item)
+        self._pending += 1
+        if len(batch.items) == self.batch_size:
+            self._cond.notify_all()
+        return batch
+
+    def _get_delay(self):
+        # seconds to wait before saving the first batch
+        if not self._batches or self._closed:
+            return 0
+        batch = self._batches[0]
+        if len(batch.items) >= self.batch_size or len(self._batches) > 1:
+            return 0
+        return batch.created_at + self.flush_interval - time.monotonic()
+
+    def _flush_next(self):
+        # called with the lock, which is released while saving
+        batch = self._batches.popleft()
+        # kept if save_tokens is interrupted, e.g. by KeyboardInterrupt
+        batch.results = [_INTERRUPTED] * len(batch.items)
+        self._flushing = True
+        self._cond.release()
+        try:
+            self._save(batch)
+        finally:
+            self._cond.acquire()
+            self._finish(batch)
+
+    def _save(self, batch):
+        try:
+            self.save_tokens(batch.items)
+            batch.results = [None] * len(batch.items)
+            return
+        except Exception as error:
+            if len(batch.items) == 1:
+                batch.results[0] = error
+                return
+
+        # save the items one by one to find the failing ones, each of
+        # them gets its own error
+        for index, item in enumerate(batch.items):
+            try:
+                self.save_tokens([item])
+                batch.results[index] = None
+            except Exception as error:
+                batch.results[index] = error
+
+    def _finish(self, batch):
+        self._flushing = False
+        self._pending -= len(batch.items)
+        size = batch.results.count(None)
+        if size:
+            self.saved += size
+            self.batches += 1
+            self.max_batch = max(self.max_batch, size)
+        for error in batch.results:
+            if error is None:
+                continue
+            self.errors += 1
+            if self.durability == 'async':
+                self.dropped += 1
+                if error is _INTERRUPTED:
+                    error = None
+                log.error('Failed to save a token', exc_info=error)
+        batch.done = True
+        self._cond.notify_all()
+
+    def _start_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name='authlib-token-sink', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self):
+        with self._cond:
+            while True:
+                if self._flushing:
+                    self._cond.wait()
+                elif not self._batches:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                else:
+                    delay = self._get_delay()
+                    if delay > 0:
+                        self._cond.wait(delay)
+                    else:
+                        self._flush_next()
+
+
+class _Batch(object):
+    def __init__(self):
+        self.items = []
+        self.created_at = time.monotonic()
+        self.done = False
+        self.results = None
+
+
+_INTERRUPTED = object()
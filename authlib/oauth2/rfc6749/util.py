@@ -1,5 +1,6 @@
 import base64
 import binascii
+import threading
 from authlib.common.encoding import to_unicode
 
 
@@ -21,6 +22,133 @@ def scope_to_list(scope):
     return scope.strip().split()
 
 
+class CompiledScopes(list):
+    """A list of required scopes in **OR** mode, e.g. ``['profile email',
+    'user']``, with the bit mask of each item. Create it with
+    :func:`compile_scopes`."""
+    def __init__(self, scopes, masks):
+        super(CompiledScopes, self).__init__(scopes)
+        self.masks = masks
+
+
+class ScopeMatcher(object):
+    """Match token scopes against required scopes with integer bit masks.
+    Each scope of the compiled required scopes is interned to a bit, and
+    the bit mask of a token scope string is cached, so that checking a
+    token is a few mask operations.
+
+    :param maxsize: max number of token scope strings to cache
+    """
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._bits = {}
+        self._masks = {}
+        self._lock = threading.Lock()
+
+    def compile(self, scopes):
+        """Compile a list of required scopes in **OR** mode, each item is a
+        space separated string of scopes in **AND** mode.
+
+        :return: :class:`CompiledScopes` instance, or None
+        """
+        if scopes is None or isinstance(scopes, CompiledScopes):
+            return scopes
+        if isinstance(scopes, str):
+            scopes = [scopes]
+        masks = tuple(self._intern(scope_to_list(scope)) for scope in scopes)
+        return CompiledScopes(scopes, masks)
+
+    def get_mask(self, scope):
+        """Get the bit mask of a token scope, the scopes which are not in
+        any compiled required scopes are ignored. Return None for an empty
+        scope."""
+        cacheable = isinstance(scope, str)
+        if cacheable:
+            item = self._masks.get(scope)
+            # the mask is outdated when more scopes are interned
+            if item is not None and item[0] == len(self._bits):
+                return item[1]
+
+        bits = self._bits
+        size = len(bits)
+        scopes = scope_to_list(scope)
+        if not scopes:
+            mask = None
+        else:
+            mask = 0
+            for s in scopes:
+                mask |= bits.get(s, 0)
+
+        if cacheable:
+            if len(self._masks) >= self.maxsize:
+                self._masks.clear()
+            self._masks[scope] = (size, mask)
+        return mask
+
+    def scope_insufficient(self, token_scope, required_scopes):
+        """Check if the token scope does not match any of the required
+        scopes. Required scopes which are not compiled are checked with
+        sets, their scopes are not interned, since they can be dynamic."""
+        if not required_scopes:
+            return False
+
+        if not isinstance(required_scopes, CompiledScopes):
+            return _scope_insufficient(token_scope, required_scopes)
+
+        mask = self.get_mask(token_scope)
+        if mask is None:
+            return True
+
+        for required in required_scopes.masks:
+            if mask & required == required:
+                return False
+        return True
+
+    def _intern(self, scopes):
+        mask = 0
+        with self._lock:
+            for scope in scopes:
+                bit = self._bits.get(scope)
+                if bit is None:
+                    bit = 1 << len(self._bits)
+                    self._bits[scope] = bit
+                mask |= bit
+        return mask
+
+
+def _scope_insufficient(token_scope, required_scopes):
+    token_scopes = scope_to_list(token_scope)
+    if not token_scopes:
+        return True
+
+    if isinstance(required_scopes, str):
+        required_scopes = [required_scopes]
+    token_scopes = set(token_scopes)
+    for scope in required_scopes:
+        if token_scopes.issuperset(scope_to_list(scope)):
+            return False
+    return True
+
+
+_scope_matcher = ScopeMatcher()
+
+
+def compile_scopes(scopes):
+    """Compile the required scopes of a resource once, e.g. when decorating
+    a view, to check tokens with bit masks::
+
+        scopes = compile_scopes(['profile email', 'user'])
+        validator.scope_insufficient(token.get_scope(), scopes)
+    """
+    return _scope_matcher.compile(scopes)
+
+
+def scope_insufficient(token_scope, required_scopes):
+    """Check if the token scope does not match any of the required scopes,
+    which can be compiled by :func:`compile_scopes`."""
+    return _scope_matcher.scope_insufficient(token_scope, required_scopes)
+
+
 def extract_basic_authorization(headers):
     auth = headers.get('Authorization')
     if not auth or ' ' not in auth:
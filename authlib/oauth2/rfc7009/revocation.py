@@ -1,4 +1,5 @@
 from authlib.consts import default_json_headers
+from authlib.common.async_helpers import run_steps, async_run_steps, async_version_of
 from ..rfc6749 import TokenEndpoint
 from ..rfc6749 import (
     InvalidRequestError,
@@ -27,6 +28,15 @@ class RevocationEndpoint(TokenEndpoint):
             OPTIONAL.  A hint about the type of the token submitted for
             revocation.
         """
+        return run_steps(self._authenticate_token(request, client))
+
+    @async_version_of('authenticate_token')
+    async def async_authenticate_token(self, request, client):
+        """The same as :meth:`authenticate_token`, with :meth:`query_token`
+        that MAY be a coroutine function."""
+        return await async_run_steps(self._authenticate_token(request, client))
+
+    def _authenticate_token(self, request, client):
         if 'token' not in request.form:
             raise InvalidRequestError()
 
@@ -34,7 +44,7 @@ class RevocationEndpoint(TokenEndpoint):
         if hint and hint not in self.SUPPORTED_TOKEN_TYPES:
             raise UnsupportedTokenTypeError()
 
-        token = self.query_token(request.form['token'], hint)
+        token = yield self.query_token(request.form['token'], hint)
         if token and token.check_client(client):
             return token
 
@@ -58,10 +68,21 @@ class RevocationEndpoint(TokenEndpoint):
         # then verifies whether the token was issued to the client making
         # the revocation request
         token = self.authenticate_token(request, client)
-
+        return run_steps(self._create_endpoint_response(request, client, token))
+
+    @async_version_of('create_endpoint_response')
+    async def async_create_endpoint_response(self, request):
+        """The same as :meth:`create_endpoint_response`, with ``query_client``,
+        :meth:`query_token` and :meth:`revoke_token` that MAY be coroutine
+        functions."""
+        client = await self.async_authenticate_endpoint_client(request)
+        token = await self.async_authenticate_token(request, client)
+        return await async_run_steps(self._create_endpoint_response(request, client, token))
+
+    def _create_endpoint_response(self, request, client, token):
         # the authorization server invalidates the token
         if token:
-            self.revoke_token(token, request)
+            yield self.revoke_token(token, request)
             self.server.send_signal(
                 'after_revoke_token',
                 token=token,
@@ -1,4 +1,5 @@
 import logging
+from authlib.common.async_helpers import ensure_sync
 from authlib.jose import jwt
 from authlib.jose.errors import JoseError
 from ..rfc6749 import InvalidClientError
@@ -78,7 +79,7 @@ class JWTBearerClientAssertion(object):
             # For client authentication, the subject MUST be the
             # "client_id" of the OAuth client
             client_id = payload['sub']
-            client = query_client(client_id)
+            client = ensure_sync(query_client(client_id), 'query_client')
             if not client:
                 raise InvalidClientError()
             request.client = client
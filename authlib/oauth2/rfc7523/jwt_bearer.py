@@ -8,6 +8,7 @@ from ..rfc6749 import (
     InvalidClientError,
 )
 from .assertion import sign_jwt_bearer_assertion
+from .validator import ClaimsOptionsCache
 
 log = logging.getLogger(__name__)
 JWT_BEARER_GRANT_TYPE = 'urn:ietf:params:oauth:grant-type:jwt-bearer'
@@ -23,6 +24,12 @@ class JWTBearerGrant(BaseGrant, TokenEndpointMixin):
         'aud': {'essential': True},
         'exp': {'essential': True},
     }
+    _claims_options_cache = ClaimsOptionsCache()
+
+    @classmethod
+    def invalidate_claims_options(cls):
+        """Call it after :attr:`CLAIMS_OPTIONS` is updated in place."""
+        cls._claims_options_cache.invalidate(cls.CLAIMS_OPTIONS)
 
     @staticmethod
     def sign(key, issuer, audience, subject=None,
@@ -44,7 +51,7 @@ class JWTBearerGrant(BaseGrant, TokenEndpointMixin):
         try:
             claims = jwt.decode(
                 assertion, self.resolve_public_key,
-                claims_options=self.CLAIMS_OPTIONS)
+                claims_options=self._claims_options_cache.get(self.CLAIMS_OPTIONS))
             claims.validate()
         except JoseError as e:
             log.debug('Assertion Error: %r', e)
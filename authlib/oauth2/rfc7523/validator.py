@@ -1,6 +1,6 @@
 import time
 import logging
-from authlib.jose import jwt, JoseError, JWTClaims
+from authlib.jose import jwt, JoseError, JWTClaims, ClaimsValidator
 from ..rfc6749 import TokenMixin
 from ..rfc6750 import BearerTokenValidator
 
@@ -39,12 +39,17 @@ class JWTBearerTokenValidator(BearerTokenValidator):
         if issuer:
             claims_options['iss'] = {'essential': True, 'value': issuer}
         self.claims_options = claims_options
+        self._claims_options_cache = ClaimsOptionsCache()
+
+    def invalidate_claims_options(self):
+        """Call it after :attr:`claims_options` is updated in place."""
+        self._claims_options_cache.invalidate(self.claims_options)
 
     def authenticate_token(self, token_string):
         try:
             claims = jwt.decode(
                 token_string, self.public_key,
-                claims_options=self.claims_options,
+                claims_options=self._claims_options_cache.get(self.claims_options),
                 claims_cls=self.token_cls,
             )
             claims.validate()
@@ -52,3 +57,36 @@ class JWTBearerTokenValidator(BearerTokenValidator):
         except JoseError as error:
             logger.debug('Authenticate token failed. %r', error)
             return None
+
+
+class ClaimsOptionsCache(object):
+    """Compile dict claims options into :class:`ClaimsValidator` once for
+    each options object. A ``ClaimsValidator`` is returned as it is. When
+    the options are updated in place, call :meth:`invalidate` to compile
+    them again.
+    """
+    #: Max number of compiled options objects
+    MAX_SIZE = 64
+
+    def __init__(self):
+        self._compiled = {}
+
+    def get(self, options):
+        if isinstance(options, ClaimsValidator):
+            return options
+        compiled = self._compiled.get(id(options))
+        if compiled is None or compiled[0] is not options:
+            if len(self._compiled) >= self.MAX_SIZE:
+                self._compiled.clear()
+            # keep the options, so that its id is not reused
+            compiled = (options, ClaimsValidator(options))
+            self._compiled[id(options)] = compiled
+        return compiled[1]
+
+    def invalidate(self, options=None):
+        """Compile ``options`` again on next :meth:`get`, or all options
+        when ``options`` is None."""
+        if options is None:
+            self._compiled.clear()
+        else:
+            self._compiled.pop(id(options), None)
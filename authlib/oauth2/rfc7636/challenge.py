@@ -39,6 +39,8 @@ class CodeChallenge(object):
             [CodeChallenge(required=True)]
         )
     """
+    #: the hooks check the request, apply it once in ``register_grant``
+    HOOKS_ONLY = True
     #: defaults to "plain" if not present in the request
     DEFAULT_CODE_CHALLENGE_METHOD = 'plain'
     #: supported ``code_challenge_method``
@@ -1,4 +1,5 @@
 from authlib.consts import default_json_headers
+from authlib.common.async_helpers import run_steps, async_run_steps, async_version_of
 from ..rfc6749 import (
     TokenEndpoint,
     InvalidRequestError,
@@ -34,6 +35,15 @@ class IntrospectionEndpoint(TokenEndpoint):
             **OPTIONAL**  A hint about the type of the token submitted for
             introspection.
         """
+        return run_steps(self._authenticate_token(request, client))
+
+    @async_version_of('authenticate_token')
+    async def async_authenticate_token(self, request, client):
+        """The same as :meth:`authenticate_token`, with :meth:`query_token`
+        that MAY be a coroutine function."""
+        return await async_run_steps(self._authenticate_token(request, client))
+
+    def _authenticate_token(self, request, client):
         params = request.form
         if 'token' not in params:
             raise InvalidRequestError()
@@ -42,7 +52,7 @@ class IntrospectionEndpoint(TokenEndpoint):
         if hint and hint not in self.SUPPORTED_TOKEN_TYPES:
             raise UnsupportedTokenTypeError()
 
-        token = self.query_token(params['token'], hint)
+        token = yield self.query_token(params['token'], hint)
         if token and self.check_permission(token, client, request):
             return token
 
@@ -62,7 +72,26 @@ class IntrospectionEndpoint(TokenEndpoint):
         body = self.create_introspection_payload(token)
         return 200, body, default_json_headers
 
+    @async_version_of('create_endpoint_response')
+    async def async_create_endpoint_response(self, request):
+        """The same as :meth:`create_endpoint_response`, with ``query_client``,
+        :meth:`query_token` and :meth:`introspect_token` that MAY be
+        coroutine functions."""
+        client = await self.async_authenticate_endpoint_client(request)
+        token = await self.async_authenticate_token(request, client)
+        body = await self.async_create_introspection_payload(token)
+        return 200, body, default_json_headers
+
     def create_introspection_payload(self, token):
+        return run_steps(self._create_introspection_payload(token))
+
+    @async_version_of('create_introspection_payload')
+    async def async_create_introspection_payload(self, token):
+        """The same as :meth:`create_introspection_payload`, with
+        :meth:`introspect_token` that MAY be a coroutine function."""
+        return await async_run_steps(self._create_introspection_payload(token))
+
+    def _create_introspection_payload(self, token):
         # the token is not active, does not exist on this server, or the
         # protected resource is not allowed to introspect this particular
         # token, then the authorization server MUST return an introspection
@@ -71,7 +100,7 @@ class IntrospectionEndpoint(TokenEndpoint):
             return {'active': False}
         if token.is_expired() or token.is_revoked():
             return {'active': False}
-        payload = self.introspect_token(token)
+        payload = yield self.introspect_token(token)
         if 'active' not in payload:
             payload['active'] = True
         return payload
@@ -20,6 +20,9 @@ log = logging.getLogger(__name__)
 
 
 class OpenIDToken(object):
+    #: the hooks check the request, apply it once in ``register_grant``
+    HOOKS_ONLY = True
+
     def get_jwt_config(self, grant):  # pragma: no cover
         """Get the JWT configuration for OpenIDCode extension. The JWT
         configuration will be used to generate ``id_token``. Developers
@@ -106,6 +109,8 @@ class OpenIDCode(OpenIDToken):
 
         authorization_server.register_grant(AuthorizationCodeGrant, extensions=[MyOpenIDCode()])
     """
+    HOOKS_ONLY = True
+
     def __init__(self, require_nonce=False):
         self.require_nonce = require_nonce
 
@@ -128,14 +133,22 @@ class OpenIDCode(OpenIDToken):
     def validate_openid_authorization_request(self, grant):
         validate_nonce(grant.request, self.exists_nonce, self.require_nonce)
 
+    def _after_validate_authorization_request(self, grant):
+        # hooks are shared by all requests, check the scope of each request
+        if is_openid_scope(grant.request.scope):
+            self.validate_openid_authorization_request(grant)
+
+    def _after_validate_consent_request(self, grant, redirect_uri):
+        if is_openid_scope(grant.request.scope):
+            validate_request_prompt(grant, redirect_uri)
+
     def __call__(self, grant):
         grant.register_hook('process_token', self.process_token)
-        if is_openid_scope(grant.request.scope):
-            grant.register_hook(
-                'after_validate_authorization_request',
-                self.validate_openid_authorization_request
-            )
-            grant.register_hook(
-                'after_validate_consent_request',
-                validate_request_prompt
-            )
+        grant.register_hook(
+            'after_validate_authorization_request',
+            self._after_validate_authorization_request
+        )
+        grant.register_hook(
+            'after_validate_consent_request',
+            self._after_validate_consent_request
+        )
@@ -1,4 +1,5 @@
 import logging
+from authlib.common.async_helpers import ensure_sync
 from authlib.common.security import generate_token
 from authlib.oauth2.rfc6749 import InvalidScopeError
 from authlib.oauth2.rfc6749.grants.authorization_code import (
@@ -75,7 +76,7 @@ class OpenIDHybridGrant(OpenIDImplicitGrant):
         response_types = self.request.response_type.split()
         if 'token' in response_types:
             log.debug('Grant token %r to %r', token, client)
-            self.server.save_token(token, self.request)
+            ensure_sync(self.server.save_token(token, self.request), 'save_token')
             if 'id_token' in response_types:
                 token = self.process_implicit_token(token, code)
         else:
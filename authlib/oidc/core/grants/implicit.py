@@ -1,4 +1,5 @@
 import logging
+from authlib.common.async_helpers import ensure_sync
 from authlib.oauth2.rfc6749 import (
     OAuth2Error,
     InvalidScopeError,
@@ -132,7 +133,7 @@ class OpenIDImplicitGrant(ImplicitGrant):
             token = self.process_implicit_token(token)
         else:
             log.debug('Grant token %r to %r', token, client)
-            self.server.save_token(token, self.request)
+            ensure_sync(self.server.save_token(token, self.request), 'save_token')
             token = self.process_implicit_token(token)
         params = [(k, token[k]) for k in token]
         return params
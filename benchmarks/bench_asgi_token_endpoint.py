@@ -0,0 +1,129 @@
+"""
+    Benchmark of the token endpoint in an asyncio event loop, with a
+    simulated database latency in ``query_client`` and ``save_token``. It
+    compares ``async_create_token_response`` with async model methods,
+    against ``create_token_response`` called in a thread pool of 40 workers,
+    which is how Starlette runs a sync endpoint.
+
+    Run with::
+
+        $ python benchmarks/bench_asgi_token_endpoint.py
+"""
+import os
+import sys
+import time
+import asyncio
+import base64
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.oauth2.rfc6749 import (  # noqa: E402
+    AuthorizationServer, OAuth2Request, ClientMixin, grants,
+)
+
+AUTHORIZATION = 'Basic ' + base64.b64encode(b'client:secret').decode('ascii')
+#: seconds of a database query
+LATENCY = 0.002
+
+
+class Client(ClientMixin):
+    def get_client_id(self):
+        return 'client'
+
+    def get_allowed_scope(self, scope):
+        return scope
+
+    def check_client_secret(self, client_secret):
+        return client_secret == 'secret'
+
+    def check_endpoint_auth_method(self, method, endpoint):
+        return method == 'client_secret_basic'
+
+    def check_grant_type(self, grant_type):
+        return True
+
+
+class Server(AuthorizationServer):
+    client = Client()
+
+    def __init__(self):
+        super(Server, self).__init__()
+        self.register_grant(grants.ClientCredentialsGrant)
+        self.register_token_generator('default', lambda **kwargs: {
+            'token_type': 'Bearer', 'access_token': 'a', 'expires_in': 3600,
+        })
+
+    def query_client(self, client_id):
+        time.sleep(LATENCY)
+        return self.client
+
+    def save_token(self, token, request):
+        time.sleep(LATENCY)
+
+    def send_signal(self, name, *args, **kwargs):
+        pass
+
+    def create_oauth2_request(self, request):
+        return request
+
+    def handle_response(self, status, body, headers):
+        return status
+
+
+class AsyncServer(Server):
+    async def query_client(self, client_id):
+        await asyncio.sleep(LATENCY)
+        return self.client
+
+    async def save_token(self, token, request):
+        await asyncio.sleep(LATENCY)
+
+
+def create_request():
+    return OAuth2Request(
+        'POST', 'https://server.test/token',
+        body={'grant_type': 'client_credentials'},
+        headers={'Authorization': AUTHORIZATION},
+    )
+
+
+async def run_requests(handle, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request():
+        async with semaphore:
+            assert await handle(create_request()) == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*[request() for _ in range(total)])
+    return total / (time.perf_counter() - start)
+
+
+async def bench_threaded(total, concurrency):
+    server = Server()
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=40) as executor:
+        async def handle(request):
+            return await loop.run_in_executor(
+                executor, server.create_token_response, request)
+        return await run_requests(handle, total, concurrency)
+
+
+async def bench_async(total, concurrency):
+    server = AsyncServer()
+    return await run_requests(server.async_create_token_response, total, concurrency)
+
+
+def main(total=2000):
+    header = ('concurrency', 'threads req/s', 'async req/s', 'speedup')
+    print('{:<12}{:>16}{:>16}{:>10}'.format(*header))
+    for concurrency in (1, 10, 100, 500):
+        threaded = asyncio.run(bench_threaded(total, concurrency))
+        native = asyncio.run(bench_async(total, concurrency))
+        print('{:<12}{:>16.0f}{:>16.0f}{:>9.1f}x'.format(
+            concurrency, threaded, native, native / threaded))
+
+
+if __name__ == '__main__':
+    main()
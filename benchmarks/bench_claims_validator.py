@@ -0,0 +1,89 @@
+"""
+    Benchmark of claims validation with a dict ``options`` against a
+    precompiled ``ClaimsValidator``, reporting time and peak allocated bytes per
+    validation.
+
+    Run with::
+
+        $ python benchmarks/bench_claims_validator.py
+"""
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.jose import JWTClaims, ClaimsValidator  # noqa: E402
+from authlib.oidc.core import CodeIDToken  # noqa: E402
+
+
+def get_cases():
+    now = int(time.time())
+    payload = {
+        'iss': 'https://example.com',
+        'sub': '123',
+        'aud': ['client-a', 'client-b'],
+        'exp': now + 3600,
+        'iat': now,
+        'acr': 'urn:mace:incommon:iap:silver',
+        'tenant': 't-42',
+    }
+    options = {
+        'iss': {'essential': True, 'values': ['https://example.org', 'https://example.com']},
+        'sub': {'essential': True},
+        'aud': {'essential': True, 'values': ['client-%d' % i for i in range(20)] + ['client-b']},
+        'exp': {'essential': True},
+        'acr': {'values': ['urn:mace:incommon:iap:bronze', 'urn:mace:incommon:iap:silver']},
+        'tenant': {'essential': True, 'values': ['t-%d' % i for i in range(50)]},
+    }
+    return [
+        ('JWTClaims', JWTClaims, payload, options),
+        ('CodeIDToken', CodeIDToken, payload, options),
+    ]
+
+
+def bench(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=3))
+
+
+def peak_allocated(func, number):
+    func()
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(number):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - base
+    finally:
+        tracemalloc.stop()
+    return total / number
+
+
+def main(number=20000):
+    print('{:<14}{:>14}{:>14}{:>10}{:>12}{:>12}'.format(
+        'claims', 'dict ops/s', 'compiled', 'speedup', 'dict bytes', 'compiled'))
+    for name, claims_cls, payload, options in get_cases():
+        validator = ClaimsValidator(options)
+
+        def validate_dict():
+            claims_cls(payload, {}, options).validate()
+
+        def validate_compiled():
+            claims_cls(payload, {}, validator).validate()
+
+        dict_ops = bench(validate_dict, number)
+        compiled_ops = bench(validate_compiled, number)
+        dict_alloc = peak_allocated(validate_dict, 1000)
+        compiled_alloc = peak_allocated(validate_compiled, 1000)
+        print('{:<14}{:>14.0f}{:>14.0f}{:>9.2f}x{:>12.0f}{:>12.0f}'.format(
+            name, dict_ops, compiled_ops, compiled_ops / dict_ops,
+            dict_alloc, compiled_alloc))
+
+
+if __name__ == '__main__':
+    main()
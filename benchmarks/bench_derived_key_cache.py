@@ -0,0 +1,60 @@
+"""
+    Benchmark of ECDH-ES and ECDH-1PU decryption with and without the
+    ``DerivedKeyCache``, decrypting a burst of identical tokens.
+
+    Run with::
+
+        $ python benchmarks/bench_derived_key_cache.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.jose import JsonWebEncryption, ECKey, OKPKey  # noqa: E402
+from authlib.jose.drafts import register_jwe_draft  # noqa: E402
+from authlib.jose.rfc7518 import DerivedKeyCache, set_derived_key_cache  # noqa: E402
+
+register_jwe_draft(JsonWebEncryption)
+
+
+def get_cases():
+    p256 = ECKey.generate_key('P-256', {'kid': 'p256'}, is_private=True)
+    x25519 = OKPKey.generate_key('X25519', {'kid': 'x25519'}, is_private=True)
+    sender = OKPKey.generate_key('X25519', {'kid': 'sender'}, is_private=True)
+    return [
+        ('ECDH-ES', 'P-256', p256, None),
+        ('ECDH-ES', 'X25519', x25519, None),
+        ('ECDH-ES+A128KW', 'P-256', p256, None),
+        ('ECDH-1PU', 'X25519', x25519, sender),
+        ('ECDH-1PU+A128KW', 'X25519', x25519, sender),
+    ]
+
+
+def bench(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main(number=2000):
+    jwe = JsonWebEncryption()
+    print('{:<18}{:<8}{:>16}{:>16}{:>10}'.format(
+        'alg', 'crv', 'no cache ops/s', 'cache ops/s', 'speedup'))
+    for alg, crv, key, sender_key in get_cases():
+        protected = {'alg': alg, 'enc': 'A128CBC-HS256'}
+        s = jwe.serialize_compact(protected, b'hello', key, sender_key=sender_key)
+
+        def decrypt():
+            jwe.deserialize_compact(s, key, sender_key=sender_key)
+
+        set_derived_key_cache(None)
+        no_cache_ops = bench(decrypt, number)
+        set_derived_key_cache(DerivedKeyCache())
+        cache_ops = bench(decrypt, number)
+        set_derived_key_cache(None)
+        print('{:<18}{:<8}{:>16.0f}{:>16.0f}{:>9.2f}x'.format(
+            alg, crv, no_cache_ops, cache_ops, cache_ops / no_cache_ops))
+
+
+if __name__ == '__main__':
+    main()
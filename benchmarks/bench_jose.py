@@ -0,0 +1,296 @@
+"""
+    Benchmark suite of the JOSE stack, runs offline and reports ops/s and
+    peak allocated bytes per operation of:
+
+    - sign and verify of every JWS algorithm
+    - encrypt and decrypt of every JWE alg/enc pair, including drafts
+    - key import from PEM, JWK and SSH
+    - ``KeySet.find_by_kid`` with 10, 1k and 10k keys
+    - ``JWTClaims.validate``
+
+    The results are saved as JSON, which can be compared with the results
+    of another commit.
+
+    Run with::
+
+        $ python benchmarks/bench_jose.py -o before.json
+        $ git checkout feature-branch
+        $ python benchmarks/bench_jose.py -o after.json --compare before.json
+
+    Pass ``-k`` to run only the benchmarks whose name contains the value,
+    e.g. ``-k jws. -k jwk.import``.
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+import subprocess
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cryptography  # noqa: E402
+from authlib import __version__  # noqa: E402
+from authlib.jose import (  # noqa: E402
+    JsonWebSignature, JsonWebEncryption, JsonWebKey, KeySet,
+    JWTClaims, OctKey, RSAKey, ECKey, OKPKey,
+)
+from authlib.jose.drafts import register_jwe_draft  # noqa: E402
+
+# newer APIs are optional, so that older commits can be compared
+try:
+    from authlib.jose import ClaimsValidator  # noqa: E402
+except ImportError:
+    ClaimsValidator = None
+
+register_jwe_draft(JsonWebEncryption)
+
+MESSAGE = b'eyJhbGciOiJSUzI1NiIsInR5cCI6IkpXVCJ9.' + b'a' * 300
+PAYLOAD = b'{"iss":"https://example.com","sub":"123","aud":"client","exp":1700000000}'
+
+
+def read_file(name):
+    with open(os.path.join(ROOT, 'tests', 'files', name), 'r') as f:
+        return f.read()
+
+
+def iter_jws_cases():
+    rsa_key = RSAKey.generate_key(2048, is_private=True)
+    keys = {
+        'none': None,
+        'HS256': OctKey.generate_key(256, is_private=True),
+        'HS384': OctKey.generate_key(384, is_private=True),
+        'HS512': OctKey.generate_key(512, is_private=True),
+        'ES256': ECKey.generate_key('P-256', is_private=True),
+        'ES384': ECKey.generate_key('P-384', is_private=True),
+        'ES512': ECKey.generate_key('P-521', is_private=True),
+        'ES256K': ECKey.generate_key('secp256k1', is_private=True),
+        'EdDSA': OKPKey.generate_key('Ed25519', is_private=True),
+    }
+    for name, algorithm in JsonWebSignature.ALGORITHMS_REGISTRY.items():
+        key = keys.get(name, rsa_key)
+        key = algorithm.prepare_key(key)
+        sig = algorithm.sign(MESSAGE, key)
+        yield 'jws.sign.' + name, lambda a=algorithm, k=key: a.sign(MESSAGE, k)
+        yield 'jws.verify.' + name, lambda a=algorithm, k=key, s=sig: a.verify(MESSAGE, s, k)
+
+
+def get_jwe_keys(alg, enc):
+    if alg.name.startswith('RSA'):
+        return RSAKey.import_key(read_file('rsa_private.pem')), None
+    if alg.name == 'dir':
+        return OctKey.generate_key(enc.CEK_SIZE, is_private=True), None
+    if alg.name.startswith('ECDH-ES'):
+        return ECKey.generate_key('P-256', is_private=True), None
+    if alg.name.startswith('ECDH-1PU'):
+        sender_key = OKPKey.generate_key('X25519', is_private=True)
+        return OKPKey.generate_key('X25519', is_private=True), sender_key
+    return OctKey.generate_key(alg.key_size, is_private=True), None
+
+
+def iter_jwe_cases():
+    jwe = JsonWebEncryption()
+    for alg_name, alg in JsonWebEncryption.ALG_REGISTRY.items():
+        for enc_name, enc in JsonWebEncryption.ENC_REGISTRY.items():
+            name = '{}.{}'.format(alg_name, enc_name)
+            protected = {'alg': alg_name, 'enc': enc_name}
+            key, sender_key = get_jwe_keys(alg, enc)
+            try:
+                s = jwe.serialize_compact(protected, PAYLOAD, key, sender_key=sender_key)
+            except Exception as e:
+                yield 'jwe.encrypt.' + name, e
+                continue
+
+            def encrypt(p=protected, k=key, sk=sender_key):
+                jwe.serialize_compact(p, PAYLOAD, k, sender_key=sk)
+
+            def decrypt(s=s, k=key, sk=sender_key):
+                jwe.deserialize_compact(s, k, sender_key=sk)
+
+            yield 'jwe.encrypt.' + name, encrypt
+            yield 'jwe.decrypt.' + name, decrypt
+
+
+def iter_import_cases():
+    rsa_key = RSAKey.import_key(read_file('rsa_private.pem'))
+    ec_key = ECKey.generate_key('P-256', is_private=True)
+    okp_key = OKPKey.generate_key('Ed25519', is_private=True)
+    oct_key = OctKey.generate_key(256, is_private=True)
+    cases = [
+        ('pem.RSA.private', read_file('rsa_private.pem'), 'RSA', 'sign'),
+        ('pem.RSA.public', read_file('rsa_public.pem'), 'RSA', 'verify'),
+        ('pem.EC.private', read_file('secp256k1-private.pem'), 'EC', 'sign'),
+        ('pem.EC.public', read_file('secp256k1-pub.pem'), 'EC', 'verify'),
+        ('pem.OKP.private', read_file('ed25519-pkcs8.pem'), 'OKP', 'sign'),
+        ('pem.OKP.public', read_file('ed25519-pub.pem'), 'OKP', 'verify'),
+        ('jwk.RSA.private', rsa_key.as_dict(is_private=True), None, 'sign'),
+        ('jwk.RSA.public', rsa_key.as_dict(), None, 'verify'),
+        ('jwk.EC.private', ec_key.as_dict(is_private=True), None, 'sign'),
+        ('jwk.EC.public', ec_key.as_dict(), None, 'verify'),
+        ('jwk.OKP.private', okp_key.as_dict(is_private=True), None, 'sign'),
+        ('jwk.OKP.public', okp_key.as_dict(), None, 'verify'),
+        ('jwk.oct', oct_key.as_dict(is_private=True), None, 'sign'),
+        ('ssh.RSA', read_file('ssh_public.pem'), 'RSA', 'verify'),
+        ('ssh.OKP', read_file('ed25519-ssh.pub'), 'OKP', 'verify'),
+    ]
+    for name, raw, kty, op in cases:
+        options = {'kty': kty} if kty else None
+        # JWK dicts are loaded on first use, get_op_key loads the key
+        yield 'jwk.import.' + name, \
+            lambda r=raw, o=options, op=op: JsonWebKey.import_key(r, o).get_op_key(op)
+
+
+def iter_key_set_cases():
+    for count in (10, 1000, 10000):
+        keys = [
+            OctKey.import_key({'kty': 'oct', 'k': 'c2VjcmV0LQ', 'kid': 'k-{}'.format(i)})
+            for i in range(count)
+        ]
+        key_set = KeySet(keys)
+        kid = 'k-{}'.format(count - 1)
+        yield 'keyset.find_by_kid.{}'.format(count), lambda ks=key_set, kid=kid: ks.find_by_kid(kid)
+
+
+def iter_claims_cases():
+    now = int(time.time())
+    payload = {
+        'iss': 'https://example.com',
+        'sub': '123',
+        'aud': ['client-a', 'client-b'],
+        'exp': now + 3600,
+        'nbf': now - 10,
+        'iat': now,
+        'jti': 'abc',
+    }
+    options = {
+        'iss': {'essential': True, 'values': ['https://example.org', 'https://example.com']},
+        'sub': {'essential': True},
+        'aud': {'essential': True, 'values': ['client-b']},
+        'exp': {'essential': True},
+        'jti': {'validate': lambda claims, value: True},
+    }
+    header = {'alg': 'RS256'}
+    yield 'jwt.claims.validate', lambda: JWTClaims(payload, header, options).validate(now)
+    if ClaimsValidator is not None:
+        validator = ClaimsValidator(options)
+        yield 'jwt.claims.validate.compiled', \
+            lambda: JWTClaims(payload, header, validator).validate(now)
+
+
+SUITES = [
+    iter_jws_cases,
+    iter_jwe_cases,
+    iter_import_cases,
+    iter_key_set_cases,
+    iter_claims_cases,
+]
+
+
+def measure_ops(func, min_time):
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= min_time / 5:
+            break
+        number *= 10 if elapsed < min_time / 50 else 2
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return number / best
+
+
+def measure_peak_bytes(func, number=5):
+    results = []
+    tracemalloc.start()
+    try:
+        for _ in range(number):
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            else:
+                # Python < 3.9 has no reset_peak, restart tracing instead
+                tracemalloc.stop()
+                tracemalloc.start()
+            base, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            results.append(peak - base)
+    finally:
+        tracemalloc.stop()
+    results.sort()
+    return results[len(results) // 2]
+
+
+def get_meta():
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'authlib': __version__,
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'cryptography': cryptography.__version__,
+        'platform': platform.platform(),
+        'time': int(time.time()),
+    }
+
+
+def run(filters=None, min_time=0.2):
+    results = {}
+    for suite in SUITES:
+        for name, func in suite():
+            if filters and not any(f in name for f in filters):
+                continue
+            if isinstance(func, Exception):
+                results[name] = {'skipped': str(func)}
+                print('{:<48} skipped: {}'.format(name, func), file=sys.stderr)
+                continue
+            func()
+            ops = measure_ops(func, min_time)
+            peak = measure_peak_bytes(func)
+            results[name] = {'ops_per_sec': round(ops, 1), 'peak_bytes': peak}
+            print('{:<48}{:>14.1f} ops/s{:>12} B'.format(name, ops, peak), file=sys.stderr)
+    return {'meta': get_meta(), 'results': results}
+
+
+def compare(data, base):
+    print('{:<48}{:>14}{:>14}{:>10}'.format('name', 'base ops/s', 'ops/s', 'change'))
+    base_results = base['results']
+    for name, result in data['results'].items():
+        base_result = base_results.get(name)
+        if not base_result or 'ops_per_sec' not in result or 'ops_per_sec' not in base_result:
+            continue
+        old, new = base_result['ops_per_sec'], result['ops_per_sec']
+        print('{:<48}{:>14.1f}{:>14.1f}{:>+9.1f}%'.format(
+            name, old, new, (new - old) / old * 100))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark suite of authlib.jose')
+    parser.add_argument('-o', '--output', help='save the JSON results into this file')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare with')
+    parser.add_argument('-k', dest='filters', action='append',
+                        help='only run benchmarks whose name contains this value')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='min seconds to measure each benchmark')
+    args = parser.parse_args(argv)
+
+    data = run(args.filters, args.min_time)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(data, indent=2, sort_keys=True))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(data, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+    Benchmark of ``JsonWebEncryption.serialize_compact`` against the
+    streaming ``serialize_compact_stream`` and ``deserialize_compact_stream``,
+    reporting time and peak traced memory.
+
+    Run with::
+
+        $ python benchmarks/bench_jwe_stream.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.jose import JsonWebEncryption  # noqa: E402
+
+CHUNK = os.urandom(64 * 1024)
+
+
+def generate_payload(size):
+    for _ in range(size // len(CHUNK)):
+        yield CHUNK
+
+
+def measure(func):
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes=(8, 32)):
+    jwe = JsonWebEncryption()
+    key = os.urandom(32)
+    print('{:<6}{:<16}{:<14}{:>10}{:>16}'.format('MiB', 'enc', 'mode', 'time (s)', 'peak (MiB)'))
+    for size in sizes:
+        size = size * 1024 * 1024
+        for enc in ('A128CBC-HS256', 'A256GCM'):
+            protected = {'alg': 'A256KW', 'enc': enc}
+            encrypted = b''.join(jwe.serialize_compact_stream(
+                dict(protected), generate_payload(size), key))
+
+            def encrypt():
+                jwe.serialize_compact(dict(protected), b''.join(generate_payload(size)), key)
+
+            def encrypt_stream():
+                for _ in jwe.serialize_compact_stream(dict(protected), generate_payload(size), key):
+                    pass
+
+            def decrypt():
+                jwe.deserialize_compact(encrypted, key)
+
+            def decrypt_stream():
+                rv = jwe.deserialize_compact_stream(iter([encrypted]), key)
+                for _ in rv['payload']:
+                    pass
+
+            cases = [
+                ('encrypt', encrypt),
+                ('encrypt stream', encrypt_stream),
+                ('decrypt', decrypt),
+                ('decrypt stream', decrypt_stream),
+            ]
+            for mode, func in cases:
+                elapsed, peak = measure(func)
+                print('{:<6}{:<16}{:<14}{:>10.3f}{:>16.1f}'.format(
+                    size // 1048576, enc, mode, elapsed, peak / 1048576))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+    Benchmark of ``JsonWebSignature.serialize_compact`` against the
+    streaming ``serialize_detached`` and ``deserialize_detached`` with
+    encoded and unencoded (RFC7797) payloads, reporting time and peak
+    traced memory.
+
+    Run with::
+
+        $ python benchmarks/bench_jws_detached.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.jose import JsonWebSignature, RSAKey  # noqa: E402
+
+CHUNK = os.urandom(64 * 1024)
+
+
+def generate_payload(size):
+    for _ in range(size // len(CHUNK)):
+        yield CHUNK
+
+
+def measure(func):
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes=(8, 32)):
+    jws = JsonWebSignature()
+    keys = {
+        'HS256': 'secret',
+        'RS256': RSAKey.generate_key(2048, is_private=True),
+    }
+    print('{:<8}{:>6}  {:<32}{:>10}{:>14}'.format('alg', 'MiB', 'operation', 'ms', 'peak MiB'))
+    for alg, key in keys.items():
+        for mb in sizes:
+            size = mb * 1024 * 1024
+            encoded = {'alg': alg}
+            unencoded = {'alg': alg, 'b64': False, 'crit': ['b64']}
+            s1 = jws.serialize_detached(encoded, generate_payload(size), key)
+            s2 = jws.serialize_detached(unencoded, generate_payload(size), key)
+            cases = [
+                ('serialize_compact', lambda: jws.serialize_compact(
+                    encoded, b''.join(generate_payload(size)), key)),
+                ('serialize_detached b64', lambda: jws.serialize_detached(
+                    encoded, generate_payload(size), key)),
+                ('serialize_detached unencoded', lambda: jws.serialize_detached(
+                    unencoded, generate_payload(size), key)),
+                ('deserialize_detached b64', lambda: jws.deserialize_detached(
+                    s1, generate_payload(size), key)),
+                ('deserialize_detached unencoded', lambda: jws.deserialize_detached(
+                    s2, generate_payload(size), key)),
+            ]
+            for name, func in cases:
+                elapsed, peak = measure(func)
+                print('{:<8}{:>6}  {:<32}{:>10.1f}{:>14.2f}'.format(
+                    alg, mb, name, elapsed * 1000, peak / 1024 / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+    Benchmark of ``JsonWebToken.decode`` against a compiled ``JWTVerifier``.
+
+    Run with::
+
+        $ python benchmarks/bench_jwt_verifier.py
+"""
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.jose import JsonWebKey, jwt  # noqa: E402
+
+
+def get_cases():
+    rsa_key = JsonWebKey.generate_key('RSA', 2048, is_private=True)
+    ec_key = JsonWebKey.generate_key('EC', 'P-256', is_private=True)
+    return [
+        ('HS256', b'secret', b'secret'),
+        ('RS256', rsa_key.as_pem(is_private=True), rsa_key.as_pem()),
+        ('ES256', ec_key.as_pem(is_private=True), ec_key.as_pem()),
+    ]
+
+
+def bench(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main(number=2000):
+    payload = {'iss': 'https://example.com', 'sub': '123', 'exp': int(time.time()) + 3600}
+    print('{:<8}{:>16}{:>16}{:>10}'.format('alg', 'decode ops/s', 'verify ops/s', 'speedup'))
+    for alg, private_key, public_key in get_cases():
+        s = jwt.encode({'alg': alg}, payload, private_key)
+        verifier = jwt.compile_verifier(public_key, [alg])
+
+        def decode():
+            jwt.decode(s, public_key).validate()
+
+        def verify():
+            verifier.verify(s)
+
+        decode_ops = bench(decode, number)
+        verify_ops = bench(verify, number)
+        print('{:<8}{:>16.0f}{:>16.0f}{:>9.2f}x'.format(
+            alg, decode_ops, verify_ops, verify_ops / decode_ops))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+    Benchmark of importing large JWK sets eagerly with ``KeySet`` against
+    ``LazyKeySet``, reporting startup time, resident memory and the time
+    of the first lookups.
+
+    Run with::
+
+        $ python benchmarks/bench_lazy_key_set.py
+        $ python benchmarks/bench_lazy_key_set.py --private
+
+    With ``--private``, the key set contains RSA private keys without CRT
+    parameters, which are slow to import eagerly.
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from authlib.jose import JsonWebKey  # noqa: E402
+
+LOOKUPS = 100
+
+
+def create_key_set(size, private):
+    if private:
+        key_size = 1024
+    else:
+        key_size = 2048
+    templates = []
+    for _ in range(8):
+        key = JsonWebKey.generate_key('RSA', key_size, is_private=private)
+        data = key.as_dict(is_private=private)
+        for k in ('p', 'q', 'dp', 'dq', 'qi'):
+            data.pop(k, None)
+        templates.append(data)
+
+    keys = []
+    for i in range(size):
+        data = dict(templates[i % len(templates)])
+        data['kid'] = 'key-{}'.format(i)
+        keys.append(data)
+    return {'keys': keys}
+
+
+def get_rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def run_child(path, mode):
+    with open(path) as f:
+        data = json.load(f)
+    kids = [k['kid'] for k in data['keys']]
+    random.seed(0)
+    lookups = [random.choice(kids) for _ in range(LOOKUPS)]
+
+    rss = get_rss()
+    start = time.perf_counter()
+    key_set = JsonWebKey.import_key_set(data, lazy=mode == 'lazy')
+    startup = time.perf_counter() - start
+    memory = get_rss() - rss
+
+    start = time.perf_counter()
+    for kid in lookups:
+        key_set.find_by_kid(kid).get_op_key('verify')
+    lookup = time.perf_counter() - start
+    print(json.dumps({'startup': startup, 'memory': memory, 'lookup': lookup}))
+
+
+def measure(path, mode):
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), '--child', path, mode])
+    return json.loads(output)
+
+
+def main(sizes=(1000, 10000), private=False):
+    print('{:<8}{:<7}{:>14}{:>14}{:>24}'.format(
+        'keys', 'mode', 'startup (s)', 'RSS (MiB)', 'first {} lookups (s)'.format(LOOKUPS)))
+    for size in sizes:
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump(create_key_set(size, private), f)
+        try:
+            for mode in ('eager', 'lazy'):
+                rv = measure(f.name, mode)
+                print('{:<8}{:<7}{:>14.3f}{:>14.1f}{:>24.3f}'.format(
+                    size, mode, rv['startup'], rv['memory'] / 1048576, rv['lookup']))
+        finally:
+            os.unlink(f.name)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3])
+    elif '--private' in sys.argv:
+        main(sizes=(1000,), private=True)
+    else:
+        main()
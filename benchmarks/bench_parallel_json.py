@@ -0,0 +1,69 @@
+"""
+    Benchmark of JWS JSON serialization with many signatures and JWE JSON
+    serialization with many recipients, serially and with a thread pool
+    ``executor``. The speedup depends on the number of CPU cores.
+
+    Run with::
+
+        $ python benchmarks/bench_parallel_json.py [count]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.jose import JsonWebSignature, JsonWebEncryption, RSAKey  # noqa: E402
+
+
+def timeit(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main(count=32):
+    keys = {str(i): RSAKey.generate_key(2048, {'kid': str(i)}, is_private=True)
+            for i in range(count)}
+
+    def load_key(header, payload):
+        return keys[header['kid']]
+
+    jws = JsonWebSignature()
+    jws_header = [{'protected': {'alg': 'RS256', 'kid': kid}} for kid in keys]
+    jws_data = jws.serialize_json(jws_header, b'hello', load_key)
+
+    jwe = JsonWebEncryption()
+    jwe_header = {
+        'protected': {'alg': 'RSA-OAEP', 'enc': 'A128GCM'},
+        'recipients': [{'header': {'kid': kid}} for kid in keys],
+    }
+    public_keys = [k.get_public_key() for k in keys.values()]
+
+    workers = os.cpu_count() or 1
+    print('{} signatures/recipients, {} workers'.format(count, workers))
+    print('{:<28}{:>12}{:>12}{:>10}'.format('operation', 'serial ms', 'pool ms', 'speedup'))
+    with ThreadPoolExecutor(workers) as executor:
+        cases = [
+            ('JWS serialize_json RS256',
+             lambda ex: jws.serialize_json(jws_header, b'hello', load_key, executor=ex)),
+            ('JWS deserialize_json RS256',
+             lambda ex: jws.deserialize_json(jws_data, load_key, executor=ex)),
+            ('JWE serialize_json RSA-OAEP',
+             lambda ex: jwe.serialize_json(jwe_header, b'hello', list(public_keys), executor=ex)),
+        ]
+        for name, func in cases:
+            serial = timeit(lambda: func(None))
+            pooled = timeit(lambda: func(executor))
+            print('{:<28}{:>12.2f}{:>12.2f}{:>9.2f}x'.format(
+                name, serial * 1000, pooled * 1000, serial / pooled))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,58 @@
+"""
+    Benchmark of JWS algorithms signing and verifying with a key on every
+    call, and with the signer and verifier of ``JWSAlgorithm.prepare``.
+
+    Run with::
+
+        $ python benchmarks/bench_prepared_jws.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.jose import JsonWebSignature, OctKey, RSAKey, ECKey, OKPKey  # noqa: E402
+
+
+def get_keys():
+    rsa_key = RSAKey.generate_key(2048, is_private=True)
+    return {
+        'HS256': OctKey.generate_key(256, is_private=True),
+        'RS256': rsa_key,
+        'PS256': rsa_key,
+        'ES256': ECKey.generate_key('P-256', is_private=True),
+        'EdDSA': OKPKey.generate_key('Ed25519', is_private=True),
+    }
+
+
+def bench(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main(number=2000):
+    msg = b'eyJhbGciOiJSUzI1NiJ9.' + b'a' * 200
+    registry = JsonWebSignature.ALGORITHMS_REGISTRY
+    print('{:<8}{:<8}{:>14}{:>16}{:>10}'.format(
+        'alg', 'op', 'key ops/s', 'prepared ops/s', 'speedup'))
+    for name, key in get_keys().items():
+        algorithm = registry[name]
+        signer = algorithm.prepare(key, 'sign')
+        verifier = algorithm.prepare(key, 'verify')
+        sig = signer.sign(msg)
+        cases = [
+            ('sign', lambda: algorithm.sign(msg, key), lambda: signer.sign(msg)),
+            ('verify', lambda: algorithm.verify(msg, sig, key), lambda: verifier.verify(msg, sig)),
+        ]
+        n = number * 20 if name == 'HS256' else number
+        for op, func, prepared_func in cases:
+            if name.startswith(('RS', 'PS')) and op == 'sign':
+                n = number // 10
+            ops = bench(func, n)
+            prepared_ops = bench(prepared_func, n)
+            print('{:<8}{:<8}{:>14.0f}{:>16.0f}{:>9.2f}x'.format(
+                name, op, ops, prepared_ops, prepared_ops / ops))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+    Benchmark of ``TokenValidator.scope_insufficient`` with compiled scopes,
+    against the set based check of each call.
+
+    Run with::
+
+        $ python benchmarks/bench_scope_matcher.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.oauth2.rfc6749 import scope_to_list  # noqa: E402
+from authlib.oauth2.rfc6749.util import compile_scopes, scope_insufficient  # noqa: E402
+
+
+def set_scope_insufficient(token_scopes, required_scopes):
+    if not required_scopes:
+        return False
+    token_scopes = scope_to_list(token_scopes)
+    if not token_scopes:
+        return True
+    token_scopes = set(token_scopes)
+    for scope in required_scopes:
+        if token_scopes.issuperset(set(scope_to_list(scope))):
+            return False
+    return True
+
+
+CASES = [
+    ('one scope', 'openid profile email', ['profile']),
+    ('and', 'openid profile email address phone', ['profile email']),
+    ('or, last', 'openid admin', ['profile email', 'user', 'write', 'admin']),
+    ('denied', 'openid profile', ['profile email', 'user', 'admin']),
+]
+
+
+def bench(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=5))
+
+
+def main(number=200000):
+    print('{:<12}{:>16}{:>16}{:>10}'.format('case', 'sets ops/s', 'masks ops/s', 'speedup'))
+    for name, token_scope, required in CASES:
+        compiled = compile_scopes(required)
+        assert set_scope_insufficient(token_scope, required) == \
+            scope_insufficient(token_scope, compiled)
+        old = bench(lambda: set_scope_insufficient(token_scope, required), number)
+        new = bench(lambda: scope_insufficient(token_scope, compiled), number)
+        print('{:<12}{:>16.0f}{:>16.0f}{:>9.1f}x'.format(name, old, new, new / old))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+    Benchmark of the token endpoint throughput of ``AuthorizationServer``,
+    with many registered grants and grant extensions. It measures the grant
+    dispatch alone, and a full ``client_credentials`` token response.
+
+    Run with::
+
+        $ python benchmarks/bench_token_endpoint.py
+"""
+import os
+import sys
+import base64
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.oauth2.rfc6749 import (  # noqa: E402
+    AuthorizationServer, OAuth2Request, ClientMixin, grants,
+)
+from authlib.oauth2.rfc7636 import CodeChallenge  # noqa: E402
+from authlib.oidc.core import OpenIDCode  # noqa: E402
+
+AUTHORIZATION = 'Basic ' + base64.b64encode(b'client:secret').decode('ascii')
+
+
+class Client(ClientMixin):
+    def get_client_id(self):
+        return 'client'
+
+    def get_allowed_scope(self, scope):
+        return scope
+
+    def check_client_secret(self, client_secret):
+        return client_secret == 'secret'
+
+    def check_endpoint_auth_method(self, method, endpoint):
+        return method == 'client_secret_basic'
+
+    def check_grant_type(self, grant_type):
+        return True
+
+
+class Server(AuthorizationServer):
+    client = Client()
+
+    def query_client(self, client_id):
+        return self.client
+
+    def save_token(self, token, request):
+        pass
+
+    def send_signal(self, name, *args, **kwargs):
+        pass
+
+    def create_oauth2_request(self, request):
+        return request
+
+    def handle_response(self, status, body, headers):
+        return status, body, headers
+
+
+def create_server(count):
+    server = Server()
+    server.register_token_generator('default', lambda **kwargs: {
+        'token_type': 'Bearer', 'access_token': 'a', 'expires_in': 3600,
+    })
+    for i in range(count):
+        grant_cls = type('Grant{}'.format(i), (grants.ClientCredentialsGrant,), {
+            'GRANT_TYPE': 'urn:example:grant-{}'.format(i),
+        })
+        server.register_grant(grant_cls, [CodeChallenge(required=False)])
+    server.register_grant(grants.AuthorizationCodeGrant, [
+        CodeChallenge(required=False), OpenIDCode(),
+    ])
+    server.register_grant(grants.ClientCredentialsGrant, [CodeChallenge(required=False)])
+    return server
+
+
+def create_request():
+    return OAuth2Request(
+        'POST', 'https://server.test/token',
+        body={'grant_type': 'client_credentials'},
+        headers={'Authorization': AUTHORIZATION},
+    )
+
+
+def bench(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=5))
+
+
+def main(number=20000):
+    request = create_request()
+    print('{:<8}{:>20}{:>20}'.format('grants', 'get_token_grant/s', 'token response/s'))
+    for count in (0, 10, 50):
+        server = create_server(count)
+        assert server.create_token_response(create_request())[0] == 200
+        dispatch = bench(lambda: server.get_token_grant(request), number)
+        response = bench(lambda: server.create_token_response(create_request()), number // 4)
+        print('{:<8}{:>20.0f}{:>20.0f}'.format(count + 2, dispatch, response))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+    Benchmark of saving issued tokens with one commit per token, against
+    ``TokenSink`` batches in ``flush`` and ``async`` modes. The database is
+    simulated: a commit takes 1ms plus 10us per row, and commits are
+    serialized like the writes of one table.
+
+    Run with::
+
+        $ python benchmarks/bench_token_sink.py
+"""
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.oauth2.rfc6749 import TokenSink  # noqa: E402
+
+COMMIT_LATENCY = 0.001
+ROW_LATENCY = 0.00001
+
+
+class Database(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = 0
+
+    def save_tokens(self, items):
+        with self.lock:
+            time.sleep(COMMIT_LATENCY + ROW_LATENCY * len(items))
+            self.rows += len(items)
+
+    def save_token(self, item):
+        self.save_tokens([item])
+
+
+def bench(save_token, total, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(save_token, range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main(total=2000):
+    header = ('threads', 'commit/s', 'flush/s', 'async/s', 'flush batch')
+    print('{:<8}{:>12}{:>12}{:>12}{:>14}'.format(*header))
+    for threads in (1, 8, 32, 128):
+        db = Database()
+        one = bench(db.save_token, total, threads)
+
+        db = Database()
+        sink = TokenSink(db.save_tokens, batch_size=200)
+        flush = bench(sink.put, total, threads)
+        mean_batch = sink.stats()['mean_batch']
+        assert db.rows == total
+
+        db = Database()
+        sink = TokenSink(db.save_tokens, batch_size=200, flush_interval=0.005, durability='async')
+        start = time.perf_counter()
+        bench(sink.put, total, threads)
+        sink.close()
+        background = total / (time.perf_counter() - start)
+        assert db.rows == total
+
+        print('{:<8}{:>12.0f}{:>12.0f}{:>12.0f}{:>14.1f}'.format(
+            threads, one, flush, background, mean_batch))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,418 @@
+import time
+import asyncio
+import warnings
+import base64
+import unittest
+from authlib.oauth2.rfc6749 import grants
+from authlib.oauth2.rfc6749 import (
+    AuthorizationServer,
+    ResourceProtector,
+    OAuth2Request,
+    HttpRequest,
+    ClientMixin,
+    AuthorizationCodeMixin,
+    TokenMixin,
+    TokenCache,
+)
+from authlib.oauth2.rfc6750 import BearerTokenValidator
+from authlib.oauth2.rfc7009 import RevocationEndpoint
+from authlib.oauth2.rfc7662 import IntrospectionEndpoint
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def create_request(method='POST', uri='https://server.test/oauth', auth=None, **data):
+    headers = {}
+    if auth:
+        auth = base64.b64encode(auth.encode('utf-8')).decode('ascii')
+        headers['Authorization'] = 'Basic ' + auth
+    return OAuth2Request(method, uri, body=data, headers=headers)
+
+
+class Client(ClientMixin):
+    def __init__(self, client_id, client_secret):
+        self.client_id = client_id
+        self.client_secret = client_secret
+
+    def get_client_id(self):
+        return self.client_id
+
+    def get_default_redirect_uri(self):
+        return 'https://client.test/cb'
+
+    def get_allowed_scope(self, scope):
+        return scope
+
+    def check_redirect_uri(self, redirect_uri):
+        return redirect_uri == 'https://client.test/cb'
+
+    def check_client_secret(self, client_secret):
+        return client_secret == self.client_secret
+
+    def check_endpoint_auth_method(self, method, endpoint):
+        return True
+
+    def check_response_type(self, response_type):
+        return True
+
+    def check_grant_type(self, grant_type):
+        return True
+
+
+class AuthorizationCode(AuthorizationCodeMixin):
+    def __init__(self, code, user):
+        self.code = code
+        self.user = user
+
+    def get_redirect_uri(self):
+        return 'https://client.test/cb'
+
+    def get_scope(self):
+        return 'profile'
+
+
+class Token(TokenMixin):
+    def __init__(self, data):
+        self.data = data
+        self.revoked = False
+
+    def check_client(self, client):
+        return self.data['client_id'] == client.client_id
+
+    def get_scope(self):
+        return self.data.get('scope')
+
+    def get_expires_in(self):
+        return self.data['expires_in']
+
+    def is_expired(self):
+        return False
+
+    def is_revoked(self):
+        return self.revoked
+
+
+class Database(object):
+    def __init__(self):
+        self.clients = {'client': Client('client', 'secret')}
+        self.tokens = {}
+        self.codes = {}
+        self.queries = 0
+
+    async def query_client(self, client_id):
+        await asyncio.sleep(0)
+        self.queries += 1
+        return self.clients.get(client_id)
+
+    async def save_token(self, token, request):
+        await asyncio.sleep(0)
+        data = dict(token, client_id=request.client.client_id, user=request.user)
+        self.tokens[token['access_token']] = Token(data)
+
+    async def query_token(self, access_token):
+        await asyncio.sleep(0)
+        self.queries += 1
+        return self.tokens.get(access_token)
+
+
+class Server(AuthorizationServer):
+    def __init__(self, db):
+        super(Server, self).__init__()
+        self.db = db
+        self.signals = []
+        counter = iter(range(1000))
+        self.register_token_generator('default', lambda **kwargs: {
+            'token_type': 'Bearer',
+            'access_token': 'a{}'.format(next(counter)),
+            'refresh_token': 'r{}'.format(next(counter)),
+            'expires_in': 3600,
+            'scope': kwargs.get('scope'),
+        })
+
+    def query_client(self, client_id):
+        return self.db.query_client(client_id)
+
+    def save_token(self, token, request):
+        return self.db.save_token(token, request)
+
+    def send_signal(self, name, *args, **kwargs):
+        self.signals.append(name)
+
+    def create_oauth2_request(self, request):
+        return request
+
+    def handle_response(self, status, body, headers):
+        return status, body, dict(headers)
+
+
+class PasswordGrant(grants.ResourceOwnerPasswordCredentialsGrant):
+    async def authenticate_user(self, username, password):
+        await asyncio.sleep(0)
+        if password == 'valid':
+            return username
+
+
+class RefreshTokenGrant(grants.RefreshTokenGrant):
+    async def authenticate_refresh_token(self, refresh_token):
+        for token in self.server.db.tokens.values():
+            if token.data['refresh_token'] == refresh_token:
+                return token
+
+    async def authenticate_user(self, credential):
+        return credential.data['user']
+
+    async def revoke_old_credential(self, credential):
+        credential.revoked = True
+
+
+class AuthorizationCodeGrant(grants.AuthorizationCodeGrant):
+    TOKEN_ENDPOINT_AUTH_METHODS = ['client_secret_basic', 'client_secret_post']
+
+    async def save_authorization_code(self, code, request):
+        self.server.db.codes[code] = AuthorizationCode(code, request.user)
+
+    async def query_authorization_code(self, code, client):
+        return self.server.db.codes.get(code)
+
+    async def delete_authorization_code(self, authorization_code):
+        del self.server.db.codes[authorization_code.code]
+
+    async def authenticate_user(self, authorization_code):
+        return authorization_code.user
+
+
+class SyncClientCredentialsGrant(grants.ClientCredentialsGrant):
+    GRANT_TYPE = 'urn:custom:sync'
+
+    def validate_token_request(self):
+        self.request.client = self.server.db.clients['client']
+
+    def create_token_response(self):
+        return 200, {'sync': True}, []
+
+
+class OverriddenPasswordGrant(PasswordGrant):
+    GRANT_TYPE = 'urn:custom:overridden'
+
+    def validate_token_request(self):
+        return super(OverriddenPasswordGrant, self).validate_token_request()
+
+
+class Revocation(RevocationEndpoint):
+    async def query_token(self, token_string, token_type_hint):
+        return self.server.db.tokens.get(token_string)
+
+    async def revoke_token(self, token, request):
+        token.revoked = True
+
+
+class Introspection(IntrospectionEndpoint):
+    async def query_token(self, token_string, token_type_hint):
+        return self.server.db.tokens.get(token_string)
+
+    def check_permission(self, token, client, request):
+        return True
+
+    async def introspect_token(self, token):
+        return {'scope': token.get_scope(), 'client_id': token.data['client_id']}
+
+
+class MyTokenValidator(BearerTokenValidator):
+    def __init__(self, db, **kwargs):
+        super(MyTokenValidator, self).__init__(**kwargs)
+        self.db = db
+
+    def authenticate_token(self, token_string):
+        return self.db.query_token(token_string)
+
+
+class AsyncAuthorizationServerTest(unittest.TestCase):
+    def setUp(self):
+        self.db = Database()
+        self.server = Server(self.db)
+        self.server.register_grant(grants.ClientCredentialsGrant)
+        self.server.register_grant(PasswordGrant)
+        self.server.register_grant(RefreshTokenGrant)
+        self.server.register_grant(AuthorizationCodeGrant)
+        self.server.register_grant(SyncClientCredentialsGrant)
+        self.server.register_endpoint(Revocation)
+        self.server.register_endpoint(Introspection)
+
+    def create_token(self, **data):
+        request = create_request(auth='client:secret', **data)
+        return run(self.server.async_create_token_response(request))
+
+    def test_client_credentials(self):
+        status, body, headers = self.create_token(grant_type='client_credentials')
+        self.assertEqual(status, 200)
+        self.assertIn(body['access_token'], self.db.tokens)
+        self.assertEqual(headers['Content-Type'], 'application/json')
+        self.assertEqual(self.server.signals, ['after_authenticate_client'])
+
+    def test_invalid_client(self):
+        request = create_request(auth='client:invalid', grant_type='client_credentials')
+        status, body, headers = run(self.server.async_create_token_response(request))
+        self.assertEqual(status, 401)
+        self.assertEqual(body['error'], 'invalid_client')
+
+        request = create_request(
+            grant_type='authorization_code', code='a',
+            client_id='unknown', client_secret='secret',
+        )
+        status, body, headers = run(self.server.async_create_token_response(request))
+        self.assertEqual(status, 400)
+        self.assertEqual(body['error'], 'invalid_client')
+
+    def test_unsupported_grant_type(self):
+        status, body, _ = self.create_token(grant_type='implicit')
+        self.assertEqual(status, 400)
+        self.assertEqual(body['error'], 'unsupported_grant_type')
+
+    def test_password_and_refresh_token(self):
+        status, body, _ = self.create_token(
+            grant_type='password', username='foo', password='invalid')
+        self.assertEqual(body['error'], 'invalid_request')
+
+        status, body, _ = self.create_token(
+            grant_type='password', username='foo', password='valid', scope='profile')
+        self.assertEqual(status, 200)
+        old_token = self.db.tokens[body['access_token']]
+        self.assertEqual(old_token.data['user'], 'foo')
+
+        status, body, _ = self.create_token(
+            grant_type='refresh_token', refresh_token=body['refresh_token'])
+        self.assertEqual(status, 200)
+        self.assertTrue(old_token.revoked)
+        self.assertEqual(self.db.tokens[body['access_token']].data['user'], 'foo')
+
+        status, body, _ = self.create_token(
+            grant_type='refresh_token', refresh_token='invalid')
+        self.assertEqual(body['error'], 'invalid_grant')
+
+    def test_authorization_code(self):
+        request = create_request(
+            'GET', 'https://server.test/authorize?response_type=code&client_id=client&state=s')
+        grant = run(self.server.async_get_consent_grant(request, end_user='foo'))
+        self.assertIsInstance(grant, AuthorizationCodeGrant)
+        self.assertEqual(grant.redirect_uri, 'https://client.test/cb')
+
+        status, body, headers = run(
+            self.server.async_create_authorization_response(request, grant_user='foo'))
+        self.assertEqual(status, 302)
+        self.assertIn('state=s', headers['Location'])
+        code, = self.db.codes
+
+        status, body, _ = self.create_token(
+            grant_type='authorization_code', code=code,
+            redirect_uri='https://client.test/cb',
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(self.db.tokens[body['access_token']].data['user'], 'foo')
+        self.assertEqual(self.db.codes, {})
+
+        status, body, _ = self.create_token(grant_type='authorization_code', code=code)
+        self.assertEqual(body['error'], 'invalid_grant')
+
+    def test_authorization_code_denied(self):
+        request = create_request(
+            'GET', 'https://server.test/authorize?response_type=code&client_id=client')
+        status, _, headers = run(self.server.async_create_authorization_response(request))
+        self.assertEqual(status, 302)
+        self.assertIn('error=access_denied', headers['Location'])
+
+        request = create_request(
+            'GET', 'https://server.test/authorize?response_type=code&client_id=unknown')
+        status, body, _ = run(self.server.async_create_authorization_response(request))
+        self.assertEqual(body['error'], 'invalid_client')
+
+    def test_sync_grant(self):
+        status, body, _ = self.create_token(grant_type='urn:custom:sync')
+        self.assertEqual(status, 200)
+        self.assertEqual(body, {'sync': True})
+
+    def test_sync_method_with_async_model(self):
+        self.server.register_grant(OverriddenPasswordGrant)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            with self.assertRaises(RuntimeError) as cm:
+                self.create_token(
+                    grant_type='urn:custom:overridden', username='foo', password='valid')
+            self.assertIn('returned an awaitable', str(cm.exception))
+
+            request = create_request(auth='client:secret', grant_type='password')
+            self.assertRaises(RuntimeError, self.server.create_token_response, request)
+
+    def test_extension_hooks(self):
+        tokens = []
+        server = Server(self.db)
+        server.register_grant(PasswordGrant, [
+            lambda grant: grant.register_hook(
+                'process_token', lambda grant, token: tokens.append(token)),
+        ])
+        request = create_request(
+            auth='client:secret', grant_type='password',
+            username='foo', password='valid',
+        )
+        status, body, _ = run(server.async_create_token_response(request))
+        self.assertEqual(status, 200)
+        self.assertEqual(tokens, [body])
+
+    def test_revocation_and_introspection(self):
+        _, token, _ = self.create_token(grant_type='client_credentials', scope='profile')
+
+        request = create_request(auth='client:secret', token=token['access_token'])
+        status, body, _ = run(self.server.async_create_endpoint_response('introspection', request))
+        self.assertEqual(status, 200)
+        self.assertEqual(body, {'active': True, 'scope': 'profile', 'client_id': 'client'})
+
+        status, body, _ = run(self.server.async_create_endpoint_response('revocation', request))
+        self.assertEqual(status, 200)
+        self.assertIn('after_revoke_token', self.server.signals)
+        self.assertTrue(self.db.tokens[token['access_token']].revoked)
+
+        status, body, _ = run(self.server.async_create_endpoint_response('introspection', request))
+        self.assertEqual(body, {'active': False})
+
+        request = create_request(auth='client:secret')
+        status, body, _ = run(self.server.async_create_endpoint_response('revocation', request))
+        self.assertEqual(body['error'], 'invalid_request')
+
+        self.assertRaises(
+            RuntimeError, run,
+            self.server.async_create_endpoint_response('unknown', request),
+        )
+
+
+class AsyncResourceProtectorTest(unittest.TestCase):
+    def setUp(self):
+        self.db = Database()
+        self.db.tokens['a'] = Token({
+            'client_id': 'client', 'scope': 'profile',
+            'issued_at': time.time(), 'expires_in': 3600,
+        })
+
+    def create_protector(self, **kwargs):
+        protector = ResourceProtector()
+        protector.register_token_validator(MyTokenValidator(self.db, **kwargs))
+        return protector
+
+    def validate_request(self, protector, scopes, token_string):
+        request = HttpRequest('GET', 'https://server.test/api', headers={
+            'Authorization': 'Bearer ' + token_string,
+        })
+        return run(protector.async_validate_request(scopes, request))
+
+    def test_validate_request(self):
+        protector = self.create_protector()
+        token = self.validate_request(protector, ['profile'], 'a')
+        self.assertIs(token, self.db.tokens['a'])
+        self.assertRaises(Exception, self.validate_request, protector, ['email'], 'a')
+        self.assertRaises(Exception, self.validate_request, protector, None, 'invalid')
+
+    def test_token_cache(self):
+        protector = self.create_protector(token_cache=TokenCache())
+        self.validate_request(protector, ['profile'], 'a')
+        self.validate_request(protector, ['profile'], 'a')
+        self.assertEqual(self.db.queries, 1)
@@ -63,6 +63,43 @@ class OAuth2UtilTest(unittest.TestCase):
         self.assertEqual(util.scope_to_list(['a', 'b']), ['a', 'b'])
         self.assertIsNone(util.scope_to_list(None))
 
+    def test_compile_scopes(self):
+        self.assertIsNone(util.compile_scopes(None))
+        scopes = util.compile_scopes(['profile email', 'user'])
+        self.assertEqual(scopes, ['profile email', 'user'])
+        self.assertIs(util.compile_scopes(scopes), scopes)
+        self.assertEqual(util.compile_scopes('profile'), ['profile'])
+
+        insufficient = util.scope_insufficient
+        self.assertFalse(insufficient('profile email', scopes))
+        self.assertFalse(insufficient('email user', scopes))
+        self.assertFalse(insufficient(['email', 'profile'], scopes))
+        self.assertTrue(insufficient('profile', scopes))
+        self.assertTrue(insufficient('unknown', scopes))
+        self.assertTrue(insufficient('', scopes))
+        self.assertTrue(insufficient(None, scopes))
+        self.assertFalse(insufficient(None, None))
+        self.assertFalse(insufficient('profile', []))
+        self.assertFalse(insufficient('profile', ['profile']))
+        self.assertFalse(insufficient('profile', ['']))
+        self.assertTrue(insufficient('', ['']))
+
+    def test_scope_matcher_interns_compiled_scopes(self):
+        matcher = util.ScopeMatcher(maxsize=2)
+        self.assertEqual(matcher.get_mask('a b'), 0)
+        self.assertFalse(matcher.scope_insufficient('a b', ['a']))
+        self.assertTrue(matcher.scope_insufficient('a b', ['c']))
+        self.assertFalse(matcher.scope_insufficient('a b', ['a b']))
+        self.assertTrue(matcher.scope_insufficient('a', 'a b'))
+        # dynamic required scopes are not interned
+        self.assertEqual(matcher._bits, {})
+
+        self.assertFalse(matcher.scope_insufficient('a b', matcher.compile(['b'])))
+        self.assertEqual(list(matcher._bits), ['b'])
+        matcher.get_mask('c')
+        matcher.get_mask('d')
+        self.assertLessEqual(len(matcher._masks), 2)
+
     def test_extract_basic_authorization(self):
         self.assertEqual(util.extract_basic_authorization({}), (None, None))
         self.assertEqual(
@@ -0,0 +1,172 @@
+import unittest
+from authlib.oauth2.rfc6749 import grants, errors
+from authlib.oauth2.rfc6749 import AuthorizationServer, OAuth2Request
+
+
+def create_request(method='POST', **data):
+    return OAuth2Request(method, 'https://server.test/oauth', body=data)
+
+
+class CustomGrant(grants.BaseGrant, grants.TokenEndpointMixin):
+    @classmethod
+    def check_token_endpoint(cls, request):
+        return request.grant_type and request.grant_type.startswith('urn:custom:')
+
+
+class HookExtension(object):
+    HOOKS_ONLY = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, grant):
+        self.calls += 1
+        grant.register_hook('process_token', self.process_token)
+
+    def process_token(self, grant, token):
+        pass
+
+
+class RequestExtension(HookExtension):
+    def __call__(self, grant):
+        self.calls += 1
+        grant.scope_seen = grant.request.scope
+        grant.register_hook('process_token', self.process_token)
+
+
+class InvalidHookExtension(HookExtension):
+    HOOKS_ONLY = True
+
+    def __call__(self, grant):
+        grant.scope_seen = grant.request.scope
+
+
+class AuthorizationServerTest(unittest.TestCase):
+    def test_get_token_grant(self):
+        server = AuthorizationServer()
+        server.register_grant(grants.ClientCredentialsGrant)
+        server.register_grant(CustomGrant)
+        server.register_grant(grants.RefreshTokenGrant)
+
+        grant = server.get_token_grant(create_request(grant_type='client_credentials'))
+        self.assertIsInstance(grant, grants.ClientCredentialsGrant)
+        grant = server.get_token_grant(create_request(grant_type='refresh_token'))
+        self.assertIsInstance(grant, grants.RefreshTokenGrant)
+        grant = server.get_token_grant(create_request(grant_type='urn:custom:a'))
+        self.assertIsInstance(grant, CustomGrant)
+
+        self.assertRaises(
+            errors.UnsupportedGrantTypeError, server.get_token_grant,
+            create_request('GET', grant_type='client_credentials'),
+        )
+        self.assertRaises(
+            errors.UnsupportedGrantTypeError, server.get_token_grant,
+            create_request(grant_type='password'),
+        )
+        self.assertRaises(
+            errors.UnsupportedGrantTypeError, server.get_token_grant,
+            create_request(),
+        )
+
+    def test_get_token_grant_in_registration_order(self):
+        server = AuthorizationServer()
+        server.register_grant(CustomGrant)
+        server.register_grant(grants.ClientCredentialsGrant)
+
+        class ClientCredentialsGrant(grants.ClientCredentialsGrant):
+            GRANT_TYPE = 'urn:custom:client_credentials'
+
+        server.register_grant(ClientCredentialsGrant)
+        request = create_request(grant_type='urn:custom:client_credentials')
+        self.assertIs(type(server.get_token_grant(request)), CustomGrant)
+
+    def test_get_authorization_grant(self):
+        server = AuthorizationServer()
+        server.register_grant(grants.AuthorizationCodeGrant)
+        server.register_grant(grants.ImplicitGrant)
+
+        class HybridGrant(grants.ImplicitGrant):
+            RESPONSE_TYPES = {'code token'}
+
+        server.register_grant(HybridGrant)
+
+        request = create_request('GET', response_type='code')
+        grant = server.get_authorization_grant(request)
+        self.assertIsInstance(grant, grants.AuthorizationCodeGrant)
+        request = create_request('GET', response_type='token')
+        self.assertIs(type(server.get_authorization_grant(request)), grants.ImplicitGrant)
+        request = create_request('GET', response_type='code token')
+        grant = server.get_authorization_grant(request)
+        self.assertIs(type(grant), HybridGrant)
+
+        self.assertRaises(
+            errors.UnsupportedResponseTypeError, server.get_authorization_grant,
+            create_request('GET', response_type='id_token'),
+        )
+
+        # request.response_type is matched exactly, as the grants see it
+        class UnsortedHybridGrant(grants.ImplicitGrant):
+            RESPONSE_TYPES = {'token id_token'}
+
+        server.register_grant(UnsortedHybridGrant)
+        self.assertRaises(
+            errors.UnsupportedResponseTypeError, server.get_authorization_grant,
+            create_request('GET', response_type='token id_token'),
+        )
+
+    def test_extension_hooks(self):
+        server = AuthorizationServer()
+        extension = HookExtension()
+        server.register_grant(grants.ClientCredentialsGrant, [extension])
+        self.assertEqual(extension.calls, 1)
+
+        request = create_request(grant_type='client_credentials')
+        grant1 = server.get_token_grant(request)
+        grant2 = server.get_token_grant(request)
+        self.assertEqual(extension.calls, 1)
+        self.assertIs(grant1._hooks, grant2._hooks)
+        self.assertEqual(grant1._hooks['process_token'], (extension.process_token,))
+
+        # hooks registered on a grant instance are not shared
+        grant1.register_hook('process_token', lambda grant, token: None)
+        self.assertEqual(len(grant1._hooks['process_token']), 2)
+        self.assertEqual(len(grant2._hooks['process_token']), 1)
+        grant3 = server.get_token_grant(request)
+        self.assertEqual(len(grant3._hooks['process_token']), 1)
+
+        self.assertRaises(ValueError, grant1.register_hook, 'invalid', None)
+
+    def test_extension_hooks_without_grant(self):
+        class StrictGrant(grants.ClientCredentialsGrant):
+            def __init__(self, request, server):
+                assert request is not None
+                super().__init__(request, server)
+
+        server = AuthorizationServer()
+        extension = HookExtension()
+        server.register_grant(StrictGrant, [extension])
+        grant = server.get_token_grant(create_request(grant_type='client_credentials'))
+        self.assertEqual(grant._hooks['process_token'], (extension.process_token,))
+
+        with self.assertRaises(AttributeError) as cm:
+            server.register_grant(StrictGrant, [InvalidHookExtension()])
+        self.assertIn('register_hook', str(cm.exception))
+        self.assertIn('StrictGrant', str(cm.exception))
+
+    def test_request_extension(self):
+        server = AuthorizationServer()
+        hook_extension = HookExtension()
+        extension = RequestExtension()
+        server.register_grant(grants.ClientCredentialsGrant, [hook_extension, extension])
+        self.assertEqual(extension.calls, 0)
+
+        # extensions without HOOKS_ONLY are applied to each grant instance
+        grant1 = server.get_token_grant(create_request(grant_type='client_credentials'))
+        grant2 = server.get_token_grant(
+            create_request(grant_type='client_credentials', scope='profile'))
+        self.assertEqual(extension.calls, 2)
+        self.assertEqual(hook_extension.calls, 1)
+        self.assertIsNone(grant1.scope_seen)
+        self.assertEqual(grant2.scope_seen, 'profile')
+        self.assertEqual(len(grant1._hooks['process_token']), 2)
+        self.assertEqual(len(grant2._hooks['process_token']), 2)
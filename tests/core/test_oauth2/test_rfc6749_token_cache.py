@@ -0,0 +1,79 @@
+import time
+import unittest
+from authlib.oauth2.rfc6749 import TokenCache, TokenValidator
+
+
+class Token(object):
+    def __init__(self, access_token, expires_in=3600):
+        self.access_token = access_token
+        self.issued_at = int(time.time())
+        self.expires_in = expires_in
+
+
+class Validator(TokenValidator):
+    def __init__(self, tokens, **kwargs):
+        super(Validator, self).__init__(**kwargs)
+        self.tokens = tokens
+        self.queries = 0
+
+    def authenticate_token(self, token_string):
+        self.queries += 1
+        return self.tokens.get(token_string)
+
+
+class TokenCacheTest(unittest.TestCase):
+    def test_load_token(self):
+        token = Token('a')
+        token_cache = TokenCache()
+        validator = Validator({'a': token}, token_cache=token_cache)
+        self.assertIs(validator.load_token('a'), token)
+        self.assertIs(validator.load_token('a'), token)
+        self.assertIsNone(validator.load_token('b'))
+        self.assertIsNone(validator.load_token('b'))
+        self.assertEqual(validator.queries, 2)
+
+        stats = token_cache.stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hit_rate'], 0.5)
+        self.assertGreaterEqual(stats['max_age'], 0)
+
+        validator = Validator({'a': token})
+        validator.load_token('a')
+        validator.load_token('a')
+        self.assertEqual(validator.queries, 2)
+
+    def test_token_expiry(self):
+        token_cache = TokenCache(ttl=60, negative_ttl=0)
+        validator = Validator({'a': Token('a', -10)}, token_cache=token_cache)
+        validator.load_token('a')
+        validator.load_token('b')
+        self.assertEqual(len(token_cache), 0)
+
+        token = Token('c', 10)
+        token_cache.load('c', lambda: token)
+        self.assertLessEqual(token_cache._data['c'][0], token.issued_at + 10)
+
+    def test_invalidate(self):
+        token_cache = TokenCache()
+        validator = Validator({'a': Token('a')}, token_cache=token_cache)
+        token = validator.load_token('a')
+        token_cache.on_token_revoked(None, token=token, client=None)
+        self.assertEqual(len(token_cache), 0)
+        self.assertEqual(token_cache.stats()['invalidations'], 1)
+
+        validator.load_token('a')
+        token_cache.invalidate('a')
+        token_cache.invalidate('a')
+        self.assertEqual(token_cache.stats()['invalidations'], 2)
+        self.assertEqual(validator.queries, 2)
+
+    def test_maxsize(self):
+        self.assertRaises(ValueError, TokenCache, 0)
+        token_cache = TokenCache(maxsize=2)
+        for s in ('a', 'b', 'a', 'c'):
+            token_cache.load(s, lambda: Token(s))
+        self.assertEqual(list(token_cache._data), ['a', 'c'])
+        token_cache.clear()
+        self.assertEqual(len(token_cache), 0)
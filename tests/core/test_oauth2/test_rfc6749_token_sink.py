@@ -0,0 +1,188 @@
+import time
+import threading
+import unittest
+from authlib.oauth2.rfc6749 import TokenSink
+
+
+class Storage(object):
+    def __init__(self, delay=0, fail=False, bad_items=()):
+        self.delay = delay
+        self.fail = fail
+        self.bad_items = bad_items
+        self.calls = 0
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def save_tokens(self, items):
+        self.calls += 1
+        self.started.set()
+        self.release.wait()
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError('database is down')
+        if any(item in self.bad_items for item in items):
+            raise ValueError('duplicate token')
+        self.batches.append(list(items))
+
+    @property
+    def items(self):
+        return [item for batch in self.batches for item in batch]
+
+
+def put_in_threads(sink, items):
+    errors = []
+
+    def put(item):
+        try:
+            sink.put(item)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=put, args=(item,)) for item in items]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+class TokenSinkTest(unittest.TestCase):
+    def test_invalid_options(self):
+        self.assertRaises(ValueError, TokenSink, None, durability='invalid')
+        self.assertRaises(ValueError, TokenSink, None, batch_size=0)
+        self.assertRaises(ValueError, TokenSink, None, batch_size=10, max_pending=5)
+
+    def test_flush_mode(self):
+        storage = Storage()
+        sink = TokenSink(storage.save_tokens)
+        sink.put('a')
+        self.assertEqual(storage.batches, [['a']])
+        sink.put('b')
+        self.assertEqual(storage.batches, [['a'], ['b']])
+        self.assertEqual(len(sink), 0)
+
+    def test_flush_mode_batches(self):
+        storage = Storage()
+        sink = TokenSink(storage.save_tokens, batch_size=4)
+        storage.release.clear()
+        leader = threading.Thread(target=sink.put, args=('a',))
+        leader.start()
+        storage.started.wait()
+
+        # items are collected into the next batches while "a" is saved
+        threads = [threading.Thread(target=sink.put, args=(i,)) for i in range(6)]
+        for t in threads:
+            t.start()
+        while len(sink) < 7:
+            time.sleep(0.001)
+        storage.release.set()
+        for t in [leader] + threads:
+            t.join()
+
+        self.assertEqual(sorted(storage.items[1:]), list(range(6)))
+        self.assertEqual([len(batch) for batch in storage.batches], [1, 4, 2])
+        stats = sink.stats()
+        self.assertEqual(stats['saved'], 7)
+        self.assertEqual(stats['batches'], 3)
+        self.assertEqual(stats['max_batch'], 4)
+        self.assertEqual(stats['pending'], 0)
+
+    def test_flush_interval(self):
+        storage = Storage()
+        sink = TokenSink(storage.save_tokens, batch_size=100, flush_interval=0.05)
+        self.assertEqual(put_in_threads(sink, range(20)), [])
+        self.assertEqual(sorted(storage.items), list(range(20)))
+        self.assertLess(len(storage.batches), 20)
+
+    def test_flush_mode_error(self):
+        storage = Storage(fail=True)
+        sink = TokenSink(storage.save_tokens)
+        self.assertRaises(ValueError, sink.put, 'a')
+        errors = put_in_threads(sink, range(5))
+        self.assertEqual(len(errors), 5)
+        self.assertEqual(len(set(map(id, errors))), 5)
+        self.assertEqual(sink.stats()['dropped'], 0)
+        self.assertEqual(len(sink), 0)
+
+    def test_flush_mode_item_error(self):
+        storage = Storage(bad_items=(2,))
+        sink = TokenSink(storage.save_tokens, batch_size=4, flush_interval=1)
+        errors = put_in_threads(sink, range(4))
+        self.assertEqual([str(e) for e in errors], ['duplicate token'])
+        self.assertEqual(sorted(storage.items), [0, 1, 3])
+        self.assertEqual(storage.calls, 5)
+        stats = sink.stats()
+        self.assertEqual(stats['saved'], 3)
+        self.assertEqual(stats['errors'], 1)
+
+    def test_async_mode(self):
+        storage = Storage()
+        sink = TokenSink(storage.save_tokens, batch_size=10,
+                         flush_interval=0.01, durability='async')
+        storage.release.clear()
+        for i in range(25):
+            sink.put(i)
+        self.assertEqual(storage.items, [])
+        storage.release.set()
+        sink.close()
+        self.assertEqual(storage.items, list(range(25)))
+        self.assertTrue(all(len(batch) <= 10 for batch in storage.batches))
+        self.assertEqual(len(sink), 0)
+        self.assertRaises(RuntimeError, sink.put, 25)
+
+    def test_async_mode_flush_interval(self):
+        storage = Storage()
+        sink = TokenSink(storage.save_tokens, flush_interval=0.01, durability='async')
+        sink.put('a')
+        for _ in range(100):
+            if storage.items:
+                break
+            time.sleep(0.01)
+        self.assertEqual(storage.items, ['a'])
+        sink.close()
+
+    def test_async_mode_max_pending(self):
+        storage = Storage()
+        sink = TokenSink(storage.save_tokens, batch_size=2,
+                         durability='async', max_pending=4)
+        storage.release.clear()
+        done = threading.Event()
+
+        def put_many():
+            for i in range(8):
+                sink.put(i)
+            done.set()
+
+        thread = threading.Thread(target=put_many)
+        thread.start()
+        storage.started.wait()
+        self.assertFalse(done.wait(0.05))
+        self.assertLessEqual(len(sink), 4)
+        storage.release.set()
+        thread.join()
+        sink.close()
+        self.assertEqual(storage.items, list(range(8)))
+
+    def test_async_mode_error(self):
+        storage = Storage(fail=True)
+        sink = TokenSink(storage.save_tokens, durability='async')
+        sink.put('a')
+        sink.close()
+        stats = sink.stats()
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['dropped'], 1)
+        self.assertEqual(stats['saved'], 0)
+
+    def test_async_mode_item_error(self):
+        storage = Storage(bad_items=('b',))
+        sink = TokenSink(storage.save_tokens, flush_interval=1, durability='async')
+        for item in 'abc':
+            sink.put(item)
+        sink.close()
+        self.assertEqual(storage.items, ['a', 'c'])
+        stats = sink.stats()
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['dropped'], 1)
+        self.assertEqual(stats['saved'], 2)
@@ -1,5 +1,6 @@
 from unittest import TestCase
 from authlib.oauth2.rfc7591 import ClientMetadataClaims
+from authlib.jose import ClaimsValidator
 from authlib.jose.errors import InvalidClaimError
 
 
@@ -27,3 +28,12 @@ class ClientMetadataClaimsTest(TestCase):
     def test_validate_jwks_uri(self):
         claims = ClientMetadataClaims({'jwks_uri': 'foo'}, {})
         self.assertRaises(InvalidClaimError, claims.validate)
+
+    def test_validate_with_claims_validator(self):
+        options = ClaimsValidator({
+            'token_endpoint_auth_method': {'values': ['client_secret_basic']},
+        })
+        claims = ClientMetadataClaims({'token_endpoint_auth_method': 'none'}, {}, options)
+        self.assertRaises(InvalidClaimError, claims.validate)
+        claims = ClientMetadataClaims({'token_endpoint_auth_method': 'client_secret_basic'}, {}, options)
+        claims.validate()
@@ -1,4 +1,5 @@
 import unittest
+from authlib.jose import ClaimsValidator
 from authlib.jose.errors import MissingClaimError, InvalidClaimError
 from authlib.oidc.core import CodeIDToken, ImplicitIDToken, HybridIDToken
 from authlib.oidc.core import UserInfo, get_claim_cls_by_response_type
@@ -17,6 +18,25 @@ class IDTokenTest(unittest.TestCase):
         }, {})
         claims.validate(1000)
 
+    def test_essential_claims_with_claims_validator(self):
+        options = ClaimsValidator({
+            'aud': {'essential': True, 'values': ['1', '2']},
+            'acr': {'essential': True},
+        })
+        payload = {
+            'iss': '1',
+            'sub': '1',
+            'aud': ['2', '3'],
+            'exp': 10000,
+            'iat': 100
+        }
+        claims = CodeIDToken(payload, {}, options)
+        self.assertRaises(MissingClaimError, claims.validate, 1000)
+        claims['acr'] = '0'
+        claims.validate(1000)
+        claims['aud'] = '3'
+        self.assertRaises(InvalidClaimError, claims.validate, 1000)
+
     def test_validate_auth_time(self):
         claims = CodeIDToken({
             'iss': '1',
@@ -4,7 +4,12 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": "example.sqlite",
-    }
+    },
+    "tokens": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": "example.sqlite",
+        "TEST": {"MIRROR": "default"},
+    },
 }
 
 MIDDLEWARE = [
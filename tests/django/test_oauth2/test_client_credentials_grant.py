@@ -1,7 +1,13 @@
+import os
 import json
+from unittest import mock
+from django.db import connections
+from django.test import TransactionTestCase
 from authlib.oauth2.rfc6749 import grants
+from authlib.integrations.django_oauth2 import AuthorizationServer, create_token_sink
+from tests.django_helper import RequestClient
 from .oauth2_server import TestCase
-from .models import User, Client
+from .models import User, Client, OAuth2Token
 
 
 class PasswordTest(TestCase):
@@ -98,3 +104,49 @@ class PasswordTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         data = json.loads(resp.content)
         self.assertIn('access_token', data)
+
+    def test_token_sink_in_transaction(self):
+        with mock.patch.dict(connections['default'].settings_dict, ATOMIC_REQUESTS=True):
+            self.assertRaises(ValueError, create_token_sink, OAuth2Token, 'default')
+
+        token_sink = create_token_sink(OAuth2Token, 'default')
+        server = AuthorizationServer(Client, OAuth2Token, token_sink)
+        server.register_grant(grants.ClientCredentialsGrant)
+        self.prepare_data()
+        request = self.factory.post(
+            '/oauth/token',
+            data={'grant_type': 'client_credentials'},
+            HTTP_AUTHORIZATION=self.create_basic_auth('client', 'secret'),
+        )
+        self.assertRaises(RuntimeError, server.create_token_response, request)
+
+
+class TokenSinkTest(TransactionTestCase):
+    databases = {'default', 'tokens'}
+
+    prepare_data = PasswordTest.prepare_data
+    create_basic_auth = PasswordTest.create_basic_auth
+
+    def setUp(self):
+        os.environ['AUTHLIB_INSECURE_TRANSPORT'] = 'true'
+        self.factory = RequestClient()
+
+    def tearDown(self):
+        os.environ.pop('AUTHLIB_INSECURE_TRANSPORT')
+
+    def test_token_sink(self):
+        token_sink = create_token_sink(OAuth2Token, 'tokens', batch_size=10)
+        server = AuthorizationServer(Client, OAuth2Token, token_sink)
+        server.register_grant(grants.ClientCredentialsGrant)
+        self.prepare_data()
+        request = self.factory.post(
+            '/oauth/token',
+            data={'grant_type': 'client_credentials'},
+            HTTP_AUTHORIZATION=self.create_basic_auth('client', 'secret'),
+        )
+        resp = server.create_token_response(request)
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.content)
+        token = OAuth2Token.objects.get(access_token=data['access_token'])
+        self.assertEqual(token.client_id, 'client')
+        self.assertEqual(token_sink.stats()['saved'], 1)
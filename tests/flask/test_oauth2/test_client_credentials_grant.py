@@ -1,6 +1,8 @@
 from flask import json
+from sqlalchemy.orm import sessionmaker
 from authlib.oauth2.rfc6749.grants import ClientCredentialsGrant
-from .models import db, User, Client
+from authlib.integrations.sqla_oauth2 import create_save_token_func, create_token_sink
+from .models import db, User, Client, Token
 from .oauth2_server import TestCase
 from .oauth2_server import create_authorization_server
 
@@ -93,3 +95,29 @@ class ClientCredentialsTest(TestCase):
         resp = json.loads(rv.data)
         self.assertIn('access_token', resp)
         self.assertIn('c-client_credentials.', resp['access_token'])
+
+    def test_token_sink(self):
+        self.prepare_data()
+        self.assertRaises(ValueError, create_token_sink, db.session, Token)
+        token_sink = create_token_sink(sessionmaker(bind=db.engine), Token, batch_size=10)
+        self.server._save_token = create_save_token_func(db.session, Token, token_sink)
+        headers = self.create_basic_header(
+            'credential-client', 'credential-secret'
+        )
+        for _ in range(3):
+            rv = self.client.post('/oauth/token', data={
+                'grant_type': 'client_credentials',
+            }, headers=headers)
+            resp = json.loads(rv.data)
+            token = Token.query.filter_by(access_token=resp['access_token']).first()
+            self.assertEqual(token.client_id, 'credential-client')
+        self.assertEqual(token_sink.stats()['saved'], 3)
+
+    def test_token_sink_session(self):
+        self.prepare_data()
+        token_sink = create_token_sink(sessionmaker(bind=db.engine), Token)
+        db.session.add(User(username='pending'))
+        token_sink.put(Token(client_id='credential-client', access_token='a'))
+        db.session.rollback()
+        self.assertIsNone(User.query.filter_by(username='pending').first())
+        self.assertIsNotNone(Token.query.filter_by(access_token='a').first())
@@ -1,6 +1,9 @@
+import time
+import threading
 from flask import json
+from authlib.jose import jwt
 from authlib.oauth2.rfc7523 import JWTBearerGrant as _JWTBearerGrant
-from authlib.oauth2.rfc7523 import JWTBearerTokenGenerator
+from authlib.oauth2.rfc7523 import JWTBearerTokenGenerator, JWTBearerTokenValidator
 from tests.util import read_file_path
 from .models import db, User, Client
 from .oauth2_server import TestCase
@@ -22,10 +25,14 @@ class JWTBearerGrant(_JWTBearerGrant):
         return True
 
 
+class AudienceJWTBearerGrant(JWTBearerGrant):
+    CLAIMS_OPTIONS = dict(JWTBearerGrant.CLAIMS_OPTIONS)
+
+
 class JWTBearerGrantTest(TestCase):
-    def prepare_data(self, grant_type=None, token_generator=None):
+    def prepare_data(self, grant_type=None, token_generator=None, grant_cls=JWTBearerGrant):
         server = create_authorization_server(self.app)
-        server.register_grant(JWTBearerGrant)
+        server.register_grant(grant_cls)
 
         if token_generator:
             server.register_token_generator(JWTBearerGrant.GRANT_TYPE, token_generator)
@@ -127,3 +134,50 @@ class JWTBearerGrantTest(TestCase):
         resp = json.loads(rv.data)
         self.assertIn('access_token', resp)
         self.assertEqual(resp['access_token'].count('.'), 2)
+
+    def test_update_claims_options_in_place(self):
+        self.prepare_data(grant_cls=AudienceJWTBearerGrant)
+        assertion = JWTBearerGrant.sign(
+            'foo', issuer='jwt-client', audience='https://i.b/token',
+            subject=None, header={'alg': 'HS256', 'kid': '1'}
+        )
+        data = {'grant_type': JWTBearerGrant.GRANT_TYPE, 'assertion': assertion}
+        options = AudienceJWTBearerGrant.CLAIMS_OPTIONS
+        options['aud'] = {'essential': True, 'value': 'https://i.b/token'}
+        AudienceJWTBearerGrant.invalidate_claims_options()
+        rv = self.client.post('/oauth/token', data=data)
+        self.assertIn('access_token', json.loads(rv.data))
+
+        options['aud']['value'] = 'https://i.c/token'
+        AudienceJWTBearerGrant.invalidate_claims_options()
+        rv = self.client.post('/oauth/token', data=data)
+        self.assertEqual(json.loads(rv.data)['error'], 'invalid_grant')
+
+    def test_token_validator_claims_options(self):
+        class ClientChecker(object):
+            def __init__(self):
+                self.lock = threading.Lock()
+
+            def check(self, claims, value):
+                with self.lock:
+                    return value == 'jwt-client'
+
+        validator = JWTBearerTokenValidator('foo')
+        validator.claims_options['client_id'] = {
+            'essential': True, 'validate': ClientChecker().check,
+        }
+        now = int(time.time())
+        payload = {
+            'iat': now, 'exp': now + 3600,
+            'client_id': 'jwt-client', 'grant_type': 'client_credentials',
+        }
+        token_string = jwt.encode({'alg': 'HS256'}, payload, 'foo')
+        self.assertIsNotNone(validator.authenticate_token(token_string))
+
+        cache = validator._claims_options_cache
+        compiled = cache.get(validator.claims_options)
+        self.assertIs(cache.get(validator.claims_options), compiled)
+
+        validator.claims_options['grant_type'] = {'essential': True, 'value': 'password'}
+        validator.invalidate_claims_options()
+        self.assertIsNone(validator.authenticate_token(token_string))
@@ -1,11 +1,17 @@
 from flask import json
-from authlib.integrations.sqla_oauth2 import create_revocation_endpoint
+from authlib.integrations.flask_oauth2 import ResourceProtector
+from authlib.integrations.sqla_oauth2 import (
+    create_revocation_endpoint,
+    create_bearer_token_validator,
+)
+from authlib.oauth2.rfc6749 import TokenCache
 from .models import db, User, Client, Token
 from .oauth2_server import TestCase
 from .oauth2_server import create_authorization_server
 
 
 RevocationEndpoint = create_revocation_endpoint(db.session, Token)
+BearerTokenValidator = create_bearer_token_validator(db.session, Token)
 
 
 class RevokeTokenTest(TestCase):
@@ -120,3 +126,34 @@ class RevokeTokenTest(TestCase):
             'token': 'a1',
         }, headers=headers)
         self.assertEqual(rv.status_code, 200)
+
+    def test_revoke_token_with_token_cache(self):
+        self.prepare_data()
+        self.create_token()
+        token_cache = TokenCache()
+        require_oauth = ResourceProtector()
+        require_oauth.register_token_validator(BearerTokenValidator(token_cache=token_cache))
+
+        @self.app.route('/profile')
+        @require_oauth('profile')
+        def profile():
+            return 'ok'
+
+        auth_headers = {'Authorization': 'Bearer a1'}
+        self.assertEqual(self.client.get('/profile', headers=auth_headers).status_code, 200)
+        self.assertEqual(self.client.get('/profile', headers=auth_headers).status_code, 200)
+        stats = token_cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+        headers = self.create_basic_header(
+            'revoke-client', 'revoke-secret'
+        )
+        rv = self.client.post('/oauth/revoke', data={
+            'token': 'a1',
+        }, headers=headers)
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(token_cache.stats()['invalidations'], 1)
+        self.assertEqual(len(token_cache), 0)
+        self.assertEqual(self.client.get('/profile', headers=auth_headers).status_code, 401)
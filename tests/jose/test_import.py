@@ -0,0 +1,114 @@
+import sys
+import unittest
+import subprocess
+from authlib.jose import JsonWebSignature, JsonWebEncryption, JsonWebKey
+from authlib.jose import rfc7518
+from authlib.jose.util import LazyRegistry
+
+
+def import_time(code):
+    """Run ``code`` with ``python -X importtime``, return the cumulative
+    import time in microseconds of each imported module."""
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stderr=subprocess.STDOUT,
+    ).decode('utf-8')
+    rv = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rv[name.strip()] = int(cumulative)
+    return rv
+
+
+class ImportTest(unittest.TestCase):
+    def test_import_time(self):
+        modules = import_time('import authlib.jose')
+        self.assertIn('authlib.jose', modules)
+        self.assertGreater(modules['authlib.jose'], 0)
+        heavy = [
+            name for name in modules
+            if name.split('.')[0] in ('cryptography', 'asyncio')
+        ]
+        self.assertEqual(heavy, [])
+
+    def test_hmac_does_not_import_cryptography(self):
+        code = (
+            'import sys\n'
+            'from authlib.jose import jwt, OctKey\n'
+            'key = OctKey.import_key("secret")\n'
+            's = jwt.encode({"alg": "HS256"}, {"a": 1}, key)\n'
+            'assert jwt.decode(s, key) == {"a": 1}\n'
+            'assert "cryptography" not in sys.modules\n'
+        )
+        modules = import_time(code)
+        self.assertNotIn('cryptography', modules)
+
+    def test_lazy_algorithm_names(self):
+        from authlib.jose.rfc7518.jws_algs import JWS_ALGORITHMS
+        from authlib.jose.rfc7518.jws_hmac import HMAC_ALGORITHMS
+        from authlib.jose.rfc7518.jwe_algs import JWE_ALG_ALGORITHMS
+        from authlib.jose.rfc7518.jwe_encs import JWE_ENC_ALGORITHMS
+        self.assertEqual(
+            rfc7518.JWS_ALGORITHM_NAMES,
+            tuple(alg.name for alg in JWS_ALGORITHMS if alg not in HMAC_ALGORITHMS),
+        )
+        self.assertEqual(
+            rfc7518.JWE_ALG_ALGORITHM_NAMES,
+            tuple(alg.name for alg in JWE_ALG_ALGORITHMS),
+        )
+        self.assertEqual(
+            rfc7518.JWE_ENC_ALGORITHM_NAMES,
+            tuple(alg.name for alg in JWE_ENC_ALGORITHMS),
+        )
+
+        registry = JsonWebSignature.ALGORITHMS_REGISTRY
+        self.assertIs(registry['RS256'], registry.get('RS256'))
+        self.assertEqual(registry['EdDSA'].name, 'EdDSA')
+        self.assertEqual(JsonWebEncryption.ALG_REGISTRY['ECDH-ES'].name, 'ECDH-ES')
+        self.assertEqual(JsonWebEncryption.ENC_REGISTRY['A128GCM'].name, 'A128GCM')
+        self.assertEqual(JsonWebKey.JWK_KEY_CLS['OKP'].kty, 'OKP')
+        self.assertEqual(rfc7518.ECDHESAlgorithm.__name__, 'ECDHESAlgorithm')
+
+    def test_lazy_registry(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {'a': 'A', 'b': 'B'}
+
+        registry = LazyRegistry()
+        registry.register_lazy(['a', 'b'], loader)
+        self.assertIn('a', registry)
+        self.assertEqual(list(registry.keys()), ['a', 'b'])
+        self.assertEqual(calls, [])
+
+        registry['b'] = 'custom'
+        self.assertEqual(registry['a'], 'A')
+        self.assertEqual(registry.get('b'), 'custom')
+        self.assertIsNone(registry.get('c'))
+        self.assertEqual(dict(registry.items()), {'a': 'A', 'b': 'custom'})
+        self.assertEqual(calls, [1])
+
+    def test_copy_lazy_registry(self):
+        def create_registry():
+            registry = LazyRegistry({'a': 'A'})
+            registry.register_lazy(['b', 'c'], lambda: {'b': 'B', 'c': 'C'})
+            return registry
+
+        expected = {'a': 'A', 'b': 'B', 'c': 'C'}
+        self.assertEqual(dict(create_registry()), expected)
+        self.assertEqual({**create_registry()}, expected)
+        copied = {}
+        copied.update(create_registry())
+        self.assertEqual(copied, expected)
+        dict.update(copied, create_registry())
+        self.assertEqual(copied, expected)
+        self.assertEqual(dict(create_registry().copy()), expected)
+        self.assertEqual(create_registry(), expected)
+
+        registry = create_registry()
+        del registry['b']
+        self.assertEqual(list(registry), ['a', 'c'])
+        self.assertEqual(len(registry), 2)
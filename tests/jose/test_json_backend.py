@@ -0,0 +1,91 @@
+import json
+import unittest
+from collections import OrderedDict
+from authlib.common import encoding
+from authlib.common.encoding import json_dumps, json_loads
+from authlib.jose import JsonWebKey, JsonWebSignature, jwt
+from tests.util import read_file_path
+
+
+def _is_available(name):
+    try:
+        encoding.JSON_BACKENDS[name]()
+        return True
+    except ImportError:
+        return False
+
+
+BACKENDS = [name for name in encoding.JSON_BACKENDS if _is_available(name)]
+
+VECTORS = [
+    read_file_path('jwk_private.json'),
+    read_file_path('jwks_public.json'),
+    read_file_path('secp521r1-private.json'),
+    read_file_path('thumbprint_example.json'),
+    {'alg': 'RS256', 'kid': 'bilbo.baggins@hobbiton.example', 'typ': 'JWT'},
+    {'iss': 'https://example.com/', 'aud': ['a', 'b'], 'exp': 1300819380, 'admin': True},
+    {'name': 'Jöhn Dœ', 'nick': '小明', 'emoji': '\U0001f600', 'quote': '"\\/\n\t'},
+    {'sub': None, 'scope': '', 'n': 0, 'ratio': 0.5, 'big': 2 ** 70},
+    OrderedDict([('kty', 'oct'), ('k', 'AyM1SysPpbyDfgZld3umj1qzKObwVMkoqQ-EstJQLr_T')]),
+    [1, 'two', {'3': [4]}],
+]
+
+
+class JSONBackendTest(unittest.TestCase):
+    def tearDown(self):
+        encoding.set_json_backend('json')
+
+    def test_set_json_backend(self):
+        self.assertEqual(encoding.get_json_backend(), 'json')
+        name = encoding.set_json_backend()
+        self.assertIn(name, BACKENDS)
+        self.assertEqual(encoding.get_json_backend(), name)
+        self.assertRaises(ValueError, encoding.set_json_backend, 'invalid')
+
+    def test_byte_identical_dumps(self):
+        expected = [json_dumps(v) for v in VECTORS]
+        for name in BACKENDS:
+            encoding.set_json_backend(name)
+            with self.subTest(backend=name):
+                for v, s in zip(VECTORS, expected):
+                    self.assertEqual(json_dumps(v), s)
+                    self.assertEqual(json_loads(s), json_loads(json_dumps(v)))
+                self.assertEqual(json_dumps({'a': 'é'}, ensure_ascii=True), '{"a":"\\u00e9"}')
+                self.assertRaises(ValueError, json_loads, '{"a":')
+                self.assertRaises(TypeError, json_dumps, {'a': object()})
+
+    def test_loads_as_stdlib(self):
+        vectors = [
+            '{"exp":1300819380,"ratio":0.5,"neg":-1}',
+            '{"big":%d,"neg":%d}' % (2 ** 70 + 1, -(2 ** 63) - 1),
+            '{"max":%d,"min":%d}' % (2 ** 64 - 1, -(2 ** 63)),
+            '{"id":"12345678901234567890","pi":3.14159265358979323846}',
+            '[%d]' % (10 ** 40 + 7),
+        ]
+        for name in BACKENDS:
+            encoding.set_json_backend(name)
+            with self.subTest(backend=name):
+                for s in vectors:
+                    expected = repr(json.loads(s))
+                    self.assertEqual(repr(json_loads(s)), expected)
+                    self.assertEqual(repr(json_loads(s.encode('utf-8'))), expected)
+
+    def test_jose_vectors(self):
+        # https://tools.ietf.org/html/rfc7638#section-3.1
+        thumbprint = 'NzbLsXh8uDCcd-6MNwXF4W_7noWXFZAfHkxZsRGC9Xs'
+        jws = JsonWebSignature()
+        header = {'alg': 'HS256', 'kid': 'é'}
+        payload = {'iss': 'joe', 'exp': 1300819380, 'http://example.com/is_root': True}
+        expected_jws = jws.serialize_compact(header, json_dumps(payload), 'secret')
+        expected_jwt = jwt.encode(dict(header), payload, 'secret')
+
+        for name in BACKENDS:
+            encoding.set_json_backend(name)
+            with self.subTest(backend=name):
+                key = JsonWebKey.import_key(read_file_path('thumbprint_example.json'))
+                self.assertEqual(key.thumbprint(), thumbprint)
+
+                s = jws.serialize_compact(header, json_dumps(payload), 'secret')
+                self.assertEqual(s, expected_jws)
+                self.assertEqual(jwt.encode(dict(header), payload, 'secret'), expected_jwt)
+                self.assertEqual(jwt.decode(expected_jwt, 'secret'), payload)
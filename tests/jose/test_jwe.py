@@ -1,12 +1,18 @@
+import io
 import json
 import os
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives.keywrap import InvalidUnwrap
 from authlib.common.encoding import urlsafe_b64encode, json_b64encode, to_bytes, to_unicode
-from authlib.jose import JsonWebEncryption
-from authlib.jose import OctKey, OKPKey
+from authlib.common.encoding import urlsafe_b64decode
+from authlib.jose import JsonWebEncryption, HeaderCache
+from authlib.jose import OctKey, OKPKey, ECKey
 from authlib.jose import errors
 from authlib.jose.drafts import register_jwe_draft
+from authlib.jose.rfc7518 import DeflateZipAlgorithm
+from authlib.jose.rfc7518 import DerivedKeyCache, set_derived_key_cache, get_derived_key_cache
 from authlib.jose.errors import InvalidAlgorithmForMultipleRecipientsMode, DecodeError, InvalidHeaderParameterNameError
 from authlib.jose.util import extract_header
 from tests.util import read_file_path
@@ -175,6 +181,16 @@ class JWETest(unittest.TestCase):
         self.assertEqual(payload, b'hello')
         self.assertEqual(header['alg'], 'RSA-OAEP')
 
+    def test_compact_header_cache(self):
+        jwe = JsonWebEncryption()
+        header_cache = HeaderCache()
+        s = jwe.serialize_compact({'alg': 'dir', 'enc': 'A128GCM'}, 'hello', b'k' * 16)
+        for _ in range(2):
+            data = jwe.deserialize_compact(s, b'k' * 16, header_cache=header_cache)
+            self.assertEqual(data['payload'], b'hello')
+            self.assertEqual(data['header'], {'alg': 'dir', 'enc': 'A128GCM'})
+        self.assertEqual(len(header_cache), 1)
+
     def test_with_zip_header(self):
         jwe = JsonWebEncryption()
         s = jwe.serialize_compact(
@@ -187,6 +203,133 @@ class JWETest(unittest.TestCase):
         self.assertEqual(payload, b'hello')
         self.assertEqual(header['alg'], 'RSA-OAEP')
 
+    def test_zip_bomb(self):
+        jwe = JsonWebEncryption()
+        key = os.urandom(16)
+        protected = {'alg': 'A128KW', 'enc': 'A128GCM', 'zip': 'DEF'}
+        payload = b'0' * (11 * 1024 * 1024)
+        s = jwe.serialize_compact(protected, payload, key)
+        self.assertLess(len(s), 50000)
+        self.assertRaises(DecodeError, jwe.deserialize_compact, s, key)
+
+        rv = jwe.deserialize_compact_stream(s, key, chunk_size=4096)
+        size = 0
+        with self.assertRaises(DecodeError):
+            for chunk in rv['payload']:
+                size += len(chunk)
+        self.assertLessEqual(size, DeflateZipAlgorithm.MAX_SIZE)
+
+    def test_deflate_zip_algorithm_stream_limits(self):
+        def decompress(zip_alg, data, chunk_size=10):
+            d = zip_alg.decompressor()
+            rv = b''
+            for i in range(0, len(data), chunk_size):
+                rv += d.decompress(data[i:i + chunk_size], 100)
+                while d.unconsumed_tail:
+                    rv += d.decompress(d.unconsumed_tail, 100)
+            return rv + d.flush()
+
+        zip_alg = DeflateZipAlgorithm(max_size=1000)
+        self.assertEqual(decompress(zip_alg, zip_alg.compress(b'a' * 1000)), b'a' * 1000)
+        self.assertRaises(DecodeError, decompress, zip_alg, zip_alg.compress(b'a' * 1001))
+
+        zip_alg = DeflateZipAlgorithm(max_ratio=10)
+        self.assertRaises(DecodeError, decompress, zip_alg, zip_alg.compress(b'a' * 1000))
+        payload = os.urandom(1000)
+        self.assertEqual(decompress(zip_alg, zip_alg.compress(payload)), payload)
+
+        self.assertRaises(DecodeError, decompress, zip_alg, b'invalid')
+        self.assertRaises(DecodeError, decompress, zip_alg, zip_alg.compress(payload)[:-10])
+
+    def test_deflate_zip_algorithm_limits(self):
+        zip_alg = DeflateZipAlgorithm(max_size=1000)
+        data = zip_alg.compress(b'a' * 1000)
+        self.assertEqual(zip_alg.decompress(data), b'a' * 1000)
+        data = zip_alg.compress(b'a' * 1001)
+        self.assertRaises(DecodeError, zip_alg.decompress, data)
+
+        zip_alg = DeflateZipAlgorithm(max_ratio=10)
+        self.assertRaises(DecodeError, zip_alg.decompress, zip_alg.compress(b'a' * 1000))
+        payload = os.urandom(1000)
+        self.assertEqual(zip_alg.decompress(zip_alg.compress(payload)), payload)
+
+        self.assertRaises(DecodeError, zip_alg.decompress, b'invalid')
+        self.assertRaises(DecodeError, zip_alg.decompress, zip_alg.compress(payload)[:-10])
+
+    def test_deflate_zip_algorithm_level(self):
+        payload = json.dumps({'k{}'.format(i): 'v' * (i % 7) for i in range(2000)}).encode()
+        fast = DeflateZipAlgorithm(level=1).compress(payload)
+        best = DeflateZipAlgorithm(level=9).compress(payload)
+        self.assertLess(len(best), len(fast))
+        self.assertEqual(DeflateZipAlgorithm().decompress(best), payload)
+        self.assertRaises(ValueError, DeflateZipAlgorithm, level=10)
+
+    def test_compact_stream(self):
+        jwe = JsonWebEncryption()
+        payload = os.urandom(1000) + b'a' * 5000
+        _enc_choices = [
+            'A128CBC-HS256', 'A192CBC-HS384', 'A256CBC-HS512',
+            'A128GCM', 'A192GCM', 'A256GCM'
+        ]
+        for enc in _enc_choices:
+            for zip_alg in (None, 'DEF'):
+                protected = {'alg': 'RSA-OAEP', 'enc': enc}
+                if zip_alg:
+                    protected['zip'] = zip_alg
+                chunks = jwe.serialize_compact_stream(
+                    protected, io.BytesIO(payload),
+                    read_file_path('rsa_public.pem'), chunk_size=100,
+                )
+                s = b''.join(chunks)
+                rv = jwe.deserialize_compact(s, read_file_path('rsa_private.pem'))
+                self.assertEqual(rv['payload'], payload)
+
+                rv = jwe.deserialize_compact_stream(
+                    io.BytesIO(s), read_file_path('rsa_private.pem'), chunk_size=77)
+                self.assertEqual(rv['header']['enc'], enc)
+                chunks = list(rv['payload'])
+                self.assertEqual(b''.join(chunks), payload)
+                self.assertTrue(all(len(c) <= 120 for c in chunks))
+
+    def test_compact_stream_from_compact(self):
+        jwe = JsonWebEncryption()
+        key = os.urandom(16)
+        protected = {'alg': 'A128KW', 'enc': 'A128GCM', 'zip': 'DEF'}
+        s = jwe.serialize_compact(protected, b'hello' * 100, key)
+        rv = jwe.deserialize_compact_stream([s[:10], s[10:50], s[50:]], key, chunk_size=8)
+        self.assertEqual(b''.join(rv['payload']), b'hello' * 100)
+
+        s = b''.join(jwe.serialize_compact_stream(protected, [b'hello'] * 100, key))
+        self.assertEqual(jwe.deserialize_compact(s, key)['payload'], b'hello' * 100)
+
+    def test_compact_stream_invalid_tag(self):
+        jwe = JsonWebEncryption()
+        for enc, key in (('A128CBC-HS256', os.urandom(32)), ('A128GCM', os.urandom(16))):
+            protected = {'alg': 'dir', 'enc': enc}
+            s = b''.join(jwe.serialize_compact_stream(protected, b'hello' * 100, key))
+            header, tag = s.rsplit(b'.', 1)
+            tag = urlsafe_b64encode(bytes(b ^ 1 for b in urlsafe_b64decode(tag)))
+            rv = jwe.deserialize_compact_stream(header + b'.' + tag, key)
+            self.assertRaises(InvalidTag, b''.join, rv['payload'])
+
+        self.assertRaises(DecodeError, jwe.deserialize_compact_stream, b'a.b', b'k')
+        self.assertRaises(DecodeError, jwe.deserialize_compact_stream, b'e30', b'k')
+
+    def test_compact_stream_not_supported(self):
+        jwe = JsonWebEncryption()
+        key = OctKey.generate_key(256, is_private=True)
+        self.assertRaises(
+            ValueError, jwe.serialize_compact_stream,
+            {'alg': 'dir', 'enc': 'C20P'}, b'hello', key,
+        )
+        alice_key = OKPKey.generate_key('X25519', is_private=True)
+        bob_key = OKPKey.generate_key('X25519', is_private=True)
+        self.assertRaises(
+            ValueError, jwe.serialize_compact_stream,
+            {'alg': 'ECDH-1PU+A128KW', 'enc': 'A128CBC-HS256'}, b'hello',
+            bob_key, sender_key=alice_key,
+        )
+
     def test_aes_jwe(self):
         jwe = JsonWebEncryption()
         sizes = [128, 192, 256]
@@ -1611,3 +1754,161 @@ class JWETest(unittest.TestCase):
 
         rv = jwe.deserialize(data_as_string, bob_key, sender_key=alice_key)
         self.assertEqual(rv['payload'], b'hello')
+
+
+    def test_serialize_json_with_executor(self):
+        jwe = JsonWebEncryption()
+        sender_key = OKPKey.generate_key('X25519', is_private=True)
+        cases = [
+            ('A128KW', 'A128GCM', [OctKey.generate_key(128, is_private=True) for _ in range(6)], None),
+            ('RSA-OAEP', 'A128GCM', [read_file_path('rsa_private.pem')] * 3, None),
+            ('ECDH-1PU+A128KW', 'A128CBC-HS256',
+             [OKPKey.generate_key('X25519', is_private=True) for _ in range(6)], sender_key),
+        ]
+        with ThreadPoolExecutor(4) as executor:
+            for alg, enc, keys, sender in cases:
+                header_obj = {
+                    'protected': {'alg': alg, 'enc': enc},
+                    'recipients': [{'header': {'kid': str(i)}} for i in range(len(keys))],
+                }
+                data = jwe.serialize_json(
+                    header_obj, b'hello', keys, sender_key=sender, executor=executor)
+                kids = [r['header']['kid'] for r in data['recipients']]
+                self.assertEqual(kids, [str(i) for i in range(len(keys))])
+                for i, key in enumerate(keys):
+                    rv = jwe.deserialize_json(data, (str(i), key), sender_key=sender)
+                    self.assertEqual(rv['payload'], b'hello')
+
+    def test_deserialize_json_recipient_index(self):
+        jwe = JsonWebEncryption()
+        keys = [OKPKey.generate_key('X25519', {'kid': str(i)}, is_private=True) for i in range(5)]
+        protected = {'alg': 'ECDH-ES+A128KW', 'enc': 'A128GCM'}
+
+        def serialize(headers):
+            header_obj = {'protected': protected, 'recipients': [{'header': h} for h in headers]}
+            return jwe.serialize_json(header_obj, b'hello', keys)
+
+        def assert_unwrap_attempts(data, key, attempts):
+            metrics = {}
+            rv = jwe.deserialize_json(data, key, metrics=metrics)
+            self.assertEqual(rv['payload'], b'hello')
+            self.assertEqual(metrics['unwrap_attempts'], attempts)
+
+        # by kid
+        data = serialize([{'kid': k.kid} for k in keys])
+        assert_unwrap_attempts(data, keys[4], 1)
+
+        # by thumbprint
+        data = serialize([{'kid': k.thumbprint()} for k in keys])
+        assert_unwrap_attempts(data, keys[4], 1)
+
+        # by jwk
+        data = serialize([{'jwk': k.as_dict(is_private=False)} for k in keys])
+        assert_unwrap_attempts(data, keys[4], 1)
+
+        # by x5t
+        x5t_keys = [OKPKey.import_key(k.as_dict(is_private=True, x5t=str(i))) for i, k in enumerate(keys)]
+        data = serialize([{'x5t': k['x5t']} for k in x5t_keys])
+        assert_unwrap_attempts(data, x5t_keys[4], 1)
+
+        # no identifier, fallback to trial unwrapping
+        data = serialize([{} for _ in keys])
+        assert_unwrap_attempts(data, keys[3], 4)
+
+        # identified for other keys
+        other_key = OKPKey.generate_key('X25519', {'kid': 'other'}, is_private=True)
+        data = serialize([{'kid': k.kid} for k in keys])
+        metrics = {}
+        self.assertRaises(
+            errors.KeyMismatchError,
+            jwe.deserialize_json, data, other_key, metrics=metrics
+        )
+        self.assertEqual(metrics['unwrap_attempts'], 0)
+
+class DerivedKeyCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = DerivedKeyCache(maxsize=8)
+        set_derived_key_cache(self.cache)
+
+    def tearDown(self):
+        set_derived_key_cache(None)
+
+    def test_ecdh_es(self):
+        jwe = JsonWebEncryption()
+        key = ECKey.generate_key('P-256', {'kid': 'k1'}, is_private=True)
+        for alg in ('ECDH-ES', 'ECDH-ES+A128KW'):
+            protected = {'alg': alg, 'enc': 'A128GCM', 'apu': 'QWxpY2U'}
+            data = jwe.serialize_compact(protected, b'hello', key)
+            for _ in range(3):
+                rv = jwe.deserialize_compact(data, key)
+                self.assertEqual(rv['payload'], b'hello')
+
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(self.cache.hits, 4)
+
+        # other apv value derives another key
+        header, rest = data.split(b'.', 1)
+        header = extract_header(header, DecodeError)
+        header['apv'] = 'Qm9i'
+        data = json_b64encode(header) + b'.' + rest
+        self.assertRaises(Exception, jwe.deserialize_compact, data, key)
+        self.assertEqual(self.cache.misses, 3)
+
+        # a rotated key with the same kid never reuses derived keys
+        new_key = ECKey.generate_key('P-256', {'kid': 'k1'}, is_private=True)
+        data = jwe.serialize_compact({'alg': 'ECDH-ES', 'enc': 'A128GCM'}, b'hello', new_key)
+        self.assertEqual(jwe.deserialize_compact(data, new_key)['payload'], b'hello')
+        self.assertEqual(self.cache.misses, 4)
+
+        self.cache.clear('other')
+        self.assertEqual(len(self.cache), 4)
+
+        # key_ops and use of the ephemeral key are checked on a cache hit
+        header, rest = data.split(b'.', 1)
+        header = extract_header(header, DecodeError)
+        for params in ({'key_ops': ['verify']}, {'use': 'sig'}):
+            epk_header = dict(header, epk=dict(header['epk'], **params))
+            bad_data = json_b64encode(epk_header) + b'.' + rest
+            self.assertRaises(
+                (ValueError, errors.InvalidUseError),
+                jwe.deserialize_compact, bad_data, new_key)
+        self.assertEqual(self.cache.misses, 4)
+        self.cache.clear('k1')
+        self.assertEqual(len(self.cache), 0)
+
+    def test_ecdh_1pu(self):
+        jwe = JsonWebEncryption()
+        alice_key = OKPKey.generate_key('X25519', is_private=True)
+        bob_key = OKPKey.generate_key('X25519', is_private=True)
+        eve_key = OKPKey.generate_key('X25519', is_private=True)
+        protected = {'alg': 'ECDH-1PU+A128KW', 'enc': 'A128CBC-HS256'}
+        data = jwe.serialize_compact(protected, b'hello', bob_key, sender_key=alice_key)
+        for _ in range(2):
+            rv = jwe.deserialize_compact(data, bob_key, sender_key=alice_key)
+            self.assertEqual(rv['payload'], b'hello')
+        self.assertEqual(self.cache.hits, 1)
+
+        # key_ops of the sender key are checked on a cache hit
+        sender_key = OKPKey.import_key(alice_key.as_dict(is_private=False), {'key_ops': ['verify']})
+        self.assertRaises(ValueError, jwe.deserialize_compact, data, bob_key, sender_key=sender_key)
+        self.assertEqual(self.cache.hits, 1)
+
+        # the sender key is a part of the cache key
+        self.assertRaises(Exception, jwe.deserialize_compact, data, bob_key, sender_key=eve_key)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_ttl_and_maxsize(self):
+        jwe = JsonWebEncryption()
+        key = ECKey.generate_key('P-256', is_private=True)
+        set_derived_key_cache(DerivedKeyCache(maxsize=2, ttl=0))
+        cache = get_derived_key_cache()
+        data = jwe.serialize_compact({'alg': 'ECDH-ES', 'enc': 'A128GCM'}, b'hello', key)
+        jwe.deserialize_compact(data, key)
+        jwe.deserialize_compact(data, key)
+        self.assertEqual(cache.hits, 0)
+
+        for _ in range(3):
+            data = jwe.serialize_compact({'alg': 'ECDH-ES', 'enc': 'A128GCM'}, b'hello', key)
+            jwe.deserialize_compact(data, key)
+        self.assertEqual(len(cache), 2)
+        self.assertRaises(ValueError, DerivedKeyCache, maxsize=0)
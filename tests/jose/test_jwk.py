@@ -1,6 +1,10 @@
+import time
 import unittest
-from authlib.jose import JsonWebKey, KeySet
+import threading
+from authlib.jose import JsonWebKey, KeySet, LazyKeySet, RemoteKeySet, jwt
 from authlib.jose import OctKey, RSAKey, ECKey, OKPKey
+from authlib.jose.errors import InvalidUseError
+from authlib.jose.rfc7517 import KeyCache, set_key_cache
 from authlib.common.encoding import base64_to_int, json_dumps
 from tests.util import read_file_path
 
@@ -38,6 +42,24 @@ class OctKeyTest(BaseTest):
 
         key = OctKey.generate_key()
         self.assertIn('kid', key.as_dict())
+
+    def test_oct_key_tokens_cache(self):
+        key = OctKey.import_key('secret', {'kid': 'a', 'use': 'sig'})
+        self.assertEqual(key.kid, 'a')
+        self.assertEqual(key.get_op_key('sign'), b'secret')
+
+        # tokens returns a copy
+        key.tokens['kid'] = 'b'
+        self.assertEqual(key.kid, 'a')
+
+        OctKey.import_key(key, {'kid': 'b', 'use': 'enc'})
+        self.assertEqual(key.kid, 'b')
+        self.assertRaises(InvalidUseError, key.get_op_key, 'sign')
+
+        key.options = {'key_ops': ['verify']}
+        self.assertEqual(key.kid, None)
+        self.assertEqual(key.get_op_key('verify'), b'secret')
+        self.assertRaises(ValueError, key.get_op_key, 'sign')
         self.assertNotIn('use', key.as_dict())
 
         key2 = OctKey.import_key(key, {'use': 'sig'})
@@ -261,3 +283,293 @@ class JWKTest(BaseTest):
         obj = key_set.as_dict()['keys'][0]
         self.assertIn('kid', obj)
         self.assertEqual(key_set.as_json()[0], '{')
+
+    def test_key_set_index(self):
+        k1 = OctKey.import_key('a', {'kid': 'k1', 'alg': 'HS256', 'use': 'sig'})
+        k2 = OctKey.import_key('b', {'kid': 'k2', 'alg': 'HS384', 'use': 'sig'})
+        k3 = RSAKey.import_key(read_file_path('rsa_public.pem'), {'kid': 'k3', 'use': 'enc'})
+        key_set = KeySet([k1, k2])
+
+        self.assertIs(key_set.find_by_kid('k1'), k1)
+        self.assertRaises(ValueError, key_set.find_by_kid, 'k3')
+        self.assertRaises(ValueError, key_set.find_by_kid, [])
+        key_set.add_key(k3)
+        self.assertIs(key_set.find_by_kid('k3'), k3)
+
+        self.assertEqual(key_set.find_keys(kty='oct'), [k1, k2])
+        self.assertEqual(key_set.find_keys(kty='oct', alg='HS384'), [k2])
+        self.assertEqual(key_set.find_keys(use='enc'), [k3])
+        self.assertEqual(key_set.find_keys(kty='RSA', use='sig'), [])
+        self.assertEqual(key_set.find_keys(), [k1, k2, k3])
+
+        key_set.remove_key(k1)
+        self.assertRaises(ValueError, key_set.find_by_kid, 'k1')
+        self.assertEqual(key_set.find_keys(kty='oct'), [k2])
+        self.assertEqual(key_set.keys, [k2, k3])
+
+    def test_key_set_index_in_place_changes(self):
+        k1 = OctKey.import_key('a', {'kid': 'k1', 'use': 'sig'})
+        k2 = OctKey.import_key('b', {'kid': 'k2', 'use': 'enc'})
+        k3 = OctKey.import_key('c', {'kid': 'k3', 'use': 'enc'})
+        key_set = KeySet([k1])
+        self.assertIs(key_set.find_by_kid('k1'), k1)
+
+        key_set.keys.append(k2)
+        self.assertIs(key_set.find_by_kid('k2'), k2)
+        key_set.keys.extend([k3])
+        self.assertEqual(key_set.find_keys(use='enc'), [k2, k3])
+        key_set.keys[0] = k3
+        self.assertRaises(ValueError, key_set.find_by_kid, 'k1')
+        self.assertEqual(key_set.find_keys(use='enc'), [k3, k2, k3])
+        del key_set.keys[1:]
+        key_set.keys.remove(k3)
+        self.assertEqual(key_set.find_keys(), [])
+        self.assertRaises(ValueError, key_set.find_by_kid, 'k3')
+
+        key_set.keys += [k1]
+        self.assertIs(key_set.find_by_kid('k1'), k1)
+
+
+class LazyKeySetTest(BaseTest):
+    def get_raw_keys(self):
+        private_key = JsonWebKey.import_key(read_file_path('jwks_private.json')['keys'][0])
+        data = private_key.as_dict(is_private=True)
+        # drop CRT parameters, they are recovered when the key is imported
+        for k in ('p', 'q', 'dp', 'dq', 'qi'):
+            data.pop(k)
+        raw_keys = []
+        for i in range(5):
+            raw_keys.append(dict(data, kid='rsa-{}'.format(i), use='sig'))
+        raw_keys.append(OctKey.generate_key(256, {'kid': 'oct', 'use': 'enc'}, True).as_dict(True))
+        return raw_keys
+
+    def test_import_lazy_key_set(self):
+        raw_keys = self.get_raw_keys()
+        key_set = JsonWebKey.import_key_set({'keys': raw_keys}, lazy=True)
+        self.assertIsInstance(key_set, LazyKeySet)
+        self.assertEqual(key_set.materialized_count, 0)
+
+        key = key_set.find_by_kid('rsa-1')
+        self.assertIsInstance(key, RSAKey)
+        self.assertIs(key_set.find_by_kid('rsa-1'), key)
+        self.assertEqual(key_set.materialized_count, 1)
+        self.assertIn('p', key.tokens)
+        # raw dicts are not modified
+        self.assertNotIn('p', raw_keys[1])
+        self.assertRaises(ValueError, key_set.find_by_kid, 'invalid')
+        self.assertRaises(ValueError, key_set.find_by_kid, {'kid': 'rsa-1'})
+
+        keys = key_set.find_keys(kty='oct', use='enc')
+        self.assertEqual([k.kid for k in keys], ['oct'])
+        self.assertEqual(key_set.materialized_count, 2)
+
+        self.assertEqual(len(key_set.keys), 6)
+        self.assertEqual(key_set.materialized_count, 6)
+
+    def test_lazy_key_set_budget(self):
+        key_set = JsonWebKey.import_key_set(self.get_raw_keys(), lazy=True, max_materialized=2)
+        key0 = key_set.find_by_kid('rsa-0')
+        key_set.find_by_kid('rsa-1')
+        key_set.find_by_kid('rsa-0')
+        key_set.find_by_kid('rsa-2')
+        self.assertEqual(key_set.materialized_count, 2)
+        self.assertIs(key_set.find_by_kid('rsa-0'), key0)
+        self.assertIsNot(key_set.find_by_kid('rsa-1'), key0)
+        self.assertEqual(key_set.materialized_count, 2)
+
+        self.assertRaises(
+            ValueError, JsonWebKey.import_key_set,
+            self.get_raw_keys(), lazy=True, max_materialized=0,
+        )
+
+    def test_lazy_key_set_add_remove(self):
+        key_set = JsonWebKey.import_key_set(self.get_raw_keys(), lazy=True, max_materialized=1)
+        key = key_set.find_by_kid('rsa-3')
+        key_set.find_by_kid('rsa-4')
+        key_set.remove_key(key)
+        self.assertRaises(ValueError, key_set.find_by_kid, 'rsa-3')
+        self.assertRaises(ValueError, key_set.remove_key, key)
+
+        new_key = OctKey.generate_key(256, {'kid': 'new'}, True)
+        key_set.add_key(new_key)
+        key_set.add_key({'kty': 'oct', 'kid': 'raw', 'k': 'c2VjcmV0'})
+        self.assertIs(key_set.find_by_kid('new'), new_key)
+        self.assertEqual(key_set.find_by_kid('raw').kid, 'raw')
+        self.assertEqual(len(key_set.find_keys(kty='oct')), 3)
+
+    def test_lazy_key_set_jwt(self):
+        raw_keys = self.get_raw_keys()
+        key_set = JsonWebKey.import_key_set(raw_keys, lazy=True)
+        private_key = JsonWebKey.import_key(raw_keys[2])
+        s = jwt.encode({'alg': 'RS256', 'kid': 'rsa-2'}, {'sub': 'a'}, private_key)
+        self.assertEqual(jwt.decode(s, key_set)['sub'], 'a')
+        self.assertEqual(key_set.materialized_count, 1)
+
+    def test_lazy_key_set_jwt_encode(self):
+        raw_keys = [k for k in self.get_raw_keys() if k['kty'] == 'RSA']
+        key_set = JsonWebKey.import_key_set(raw_keys, lazy=True)
+        header = {'alg': 'RS256'}
+        s = jwt.encode(header, {'sub': 'a'}, key_set)
+        self.assertIn(header['kid'], [k['kid'] for k in raw_keys])
+        self.assertEqual(key_set.materialized_count, 1)
+        self.assertEqual(jwt.decode(s, key_set)['sub'], 'a')
+
+
+class KeyCacheTest(BaseTest):
+    def setUp(self):
+        self.cache = KeyCache(maxsize=2)
+        set_key_cache(self.cache)
+
+    def tearDown(self):
+        set_key_cache(None)
+
+    def test_cache_pem_key(self):
+        pem = read_file_path('rsa_public.pem')
+        k1 = RSAKey.import_key(pem)
+        k2 = RSAKey.import_key(pem)
+        self.assertIs(k1.get_public_key(), k2.get_public_key())
+        self.assertEqual(self.cache.cache_info(), (1, 1, 2, 1))
+
+        k3 = JsonWebKey.import_key(pem)
+        self.assertIsInstance(k3, RSAKey)
+        self.assertEqual(self.cache.cache_info().currsize, 2)
+
+    def test_cache_dict_key(self):
+        obj = read_file_path('jwk_private.json')
+        k1 = JsonWebKey.import_key(obj)
+        k2 = JsonWebKey.import_key(dict(obj, kid='another'))
+        self.assertIs(k1.get_private_key(), k2.get_private_key())
+        self.assertEqual(self.cache.hits, 1)
+
+        # rsa private key without CRT parameters
+        obj = {k: obj[k] for k in ['kty', 'n', 'e', 'd']}
+        key = RSAKey.import_key(dict(obj))
+        self.assertIn('dp', key.as_dict(is_private=True))
+        RSAKey.import_key(dict(obj))
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_cache_eviction(self):
+        for crv in ['P-256', 'P-384', 'P-521']:
+            key = ECKey.generate_key(crv, is_private=True)
+            ECKey.import_key(key.as_dict(is_private=True)).get_private_key()
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.misses, 3)
+
+        self.cache.clear()
+        self.assertEqual(self.cache.cache_info(), (0, 0, 2, 0))
+        self.assertRaises(ValueError, KeyCache, 0)
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.data = data
+        self.headers = headers or {}
+
+    def json(self):
+        return self.data
+
+
+class FakeJWKSServer(object):
+    def __init__(self, keys, headers=None):
+        self.keys = keys
+        self.headers = headers or {}
+        self.etag = '"v1"'
+        self.requests = []
+        self.delay = 0
+        self.fail = False
+
+    def __call__(self, headers):
+        self.requests.append(headers)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            return FakeResponse(500)
+        if headers.get('If-None-Match') == self.etag:
+            return FakeResponse(304, headers=self.headers)
+        resp_headers = dict(self.headers, ETag=self.etag)
+        return FakeResponse(200, {'keys': self.keys}, resp_headers)
+
+
+class RemoteKeySetTest(BaseTest):
+    def setUp(self):
+        self.key1 = OctKey.generate_key(256, {'kid': 'k1'}, is_private=True)
+        self.key2 = OctKey.generate_key(256, {'kid': 'k2'}, is_private=True)
+
+    def test_jwt_decode(self):
+        server = FakeJWKSServer([self.key1.as_dict(True)])
+        key_set = RemoteKeySet(server)
+        s = jwt.encode({'alg': 'HS256', 'kid': 'k1'}, {'sub': 'a'}, self.key1)
+        self.assertEqual(jwt.decode(s, key_set)['sub'], 'a')
+        self.assertEqual(jwt.decode(s, key_set)['sub'], 'a')
+        self.assertEqual(len(server.requests), 1)
+
+    def test_cache_control_and_etag(self):
+        server = FakeJWKSServer(
+            [self.key1.as_dict(True)],
+            {'cache-control': 'public, max-age=600'},
+        )
+        key_set = RemoteKeySet(server, min_ttl=0)
+        key_set.get_key_set()
+        self.assertAlmostEqual(key_set._expires_at - time.monotonic(), 600, delta=5)
+
+        key_set._expires_at = 0
+        self.assertEqual(key_set.find_by_kid('k1').kid, 'k1')
+        self.assertEqual(server.requests[-1], {'If-None-Match': '"v1"'})
+        self.assertEqual(len(server.requests), 2)
+
+        server.headers = {'Cache-Control': 'no-store'}
+        key_set = RemoteKeySet(server, min_ttl=10)
+        key_set.get_key_set()
+        self.assertAlmostEqual(key_set._expires_at - time.monotonic(), 10, delta=5)
+
+    def test_unknown_kid_cooldown(self):
+        server = FakeJWKSServer([self.key1.as_dict(True)])
+        key_set = RemoteKeySet(server, unknown_kid_cooldown=60)
+        key_set.get_key_set()
+
+        server.keys = [self.key1.as_dict(True), self.key2.as_dict(True)]
+        server.etag = '"v2"'
+        self.assertEqual(key_set.find_by_kid('k2').kid, 'k2')
+        self.assertEqual(len(server.requests), 2)
+
+        self.assertRaises(ValueError, key_set.find_by_kid, 'k3')
+        self.assertRaises(ValueError, key_set.find_by_kid, 'k3')
+        self.assertEqual(len(server.requests), 2)
+
+    def test_single_flight(self):
+        server = FakeJWKSServer([self.key1.as_dict(True)])
+        server.delay = 0.05
+        key_set = RemoteKeySet(server)
+        threads = [
+            threading.Thread(target=key_set.find_by_kid, args=('k1',))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(server.requests), 1)
+
+    def test_background_refresh(self):
+        server = FakeJWKSServer([self.key1.as_dict(True)])
+        key_set = RemoteKeySet(server, refresh_ahead=30)
+        key_set.get_key_set()
+        key_set._expires_at = time.monotonic() + 10
+        self.assertEqual(key_set.find_by_kid('k1').kid, 'k1')
+        for _ in range(100):
+            if len(server.requests) == 2 and not key_set._background_refreshing:
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(server.requests), 2)
+        self.assertGreater(key_set._expires_at - time.monotonic(), 100)
+
+    def test_keep_stale_key_set(self):
+        server = FakeJWKSServer([self.key1.as_dict(True)])
+        key_set = RemoteKeySet(server)
+        self.assertRaises(ValueError, RemoteKeySet(FakeJWKSServer([])).find_by_kid, 'k1')
+        key_set.get_key_set()
+        server.fail = True
+        key_set._expires_at = 0
+        self.assertEqual(key_set.find_by_kid('k1').kid, 'k1')
+        self.assertEqual(len(server.requests), 2)
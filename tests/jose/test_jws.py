@@ -1,6 +1,11 @@
+import io
+import os
 import unittest
 import json
-from authlib.jose import JsonWebSignature
+from concurrent.futures import ThreadPoolExecutor
+from authlib.common.encoding import urlsafe_b64encode
+from authlib.jose import JsonWebSignature, HeaderCache
+from authlib.jose import OctKey, ECKey, OKPKey
 from authlib.jose import errors
 from tests.util import read_file_path
 
@@ -154,6 +159,29 @@ class JWSTest(unittest.TestCase):
         self.assertEqual(header[0]['alg'], 'HS256')
         self.assertNotIn('signature', data)
 
+    def test_json_jws_with_executor(self):
+        jws = JsonWebSignature()
+        keys = {str(i): 'secret-{}'.format(i) for i in range(8)}
+        header = [{'protected': {'alg': 'HS256', 'kid': kid}} for kid in keys]
+
+        def load_key(header, payload):
+            return keys[header['kid']]
+
+        expected = jws.serialize_json(header, b'hello', load_key)
+        with ThreadPoolExecutor(4) as executor:
+            s = jws.serialize_json(header, b'hello', load_key, executor=executor)
+            self.assertEqual(s, expected)
+
+            data = jws.deserialize_json(s, load_key, executor=executor)
+            self.assertEqual(data['payload'], b'hello')
+            self.assertEqual([h['kid'] for h in data['header']], list(keys))
+
+            s['signatures'][3]['signature'] = s['signatures'][0]['signature']
+            self.assertRaises(
+                errors.BadSignatureError,
+                jws.deserialize_json, s, load_key, executor=executor
+            )
+
     def test_fail_deserialize_json(self):
         jws = JsonWebSignature()
         self.assertRaises(errors.DecodeError, jws.deserialize_json, None, '')
@@ -204,3 +232,136 @@ class JWSTest(unittest.TestCase):
         header, payload = data['header'], data['payload']
         self.assertEqual(payload, b'hello')
         self.assertEqual(header['alg'], 'ES256K')
+
+    def test_compact_header_cache(self):
+        jws = JsonWebSignature()
+        header_cache = HeaderCache(maxsize=1)
+        s1 = jws.serialize({'alg': 'HS256', 'kid': 'a'}, 'hello', 'secret')
+        s2 = jws.serialize({'alg': 'HS384'}, 'hello', 'secret')
+
+        data = jws.deserialize_compact(s1, 'secret', header_cache=header_cache)
+        self.assertEqual(data['header'], {'alg': 'HS256', 'kid': 'a'})
+        self.assertEqual(len(header_cache), 1)
+
+        # cached headers are copied for every call
+        data['header'].protected['kid'] = 'b'
+        data = jws.deserialize_compact(s1, 'secret', header_cache=header_cache)
+        self.assertEqual(data['header']['kid'], 'a')
+
+        jws.deserialize_compact(s2, 'secret', header_cache=header_cache)
+        self.assertEqual(len(header_cache), 1)
+
+        # header with nested values is not cached
+        header_cache.clear()
+        s3 = jws.serialize({'alg': 'HS256', 'crit': ['exp']}, 'hello', 'secret')
+        jws.deserialize_compact(s3, 'secret', header_cache=header_cache)
+        self.assertEqual(len(header_cache), 0)
+
+        self.assertRaises(
+            errors.DecodeError,
+            jws.deserialize_compact, 'W10.a.YQ', 'k', header_cache=header_cache
+        )
+
+    def test_prepare_signer_and_verifier(self):
+        keys = {
+            'HS': 'secret',
+            'RS': read_file_path('rsa_private.pem'),
+            'PS': read_file_path('rsa_private.pem'),
+            'ES256': ECKey.generate_key('P-256', is_private=True),
+            'ES384': ECKey.generate_key('P-384', is_private=True),
+            'ES512': ECKey.generate_key('P-521', is_private=True),
+            'ES256K': ECKey.generate_key('secp256k1', is_private=True),
+            'EdDSA': OKPKey.generate_key('Ed25519', is_private=True),
+        }
+        msg = b'hello'
+        for name, algorithm in JsonWebSignature.ALGORITHMS_REGISTRY.items():
+            if name == 'none':
+                continue
+            raw_key = keys.get(name, keys.get(name[:2]))
+            key = algorithm.prepare_key(raw_key)
+
+            signer = algorithm.prepare(key, 'sign')
+            verifier = algorithm.prepare(key, 'verify')
+            sig = signer.sign(msg)
+            self.assertTrue(algorithm.verify(msg, sig, key), name)
+            self.assertTrue(verifier.verify(msg, sig), name)
+            self.assertTrue(verifier.verify(msg, algorithm.sign(msg, key)), name)
+            self.assertFalse(verifier.verify(b'hallo', sig), name)
+            self.assertFalse(verifier.verify(msg, sig[:-1]), name)
+            self.assertRaises(ValueError, algorithm.prepare, key, 'encrypt')
+
+        key = OctKey.import_key('secret', {'key_ops': ['verify']})
+        algorithm = JsonWebSignature.ALGORITHMS_REGISTRY['HS256']
+        self.assertRaises(ValueError, algorithm.prepare, key, 'sign')
+        algorithm.prepare(key, 'verify')
+
+    def test_rfc7797_unencoded_payload(self):
+        # https://tools.ietf.org/html/rfc7797#section-4.2
+        key = OctKey.import_key({
+            'kty': 'oct',
+            'k': 'AyM1SysPpbyDfgZld3umj1qzKObwVMkoqQ-EstJQLr_T-1qS0gZH75aKtMN3Yj0iPS4hcgUuTwjAzZr1Z9CAow',
+        })
+        jws = JsonWebSignature()
+        protected = {'alg': 'HS256', 'b64': False, 'crit': ['b64']}
+        expected = (
+            b'eyJhbGciOiJIUzI1NiIsImI2NCI6ZmFsc2UsImNyaXQiOlsiYjY0Il19'
+            b'..A5dxf2s96_n5FLueVuW1Z_vh161FwXZC4YLPff6dmDY'
+        )
+        self.assertEqual(jws.serialize_detached(protected, b'$.02', key), expected)
+        data = jws.deserialize_detached(expected, [b'$', b'.02'], key)
+        self.assertEqual(data['header']['b64'], False)
+        self.assertRaises(
+            errors.BadSignatureError,
+            jws.deserialize_detached, expected, b'$.03', key
+        )
+
+        # compact serialization with unencoded payload is opt-in
+        self.assertRaises(ValueError, jws.serialize_compact, protected, b'hello', key)
+        unencoded_jws = JsonWebSignature(allow_unencoded_payload=True)
+        s = unencoded_jws.serialize_compact(protected, b'hello', key)
+        self.assertEqual(s.split(b'.')[1], b'hello')
+        data = unencoded_jws.deserialize_compact(s, key)
+        self.assertEqual(data['payload'], b'hello')
+        self.assertRaises(ValueError, unencoded_jws.serialize_compact, protected, b'$.02', key)
+        self.assertRaises(errors.DecodeError, jws.deserialize_compact, s, key)
+
+        # b64 must be listed in crit
+        self.assertRaises(ValueError, jws.serialize_detached, {'alg': 'HS256', 'b64': False}, b'a', key)
+        self.assertRaises(ValueError, jws.serialize_detached, {'alg': 'HS256', 'b64': 'no'}, b'a', key)
+        s = b'eyJhbGciOiJIUzI1NiIsImI2NCI6ZmFsc2V9..YQ'
+        self.assertRaises(errors.DecodeError, jws.deserialize_detached, s, b'a', key)
+        self.assertRaises(errors.DecodeError, jws.deserialize_detached, b'a.b.c', b'a', key)
+        self.assertRaises(errors.DecodeError, jws.deserialize_detached, b'a..b.c', b'a', key)
+
+    def test_detached_payload_stream(self):
+        keys = {
+            'HS256': 'secret',
+            'RS256': read_file_path('rsa_private.pem'),
+            'PS256': read_file_path('rsa_private.pem'),
+            'ES256': ECKey.generate_key('P-256', is_private=True),
+            'EdDSA': OKPKey.generate_key('Ed25519', is_private=True),
+        }
+        payload = os.urandom(100000)
+        jws = JsonWebSignature()
+        for alg, key in keys.items():
+            for b64 in (True, False):
+                protected = {'alg': alg, 'b64': b64, 'crit': ['b64']}
+                s = jws.serialize_detached(protected, io.BytesIO(payload), key, chunk_size=4096)
+                protected_segment, payload_segment, _ = s.split(b'.')
+                self.assertEqual(payload_segment, b'')
+
+                data = jws.deserialize_detached(s, io.BytesIO(payload), key, chunk_size=1000)
+                self.assertEqual(data['header']['alg'], alg)
+                data = jws.deserialize_detached(s, payload, key)
+                self.assertEqual(data['payload'], payload)
+                self.assertRaises(
+                    errors.BadSignatureError,
+                    jws.deserialize_detached, s, payload[:-1], key
+                )
+
+            # detached content signs the same input as compact serialization
+            s = jws.serialize_detached({'alg': alg}, [payload[:10], payload[10:]], key)
+            protected_segment, _, signature_segment = s.split(b'.')
+            payload_segment = urlsafe_b64encode(payload)
+            compact = b'.'.join([protected_segment, payload_segment, signature_segment])
+            self.assertEqual(jws.deserialize_compact(compact, key)['payload'], payload)
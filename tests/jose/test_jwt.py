@@ -1,7 +1,9 @@
+import asyncio
 import unittest
 import datetime
 from authlib.jose import errors
-from authlib.jose import JsonWebToken, JWTClaims, jwt
+from authlib.jose import JsonWebKey, JsonWebToken, JWTClaims, HeaderCache, jwt
+from authlib.jose import ClaimsValidator, JsonWebSignature
 from authlib.jose.errors import UnsupportedAlgorithmError
 from tests.util import read_file_path
 
@@ -181,6 +183,43 @@ class JWTTest(unittest.TestCase):
             claims.validate
         )
 
+    def test_claims_validator(self):
+        cases = [
+            ({'iss': 'foo'}, {'iss': {'essential': True, 'values': ['foo']}}),
+            ({'iss': 'foo'}, {'sub': {'essential': True}}),
+            ({'iss': ''}, {'iss': {'essential': True}}),
+            ({'iss': 'foo'}, {'iss': {'values': ['bar']}}),
+            ({'iss': 'foo'}, {'iss': {'value': 'bar'}}),
+            ({'iss': None}, {'iss': {'essential': True, 'values': ['foo']}}),
+            ({'aud': 'foo'}, {'aud': {'essential': True, 'value': 'foo'}}),
+            ({'aud': 'foo'}, {'aud': {'values': ['bar']}}),
+            ({'aud': ['foo', 'bar']}, {'aud': {'values': ['bar']}}),
+            ({'aud': ['foo', ['bar']]}, {'aud': {'values': ['baz']}}),
+            ({'aud': ['foo']}, {'aud': {'values': []}}),
+            ({'jti': 'bar'}, {'jti': {'validate': lambda c, o: o == 'foo'}}),
+            ({'custom': 'foo'}, {'custom': {'validate': lambda c, o: o == 'bar'}}),
+            ({'custom': ['foo']}, {'custom': {'values': ['foo', 'bar']}}),
+            ({'custom': ['foo']}, {'custom': {'values': [['foo']]}}),
+        ]
+        for payload, options in cases:
+            with self.subTest(payload=payload, options=options):
+                expected = _validate_error(JWTClaims(payload, {}, options))
+                validator = ClaimsValidator(options)
+                self.assertEqual(_validate_error(JWTClaims(payload, {}, validator)), expected)
+
+    def test_claims_validator_with_decode(self):
+        validator = ClaimsValidator({'iss': {'essential': True, 'values': ['foo']}})
+        self.assertEqual(dict(validator), {'iss': {'essential': True, 'values': ['foo']}})
+        id_token = jwt.encode({'alg': 'HS256'}, {'iss': 'foo'}, 'k')
+        claims = jwt.decode(id_token, 'k', claims_options=validator)
+        claims.validate()
+        self.assertIs(claims.options, validator)
+
+        id_token = jwt.encode({'alg': 'HS256'}, {'iss': 'bar'}, 'k')
+        verifier = jwt.compile_verifier('k', claims_options={'iss': {'values': ['foo']}})
+        self.assertIsInstance(verifier.claims_options, ClaimsValidator)
+        self.assertRaises(errors.InvalidClaimError, verifier.verify, id_token)
+
     def test_use_jws(self):
         payload = {'name': 'hi'}
         private_key = read_file_path('rsa_private.pem')
@@ -224,3 +263,185 @@ class JWTTest(unittest.TestCase):
 
         claims = jwt.decode(data, pub_key)
         self.assertEqual(claims['name'], 'hi')
+
+    def test_async_decode(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        private_key = read_file_path('jwks_private.json')
+        pub_key = read_file_path('jwks_public.json')
+        data = jwt.encode({'alg': 'RS256', 'kid': 'abc'}, {'name': 'hi'}, private_key)
+
+        async def load_key(header, payload):
+            await asyncio.sleep(0)
+            return JsonWebKey.import_key_set(pub_key).find_by_kid(header['kid'])
+
+        async def run():
+            claims = await jwt.async_decode(data, load_key)
+            self.assertEqual(claims['name'], 'hi')
+
+            claims = await jwt.async_decode(data, pub_key)
+            self.assertEqual(claims['name'], 'hi')
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                claims = await jwt.async_decode(data, load_key, executor=executor)
+            self.assertEqual(claims['name'], 'hi')
+
+            s = jwt.encode({'alg': 'HS256'}, {'name': 'hi'}, 'k')
+            with self.assertRaises(errors.BadSignatureError):
+                await jwt.async_decode(s, lambda h, p: 'b')
+            with self.assertRaises(errors.DecodeError):
+                await jwt.async_decode('a.b', 'k')
+
+        asyncio.run(run())
+
+    def test_async_decode_jwe(self):
+        private_key = read_file_path('rsa_private.pem')
+        pub_key = read_file_path('rsa_public.pem')
+        _jwt = JsonWebToken(['RSA-OAEP', 'A256GCM'])
+        data = _jwt.encode({'alg': 'RSA-OAEP', 'enc': 'A256GCM'}, {'name': 'hi'}, pub_key)
+
+        async def load_key(header, payload):
+            self.assertEqual(header['alg'], 'RSA-OAEP')
+            return private_key
+
+        claims = asyncio.run(_jwt.async_decode(data, load_key))
+        self.assertEqual(claims['name'], 'hi')
+
+    def test_compile_issuer(self):
+        issuer = jwt.compile_issuer({'alg': 'HS256'}, 'k')
+        now = datetime.datetime.utcnow()
+        payload = {'iss': 'foo', 'exp': now}
+        s = issuer.encode(dict(payload))
+        self.assertEqual(s, jwt.encode({'alg': 'HS256'}, dict(payload), 'k'))
+        claims = jwt.decode(s, 'k')
+        self.assertIsInstance(claims['exp'], int)
+        self.assertEqual(claims.header, {'alg': 'HS256', 'typ': 'JWT'})
+
+        self.assertRaises(
+            errors.InsecureClaimError,
+            issuer.encode, {'password': ''}
+        )
+        self.assertRaises(
+            UnsupportedAlgorithmError,
+            JsonWebToken(['RS256']).compile_issuer, {'alg': 'HS256'}, 'k'
+        )
+        self.assertRaises(
+            ValueError,
+            jwt.compile_issuer, {'alg': 'RSA-OAEP', 'enc': 'A256GCM'}, 'k'
+        )
+
+    def test_compile_issuer_encode_many(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        private_key = read_file_path('jwks_private.json')
+        pub_key = read_file_path('jwks_public.json')
+        header = {'alg': 'RS256', 'kid': 'abc'}
+        issuer = jwt.compile_issuer(header, private_key)
+        self.assertEqual(issuer.header, {'alg': 'RS256', 'kid': 'abc', 'typ': 'JWT'})
+
+        payloads = ({'i': i} for i in range(10))
+        tokens = list(issuer.encode_many(payloads))
+        self.assertEqual([jwt.decode(s, pub_key)['i'] for s in tokens], list(range(10)))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            payloads = ({'i': i} for i in range(10))
+            rv = list(issuer.encode_many(payloads, executor, buffer_size=3))
+        self.assertEqual(rv, tokens)
+
+    def test_compile_verifier(self):
+        private_key = read_file_path('rsa_private.pem')
+        pub_key = read_file_path('rsa_public.pem')
+        data = jwt.encode({'alg': 'RS256'}, {'iss': 'foo'}, private_key)
+
+        verifier = jwt.compile_verifier(
+            pub_key, ['RS256'],
+            claims_options={'iss': {'essential': True, 'value': 'foo'}},
+        )
+        claims = verifier.verify(data)
+        self.assertEqual(claims['iss'], 'foo')
+        self.assertEqual(claims.header['alg'], 'RS256')
+        # prepared key is reused
+        self.assertEqual(len(verifier._prepared_keys), 1)
+        verifier.verify(data)
+        self.assertEqual(len(verifier._prepared_keys), 1)
+
+        data = jwt.encode({'alg': 'RS256'}, {'iss': 'bar'}, private_key)
+        self.assertRaises(errors.InvalidClaimError, verifier.verify, data)
+
+        data = jwt.encode({'alg': 'HS256'}, {'iss': 'foo'}, 'k')
+        self.assertRaises(UnsupportedAlgorithmError, verifier.verify, data)
+
+        self.assertRaises(errors.DecodeError, verifier.verify, 'a.b')
+        self.assertRaises(errors.DecodeError, verifier.verify, 'a.b.c.d.e')
+
+    def test_compile_verifier_bad_signature(self):
+        verifier = jwt.compile_verifier('k', ['HS256'])
+        data = jwt.encode({'alg': 'HS256'}, {'iss': 'foo'}, 'k')
+        self.assertEqual(verifier.verify(data)['iss'], 'foo')
+
+        data = jwt.encode({'alg': 'HS256'}, {'iss': 'foo'}, 'b')
+        self.assertRaises(errors.BadSignatureError, verifier.verify, data)
+
+        data = jwt.encode({'alg': 'HS256'}, {'exp': 1234}, 'k')
+        self.assertRaises(errors.ExpiredTokenError, verifier.verify, data)
+
+    def test_compile_verifier_with_jwks(self):
+        header = {'alg': 'RS256', 'kid': 'abc'}
+        private_key = read_file_path('jwks_private.json')
+        pub_key = read_file_path('jwks_public.json')
+        data = jwt.encode(header, {'name': 'hi'}, private_key)
+
+        verifier = jwt.compile_verifier(pub_key, ['RS256'])
+        claims = verifier.verify(data)
+        self.assertEqual(claims['name'], 'hi')
+        self.assertIn(('RS256', 'abc'), verifier._prepared_keys)
+
+        key = dict(private_key['keys'][0])
+        del key['kid']
+        data = jwt.encode({'alg': 'RS256', 'kid': 'invalid'}, {}, key)
+        self.assertRaises(ValueError, verifier.verify, data)
+        self.assertEqual(len(verifier._prepared_keys), 1)
+
+        data = jwt.encode({'alg': 'RS256', 'kid': []}, {}, key)
+        self.assertRaises(ValueError, verifier.verify, data)
+
+    def test_decode_unhashable_kid(self):
+        key = dict(read_file_path('jwks_private.json')['keys'][0])
+        del key['kid']
+        data = jwt.encode({'alg': 'RS256', 'kid': ['abc']}, {}, key)
+        pub_key = read_file_path('jwks_public.json')
+        self.assertRaises(ValueError, jwt.decode, data, pub_key)
+        key_set = JsonWebKey.import_key_set(pub_key)
+        self.assertRaises(ValueError, jwt.decode, data, key_set)
+
+    def test_compile_verifier_with_header_cache(self):
+        header_cache = HeaderCache()
+        verifier = jwt.compile_verifier('k', ['HS256'], header_cache=header_cache)
+        data = jwt.encode({'alg': 'HS256'}, {'name': 'hi'}, 'k')
+        self.assertEqual(verifier.verify(data)['name'], 'hi')
+        self.assertEqual(verifier.verify(data).header, {'alg': 'HS256', 'typ': 'JWT'})
+        self.assertEqual(len(header_cache), 1)
+
+    def test_compile_verifier_with_callable_key(self):
+        data = jwt.encode({'alg': 'HS256'}, {'name': 'hi'}, 'k')
+        verifier = jwt.compile_verifier(lambda header, payload: 'k')
+        self.assertEqual(verifier.verify(data)['name'], 'hi')
+        self.assertEqual(verifier._prepared_keys, {})
+
+    def test_reject_unencoded_payload(self):
+        jws = JsonWebSignature(allow_unencoded_payload=True)
+        header = {'alg': 'HS256', 'b64': False, 'crit': ['b64']}
+        data = jws.serialize_compact(header, b'{"iss":"foo"}', 'k')
+        self.assertRaises(errors.DecodeError, jwt.decode, data, 'k')
+        self.assertRaises(
+            errors.DecodeError, asyncio.run, jwt.async_decode(data, 'k'))
+        verifier = jwt.compile_verifier('k', ['HS256'])
+        self.assertRaises(errors.DecodeError, verifier.verify, data)
+        self.assertRaises(ValueError, jwt.encode, header, {'iss': 'foo'}, 'k')
+
+
+def _validate_error(claims):
+    try:
+        claims.validate()
+    except errors.JoseError as error:
+        return type(error)
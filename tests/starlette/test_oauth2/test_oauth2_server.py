@@ -0,0 +1,264 @@
+import asyncio
+import unittest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from authlib.common.urls import url_decode, urlparse
+from authlib.integrations.starlette_oauth2 import AuthorizationServer, ResourceProtector
+from authlib.oauth2.rfc6749 import grants, ClientMixin, AuthorizationCodeMixin, TokenCache
+from authlib.oauth2.rfc6750 import BearerTokenValidator
+from authlib.oauth2.rfc7009 import RevocationEndpoint
+
+
+class Client(ClientMixin):
+    client_id = 'client'
+
+    def get_client_id(self):
+        return self.client_id
+
+    def get_default_redirect_uri(self):
+        return 'https://client.test/cb'
+
+    def get_allowed_scope(self, scope):
+        return scope
+
+    def check_redirect_uri(self, redirect_uri):
+        return redirect_uri == 'https://client.test/cb'
+
+    def check_client_secret(self, client_secret):
+        return client_secret == 'secret'
+
+    def check_endpoint_auth_method(self, method, endpoint):
+        return method == 'client_secret_basic'
+
+    def check_response_type(self, response_type):
+        return response_type == 'code'
+
+    def check_grant_type(self, grant_type):
+        return True
+
+
+class AuthorizationCode(AuthorizationCodeMixin):
+    def __init__(self, code, user):
+        self.code = code
+        self.user = user
+
+    def get_redirect_uri(self):
+        return None
+
+    def get_scope(self):
+        return 'profile'
+
+
+class Token(dict):
+    def check_client(self, client):
+        return self['client_id'] == client.client_id
+
+    def get_scope(self):
+        return self.get('scope')
+
+    def is_expired(self):
+        return False
+
+    def is_revoked(self):
+        return self.get('revoked', False)
+
+
+TOKENS = {}
+CODES = {}
+
+
+async def query_client(client_id):
+    await asyncio.sleep(0)
+    if client_id == 'client':
+        return Client()
+
+
+async def save_token(token, request):
+    await asyncio.sleep(0)
+    TOKENS[token['access_token']] = Token(
+        token, client_id=request.client.client_id, user=request.user)
+
+
+class AuthorizationCodeGrant(grants.AuthorizationCodeGrant):
+    async def save_authorization_code(self, code, request):
+        CODES[code] = AuthorizationCode(code, request.user)
+
+    async def query_authorization_code(self, code, client):
+        return CODES.get(code)
+
+    async def delete_authorization_code(self, authorization_code):
+        del CODES[authorization_code.code]
+
+    async def authenticate_user(self, authorization_code):
+        return authorization_code.user
+
+
+class Revocation(RevocationEndpoint):
+    async def query_token(self, token_string, token_type_hint):
+        return TOKENS.get(token_string)
+
+    async def revoke_token(self, token, request):
+        token['revoked'] = True
+        token_cache.invalidate(token['access_token'])
+
+
+class MyBearerTokenValidator(BearerTokenValidator):
+    queries = 0
+
+    async def authenticate_token(self, token_string):
+        await asyncio.sleep(0)
+        self.queries += 1
+        return TOKENS.get(token_string)
+
+
+server = AuthorizationServer(query_client, save_token, scopes_supported=['profile', 'email'])
+server.register_grant(grants.ClientCredentialsGrant)
+server.register_grant(AuthorizationCodeGrant)
+server.register_endpoint(Revocation)
+
+token_cache = TokenCache()
+validator = MyBearerTokenValidator(token_cache=token_cache)
+require_oauth = ResourceProtector()
+require_oauth.register_token_validator(validator)
+
+
+async def authorize(request):
+    if request.method == 'GET':
+        grant = await server.async_get_consent_grant(request, end_user='foo')
+        return JSONResponse({'client_id': grant.client.client_id})
+    grant_user = request.query_params.get('user')
+    return await server.async_create_authorization_response(request, grant_user)
+
+
+async def issue_token(request):
+    return await server.async_create_token_response(request)
+
+
+async def revoke_token(request):
+    return await server.async_create_endpoint_response('revocation', request)
+
+
+@require_oauth('profile')
+async def profile(request):
+    return JSONResponse({'user': request.state.oauth_token['user']})
+
+
+@require_oauth(optional=True)
+async def optional(request):
+    return JSONResponse({'token': request.state.oauth_token is not None})
+
+
+app = Starlette(routes=[
+    Route('/oauth/authorize', authorize, methods=['GET', 'POST']),
+    Route('/oauth/token', issue_token, methods=['POST']),
+    Route('/oauth/revoke', revoke_token, methods=['POST']),
+    Route('/profile', profile),
+    Route('/optional', optional),
+])
+
+
+class StarletteOAuth2ServerTest(unittest.TestCase):
+    def setUp(self):
+        TOKENS.clear()
+        CODES.clear()
+        token_cache.clear()
+        self.client = TestClient(app, base_url='https://testserver')
+
+    def create_token(self, **data):
+        return self.client.post('/oauth/token', data=data, auth=('client', 'secret'))
+
+    def test_client_credentials(self):
+        rv = self.create_token(grant_type='client_credentials', scope='profile')
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.headers['cache-control'], 'no-store')
+        token = rv.json()
+        self.assertEqual(token['token_type'], 'Bearer')
+        self.assertEqual(token['scope'], 'profile')
+        self.assertIn(token['access_token'], TOKENS)
+
+        rv = self.create_token(grant_type='client_credentials', scope='invalid')
+        self.assertEqual(rv.json()['error'], 'invalid_scope')
+
+        rv = self.client.post('/oauth/token', data={'grant_type': 'client_credentials'})
+        self.assertEqual(rv.status_code, 401)
+        self.assertEqual(rv.json()['error'], 'invalid_client')
+
+    def test_malformed_token_body(self):
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        for body in (b'{"grant_type": "client_credentials"}', b'x=%zz', b'\xff\xfe'):
+            rv = self.client.post(
+                '/oauth/token', content=body, headers=headers, auth=('client', 'secret'))
+            self.assertEqual(rv.status_code, 400)
+            self.assertEqual(rv.json()['error'], 'unsupported_grant_type')
+
+        body = b'grant_type=client_credentials&scope=profile&x=%zz%ff'
+        rv = self.client.post(
+            '/oauth/token', content=body, headers=headers, auth=('client', 'secret'))
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.json()['scope'], 'profile')
+
+    def test_authorization_code(self):
+        url = '/oauth/authorize?response_type=code&client_id=client&state=s'
+        rv = self.client.get(url)
+        self.assertEqual(rv.json(), {'client_id': 'client'})
+
+        rv = self.client.post(url + '&user=foo', follow_redirects=False)
+        self.assertEqual(rv.status_code, 302)
+        location = rv.headers['location']
+        self.assertTrue(location.startswith('https://client.test/cb?'))
+        params = dict(url_decode(urlparse.urlparse(location).query))
+        self.assertEqual(params['state'], 's')
+
+        rv = self.create_token(grant_type='authorization_code', code=params['code'])
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(TOKENS[rv.json()['access_token']]['user'], 'foo')
+
+        rv = self.client.post(url, follow_redirects=False)
+        self.assertIn('error=access_denied', rv.headers['location'])
+
+    def test_resource_protector(self):
+        access_token = self.create_token(
+            grant_type='client_credentials', scope='profile').json()['access_token']
+        headers = {'Authorization': 'Bearer ' + access_token}
+
+        queries = validator.queries
+        rv = self.client.get('/profile', headers=headers)
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.json(), {'user': None})
+        rv = self.client.get('/profile', headers=headers)
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(validator.queries, queries + 1)
+
+        rv = self.client.get('/profile')
+        self.assertEqual(rv.status_code, 401)
+        self.assertEqual(rv.json()['error'], 'missing_authorization')
+
+        rv = self.client.get('/profile', headers={'Authorization': 'Bearer invalid'})
+        self.assertEqual(rv.status_code, 401)
+        self.assertEqual(rv.json()['error'], 'invalid_token')
+        self.assertIn('www-authenticate', rv.headers)
+
+        self.assertEqual(self.client.get('/optional').json(), {'token': False})
+        self.assertEqual(self.client.get('/optional', headers=headers).json(), {'token': True})
+
+    def test_insufficient_scope(self):
+        access_token = self.create_token(
+            grant_type='client_credentials', scope='email').json()['access_token']
+        rv = self.client.get('/profile', headers={'Authorization': 'Bearer ' + access_token})
+        self.assertEqual(rv.status_code, 403)
+        self.assertEqual(rv.json()['error'], 'insufficient_scope')
+
+    def test_revoke_token(self):
+        access_token = self.create_token(
+            grant_type='client_credentials', scope='profile').json()['access_token']
+        headers = {'Authorization': 'Bearer ' + access_token}
+        self.assertEqual(self.client.get('/profile', headers=headers).status_code, 200)
+
+        rv = self.client.post(
+            '/oauth/revoke', data={'token': access_token}, auth=('client', 'secret'))
+        self.assertEqual(rv.status_code, 200)
+        self.assertTrue(TOKENS[access_token].is_revoked())
+        rv = self.client.get('/profile', headers=headers)
+        self.assertEqual(rv.status_code, 401)